@@ -0,0 +1,31 @@
+"""Add previous_id to session for refresh token replay detection
+
+Revision ID: 018aa38a5f79
+Revises: f205372df0c8
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '018aa38a5f79'
+down_revision: Union[str, Sequence[str], None] = 'f205372df0c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('session', sa.Column('previous_id', sa.Uuid(), nullable=True))
+    op.create_index(op.f('ix_session_previous_id'), 'session', ['previous_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_session_previous_id'), table_name='session')
+    op.drop_column('session', 'previous_id')
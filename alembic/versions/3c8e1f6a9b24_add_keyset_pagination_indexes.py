@@ -0,0 +1,38 @@
+"""Replace user_id indexes with (user_id, created_at, id) for keyset pagination
+
+Revision ID: 3c8e1f6a9b24
+Revises: 785b33735259
+Create Date: 2026-10-18 12:14:05.208733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f6a9b24'
+down_revision: Union[str, Sequence[str], None] = '785b33735259'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['clothingitem', 'outfit', 'shopping_recommendation', 'conversation']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite index still serves plain user_id lookups, so the old one is dropped once it exists
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_user_id_created_at_id', table, ['user_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_user_id', table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_user_id', table, ['user_id'], unique=False, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_user_id_created_at_id', table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""Add expires_at indexes to session and password_reset_token
+
+Revision ID: 785b33735259
+Revises: 018aa38a5f79
+Create Date: 2026-10-18 11:02:17.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '785b33735259'
+down_revision: Union[str, Sequence[str], None] = '018aa38a5f79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so existing session lookups are not blocked on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_session_expires_at'), 'session', ['expires_at'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_password_reset_token_expires_at'), 'password_reset_token', ['expires_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_password_reset_token_expires_at'), table_name='password_reset_token', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_session_expires_at'), table_name='session', postgresql_concurrently=True)
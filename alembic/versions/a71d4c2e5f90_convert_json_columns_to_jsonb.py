@@ -0,0 +1,63 @@
+"""Convert JSON columns to JSONB and add GIN indexes
+
+Revision ID: a71d4c2e5f90
+Revises: 3c8e1f6a9b24
+Create Date: 2026-10-18 13:40:52.614290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71d4c2e5f90'
+down_revision: Union[str, Sequence[str], None] = '3c8e1f6a9b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ('clothingitem', 'colors'),
+    ('user', 'style_preferences'),
+    ('user', 'sizing_info'),
+    ('outfit', 'clothing_items'),
+    ('shopping_recommendation', 'complementary_items'),
+    ('conversation_message', 'content'),
+]
+
+# jsonb_ops supports key existence (?, ?|) as well as containment; jsonb_path_ops only @>, but is smaller and faster for it
+GIN_INDEXES = [
+    ('ix_clothingitem_colors', 'clothingitem', 'colors', None),
+    ('ix_user_style_preferences', 'user', 'style_preferences', None),
+    ('ix_outfit_clothing_items', 'outfit', 'clothing_items', 'jsonb_path_ops'),
+    ('ix_shopping_recommendation_complementary_items', 'shopping_recommendation', 'complementary_items', 'jsonb_path_ops'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each conversion rewrites its table under an ACCESS EXCLUSIVE lock
+    for table, column in COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), postgresql_using=f'"{column}"::jsonb')
+
+    with op.get_context().autocommit_block():
+        for name, table, column, ops in GIN_INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: ops} if ops else {},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column, ops in GIN_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    for table, column in COLUMNS:
+        op.alter_column(table, column, type_=sa.JSON(), postgresql_using=f'"{column}"::json')
@@ -0,0 +1,65 @@
+"""Move outfit clothing_items into the outfit_item association table
+
+Revision ID: b4e9d1f37a62
+Revises: a71d4c2e5f90
+Create Date: 2026-10-18 14:22:07.381946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e9d1f37a62'
+down_revision: Union[str, Sequence[str], None] = 'a71d4c2e5f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outfit_item',
+    sa.Column('outfit_id', sa.Integer(), nullable=False),
+    sa.Column('clothing_item_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['clothing_item_id'], ['clothingitem.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['outfit_id'], ['outfit.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('outfit_id', 'clothing_item_id')
+    )
+    op.create_index(op.f('ix_outfit_item_clothing_item_id'), 'outfit_item', ['clothing_item_id'], unique=False)
+
+    # Keeps each outfit's first occurrence of an item in array order; ids that no longer
+    # exist, or belong to another user, have nothing to point at and are dropped
+    op.execute("""
+        INSERT INTO outfit_item (outfit_id, clothing_item_id, position)
+        SELECT o.id, c.id, e.ordinality - 1
+        FROM outfit o
+        CROSS JOIN LATERAL jsonb_array_elements_text(o.clothing_items) WITH ORDINALITY AS e(value, ordinality)
+        JOIN clothingitem c ON c.id = e.value::integer AND c.user_id = o.user_id
+        WHERE jsonb_typeof(o.clothing_items) = 'array'
+        ORDER BY o.id, e.ordinality
+        ON CONFLICT (outfit_id, clothing_item_id) DO NOTHING
+    """)
+
+    op.drop_index('ix_outfit_clothing_items', table_name='outfit', postgresql_using='gin')
+    op.drop_column('outfit', 'clothing_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('outfit', sa.Column('clothing_items', postgresql.JSONB(), nullable=True))
+    op.execute("""
+        UPDATE outfit o
+        SET clothing_items = coalesce(
+            (SELECT jsonb_agg(oi.clothing_item_id ORDER BY oi.position) FROM outfit_item oi WHERE oi.outfit_id = o.id),
+            '[]'::jsonb
+        )
+    """)
+    op.create_index('ix_outfit_clothing_items', 'outfit', ['clothing_items'], unique=False, postgresql_using='gin', postgresql_ops={'clothing_items': 'jsonb_path_ops'})
+
+    op.drop_index(op.f('ix_outfit_item_clothing_item_id'), table_name='outfit_item')
+    op.drop_table('outfit_item')
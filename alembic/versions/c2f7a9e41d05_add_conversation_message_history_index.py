@@ -0,0 +1,32 @@
+"""Add conversation message history index
+
+Revision ID: c2f7a9e41d05
+Revises: b4e9d1f37a62
+Create Date: 2026-10-18 15:03:44.917203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f7a9e41d05'
+down_revision: Union[str, Sequence[str], None] = 'b4e9d1f37a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves lookups by conversation_id as well as newest-first pages and ordered exports within one
+    with op.get_context().autocommit_block():
+        op.create_index('ix_conversation_message_conversation_id_created_at_id', 'conversation_message', ['conversation_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_conversation_message_conversation_id_created_at_id', table_name='conversation_message', postgresql_concurrently=True)
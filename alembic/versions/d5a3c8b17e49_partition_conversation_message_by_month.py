@@ -0,0 +1,96 @@
+"""Range-partition conversation_message by month on created_at
+
+Revision ID: d5a3c8b17e49
+Revises: c2f7a9e41d05
+Create Date: 2026-10-18 15:48:31.604182
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a3c8b17e49'
+down_revision: Union[str, Sequence[str], None] = 'c2f7a9e41d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as the CONVERSATION_PARTITION_PREMAKE_MONTHS default; the worker's PartitionMaintainer takes over from here
+PREMAKE_MONTHS = 3
+
+
+def _create_table(name: str, primary_key: sa.PrimaryKeyConstraint, **kwargs) -> None:
+    op.create_table(name,
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('conversation_message_id_seq')"), nullable=False),
+    sa.Column('conversation_id', sa.Integer(), nullable=False),
+    sa.Column('role', postgresql.ENUM('USER', 'AI', name='messagerole', create_type=False), nullable=False),
+    sa.Column('content', postgresql.JSONB(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversation.id'], ),
+    primary_key,
+    **kwargs
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are copied into the new table under an ACCESS EXCLUSIVE lock; run this in a maintenance window
+    op.rename_table('conversation_message', 'conversation_message_unpartitioned')
+    op.execute('ALTER TABLE conversation_message_unpartitioned RENAME CONSTRAINT conversation_message_pkey TO conversation_message_unpartitioned_pkey')
+    op.execute('ALTER INDEX ix_conversation_message_conversation_id_created_at_id RENAME TO ix_conversation_message_unpartitioned_history')
+    op.execute('ALTER SEQUENCE conversation_message_id_seq OWNED BY NONE')
+
+    # The partition key has to be part of the primary key
+    _create_table('conversation_message', sa.PrimaryKeyConstraint('id', 'created_at'), postgresql_partition_by='RANGE (created_at)')
+    op.create_index('ix_conversation_message_conversation_id_created_at_id', 'conversation_message', ['conversation_id', 'created_at', 'id'], unique=False)
+
+    # One partition per month from the oldest message through PREMAKE_MONTHS ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', least(now(), (SELECT min(created_at) FROM conversation_message_unpartitioned))),
+                    date_trunc('month', greatest(now() + interval '{PREMAKE_MONTHS} months', (SELECT max(created_at) FROM conversation_message_unpartitioned))),
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF conversation_message FOR VALUES FROM (%L) TO (%L)',
+                    'conversation_message_p' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute("""
+        INSERT INTO conversation_message (created_at, updated_at, id, conversation_id, role, content)
+        SELECT created_at, updated_at, id, conversation_id, role, content FROM conversation_message_unpartitioned
+    """)
+    op.execute('ALTER SEQUENCE conversation_message_id_seq OWNED BY conversation_message.id')
+    op.drop_table('conversation_message_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partitions already archived to disk by the worker are not restored
+    op.rename_table('conversation_message', 'conversation_message_partitioned')
+    op.execute('ALTER TABLE conversation_message_partitioned RENAME CONSTRAINT conversation_message_pkey TO conversation_message_partitioned_pkey')
+    op.execute('ALTER INDEX ix_conversation_message_conversation_id_created_at_id RENAME TO ix_conversation_message_partitioned_history')
+    op.execute('ALTER SEQUENCE conversation_message_id_seq OWNED BY NONE')
+
+    _create_table('conversation_message', sa.PrimaryKeyConstraint('id'))
+    op.execute("""
+        INSERT INTO conversation_message (created_at, updated_at, id, conversation_id, role, content)
+        SELECT created_at, updated_at, id, conversation_id, role, content FROM conversation_message_partitioned
+    """)
+    op.create_index('ix_conversation_message_conversation_id_created_at_id', 'conversation_message', ['conversation_id', 'created_at', 'id'], unique=False)
+    op.execute('ALTER SEQUENCE conversation_message_id_seq OWNED BY conversation_message.id')
+    op.drop_table('conversation_message_partitioned')
@@ -0,0 +1,32 @@
+"""Add partial index of open shopping recommendations by priority
+
+Revision ID: e8b2f6d09c13
+Revises: d5a3c8b17e49
+Create Date: 2026-10-18 20:06:12.384519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2f6d09c13'
+down_revision: Union[str, Sequence[str], None] = 'd5a3c8b17e49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Purchased rows are left out, so the index only grows with recommendations still worth serving
+    with op.get_context().autocommit_block():
+        op.create_index('ix_shopping_recommendation_user_id_open_priority', 'shopping_recommendation', ['user_id', sa.text('priority_score DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('NOT purchased'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_shopping_recommendation_user_id_open_priority', table_name='shopping_recommendation', postgresql_where=sa.text('NOT purchased'), postgresql_concurrently=True)
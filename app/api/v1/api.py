@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import user,login
+from app.api.v1.endpoints import user,login,conversation,wardrobe
 
 api_router = APIRouter()
 
 api_router.include_router(user.router, prefix="/user", tags=["user"])
-api_router.include_router(login.router, prefix="/auth", tags=["auth"])
\ No newline at end of file
+api_router.include_router(login.router, prefix="/auth", tags=["auth"])
+api_router.include_router(conversation.router, prefix="/conversation", tags=["conversation"])
+api_router.include_router(wardrobe.router, prefix="/wardrobe", tags=["wardrobe"])
\ No newline at end of file
@@ -8,50 +8,88 @@ from typing import Annotated
 from datetime import datetime
 
 from app.core.config import settings
-from app.db import get_db
+from app.db import get_db, use_primary
 from app.repositories.user_repo import user_repo
 from app.repositories.session_repo import session_repo
 from app.models.user import User
-from app.models.session import Session as SessionModel
+from app.schemas.session import SessionInfo
 from app.core.exceptions.user import InvalidCredentialsException
 from app.core.exceptions.session import InvalidSessionException
 from app.core.jwt_denylist import is_jti_denylisted
+from app.core.user_cache import user_cache
+from app.core.token_version import token_version_store
+from app.core.security import PRINCIPAL_CLAIMS_VERSION
+from app.core.rate_limit import RateLimit, client_ip, form_field, json_field
+from app.schemas.user import Principal
 
 # This tells FastAPI where to look for the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login")
 
-async def get_current_user(db: Annotated[AsyncSession, Depends(get_db)], token: Annotated[str, Depends(oauth2_scheme)]) -> User:
+# Checked before login hashes anything and before forget-password publishes anything
+login_ip_rate_limit = RateLimit(scope="login:ip", limit=settings.LOGIN_RATE_LIMIT_PER_IP, window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS, key=client_ip)
+login_account_rate_limit = RateLimit(scope="login:account", limit=settings.LOGIN_RATE_LIMIT_PER_ACCOUNT, window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS, key=form_field("username"))
+password_reset_ip_rate_limit = RateLimit(scope="password_reset:ip", limit=settings.PASSWORD_RESET_RATE_LIMIT_PER_IP, window=settings.PASSWORD_RESET_RATE_LIMIT_WINDOW_SECONDS, key=client_ip)
+password_reset_account_rate_limit = RateLimit(scope="password_reset:account", limit=settings.PASSWORD_RESET_RATE_LIMIT_PER_ACCOUNT, window=settings.PASSWORD_RESET_RATE_LIMIT_WINDOW_SECONDS, key=json_field("email"))
+
+async def decode_access_token(token: Annotated[str, Depends(oauth2_scheme)]) -> dict:
     try:
         payload = jwt.decode(token, settings.ACCESS_SECRET_KEY, algorithms=[settings.ALGORITHM])
         jti = payload.get("jti")
         if not jti or await is_jti_denylisted(jti):
             raise InvalidCredentialsException()
 
-        email = payload.get("sub")
     except(JWTError, ValidationError):
         raise InvalidCredentialsException()
 
-    user = await user_repo.get_by_email(db=db, email=email)
+    return payload
+
+async def get_current_user(db: Annotated[AsyncSession, Depends(get_db)], payload: Annotated[dict, Depends(decode_access_token)]) -> User:
+    email = payload.get("sub")
+    user = await user_cache.get(db=db, email=email)
+    if user is not None:
+        return user
+
+    # Cached until invalidated, so read from the primary and only after noting the epoch
+    epoch = user_cache.epoch
+    with use_primary(db):
+        user = await user_repo.get_by_email(db=db, email=email)
     if user is None:
         raise InvalidCredentialsException()
 
+    user_cache.set(user, epoch=epoch)
     return user
 
-async def get_valid_session_model_from_refresh_token(db: Annotated[AsyncSession, Depends(get_db)], refresh_token: str = Cookie(...)) -> SessionModel:
+async def get_current_principal(db: Annotated[AsyncSession, Depends(get_db)], payload: Annotated[dict, Depends(decode_access_token)]) -> Principal:
+    """
+    Resolves the caller from the token's "usr" claim when stateless tokens are on,
+    so the session handed in by get_db never opens a connection. Tokens without a
+    current claim set fall back to the regular user lookup.
+    """
+    claims = payload.get("usr")
+    if settings.STATELESS_ACCESS_TOKENS and claims and claims.get("v") == PRINCIPAL_CLAIMS_VERSION:
+        if claims.get("tv") != await token_version_store.get(claims["id"]):
+            raise InvalidCredentialsException()
+        return Principal(id=claims["id"], email=payload["sub"], is_active=claims["act"])
+
+    user = await get_current_user(db=db, payload=payload)
+    return Principal(id=user.id, email=user.email, is_active=user.is_active)
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+async def get_refresh_token_session_id(refresh_token: str = Cookie(...)) -> uuid.UUID:
+    """Validates the refresh token's signature and expiry only; the session itself is checked during rotation."""
     if not refresh_token:
         raise InvalidSessionException()
 
     try:
         payload = jwt.decode(refresh_token, settings.REFRESH_SECRET_KEY, algorithms=[settings.ALGORITHM])
-        session_id = payload.get("jti")
-        if not session_id:
-            raise InvalidSessionException()
-
-    except JWTError:
+        return uuid.UUID(payload.get("jti"))
+    except (JWTError, TypeError, ValueError):
         raise InvalidSessionException()
 
-    current_session = await session_repo.get_session_with_user(db=db, id=uuid.UUID(session_id))
+async def get_valid_session_from_refresh_token(db: Annotated[AsyncSession, Depends(get_db)], session_id: Annotated[uuid.UUID, Depends(get_refresh_token_session_id)]) -> SessionInfo:
+    current_session = await session_repo.get_session(db=db, id=session_id)
     if not current_session or current_session.expires_at < datetime.utcnow():
         raise InvalidSessionException()
-            
+
     return current_session
\ No newline at end of file
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated
+
+from app.api.v1.dependencies import CurrentPrincipal
+from app.db import get_db
+from app.schemas.conversation import ConversationRead, ConversationMessageCreate, ConversationMessageRead
+from app.schemas.pagination import CursorPage, CursorParams
+from app.services.conversation_service import conversation_service
+
+router = APIRouter()
+
+@router.get("/",
+response_model=CursorPage[ConversationRead]
+)
+async def list_conversations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    page: Annotated[CursorParams, Query()]
+):
+    items, next_cursor = await conversation_service.list_conversations(db=db, user_id=current_user.id, limit=page.limit, cursor=page.cursor)
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+@router.get("/{conversation_id}/messages",
+response_model=CursorPage[ConversationMessageRead]
+)
+async def list_messages(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    conversation_id: int,
+    page: Annotated[CursorParams, Query()]
+):
+    items, next_cursor = await conversation_service.list_messages(
+        db=db, user_id=current_user.id, conversation_id=conversation_id, limit=page.limit, cursor=page.cursor
+    )
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+@router.get("/{conversation_id}/export")
+async def export_conversation(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    conversation_id: int
+):
+    await conversation_service.get_conversation(db=db, user_id=current_user.id, conversation_id=conversation_id)
+    return StreamingResponse(
+        conversation_service.export_messages(conversation_id=conversation_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="conversation-{conversation_id}.ndjson"'},
+    )
+
+@router.post("/{conversation_id}/messages/stream",
+response_class=StreamingResponse
+)
+async def stream_reply(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    conversation_id: int,
+    message_in: ConversationMessageCreate
+):
+    await conversation_service.add_user_message(db=db, user_id=current_user.id, conversation_id=conversation_id, content=message_in.content)
+    return StreamingResponse(
+        conversation_service.stream_reply(conversation_id=conversation_id, content=message_in.content),
+        media_type="text/event-stream",
+        # Proxies must pass each event through as it is written, not buffer the body
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,3 +1,4 @@
+import uuid
 from fastapi import APIRouter, Depends, Response, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
@@ -5,14 +6,15 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db import get_db
 from app.services.auth_service import auth_service
-from app.api.v1.dependencies import get_valid_session_model_from_refresh_token, oauth2_scheme
-from app.models.session import Session as SessionModel
+from app.api.v1.dependencies import get_valid_session_from_refresh_token, get_refresh_token_session_id, oauth2_scheme, login_ip_rate_limit, login_account_rate_limit
+from app.schemas.session import SessionInfo
 from app.schemas.token import Token
 
 router = APIRouter()
 
 @router.post("/login",
-response_model=Token
+response_model=Token,
+dependencies=[Depends(login_ip_rate_limit), Depends(login_account_rate_limit)]
 )
 async def login_for_access_token(
     response: Response,
@@ -39,9 +41,9 @@ async def refresh_access_token(
     response: Response,
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_session: Annotated[SessionModel, Depends(get_valid_session_model_from_refresh_token)]
+    session_id: Annotated[uuid.UUID, Depends(get_refresh_token_session_id)]
 ):
-    access_token, new_refresh_token = await auth_service.refresh(db=db, request=request, old_session=current_session)
+    access_token, new_refresh_token = await auth_service.refresh(db=db, request=request, session_id=session_id)
 
     response.set_cookie(
         key="refresh_token",
@@ -57,7 +59,7 @@ async def refresh_access_token(
 async def logout(
     response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_session: Annotated[SessionModel, Depends(get_valid_session_model_from_refresh_token)],
+    current_session: Annotated[SessionInfo, Depends(get_valid_session_from_refresh_token)],
     access_token: Annotated[str, Depends(oauth2_scheme)]
 ):
     await auth_service.logout(db=db, session_to_delete=current_session, access_token=access_token)
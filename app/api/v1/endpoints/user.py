@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated
 
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.dependencies import CurrentPrincipal, password_reset_ip_rate_limit, password_reset_account_rate_limit
 from app.db import get_db
 from app.schemas.user import UserCreate, UserRead, ForgotPassword, ResetPassword
 from app.models.user import User
@@ -27,11 +27,13 @@ async def register_user(
 response_model=UserRead 
 )
 async def read_current_user(
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: CurrentPrincipal
 ):
     return current_user
 
-@router.post("/forget-password")
+@router.post("/forget-password",
+dependencies=[Depends(password_reset_ip_rate_limit), Depends(password_reset_account_rate_limit)]
+)
 async def forgot_password(
     *, 
     db: Annotated[AsyncSession, Depends(get_db)], 
@@ -0,0 +1,223 @@
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated
+
+from app.api.v1.dependencies import CurrentPrincipal
+from app.core.config import settings
+from app.core.etag import etag_matches
+from app.db import get_db
+from app.schemas.pagination import CursorPage, CursorParams
+from app.schemas.wardrobe import (
+    BatchDelete, BatchDeleted,
+    ClothingItemCreate, ClothingItemBatchUpdate, ClothingItemRead, WardrobeSearchParams, WardrobeSearchResult,
+    OutfitCreate, OutfitBatchUpdate, OutfitRead, OutfitSuggestion, OutfitSuggestionParams,
+    ShoppingRecommendationCreate, ShoppingRecommendationBatchUpdate, ShoppingRecommendationRead, TopRecommendationsParams,
+)
+from app.services.recommendation_service import recommendation_service
+from app.services.wardrobe_service import wardrobe_service
+
+router = APIRouter()
+
+Batch = Body(min_length=1, max_length=settings.WARDROBE_BATCH_MAX_SIZE)
+
+def cache_headers(etag: str) -> dict[str, str]:
+    # Clients may keep the response but must revalidate it with If-None-Match before using it
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+
+# Clothing items
+
+@router.get("/items",
+response_model=CursorPage[ClothingItemRead]
+)
+async def list_items(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    page: Annotated[CursorParams, Query()],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None
+):
+    etag = await wardrobe_service.items_etag(db=db, user_id=current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    items, next_cursor = await wardrobe_service.list_items(db=db, user_id=current_user.id, limit=page.limit, cursor=page.cursor)
+    response.headers.update(cache_headers(etag))
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+@router.get("/items/search",
+response_model=WardrobeSearchResult
+)
+async def search_items(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    params: Annotated[WardrobeSearchParams, Query()]
+):
+    return await wardrobe_service.search_items(db=db, user_id=current_user.id, params=params)
+
+@router.post("/items",
+response_model=list[ClothingItemRead],
+status_code=status.HTTP_201_CREATED
+)
+async def create_items(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    items_in: Annotated[list[ClothingItemCreate], Batch]
+):
+    return await wardrobe_service.create_items(db=db, user_id=current_user.id, items_in=items_in)
+
+@router.patch("/items",
+response_model=list[ClothingItemRead]
+)
+async def update_items(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    updates: Annotated[list[ClothingItemBatchUpdate], Batch]
+):
+    return await wardrobe_service.update_items(db=db, user_id=current_user.id, updates=updates)
+
+@router.delete("/items",
+response_model=BatchDeleted
+)
+async def delete_items(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    batch: BatchDelete
+):
+    return BatchDeleted(deleted=await wardrobe_service.delete_items(db=db, user_id=current_user.id, ids=batch.ids))
+
+# Outfits
+
+@router.get("/outfits",
+response_model=CursorPage[OutfitRead]
+)
+async def list_outfits(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    page: Annotated[CursorParams, Query()],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None
+):
+    etag = await wardrobe_service.outfits_etag(db=db, user_id=current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    outfits, next_cursor = await wardrobe_service.list_outfits(db=db, user_id=current_user.id, limit=page.limit, cursor=page.cursor)
+    response.headers.update(cache_headers(etag))
+    return CursorPage(items=outfits, next_cursor=next_cursor)
+
+@router.get("/outfits/suggestions",
+response_model=list[OutfitSuggestion]
+)
+async def suggest_outfits(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    params: Annotated[OutfitSuggestionParams, Query()]
+):
+    return await wardrobe_service.suggest_outfits(db=db, user_id=current_user.id, limit=params.limit)
+
+@router.post("/outfits",
+response_model=list[OutfitRead],
+status_code=status.HTTP_201_CREATED
+)
+async def create_outfits(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    outfits_in: Annotated[list[OutfitCreate], Batch]
+):
+    return await wardrobe_service.create_outfits(db=db, user_id=current_user.id, outfits_in=outfits_in)
+
+@router.patch("/outfits",
+response_model=list[OutfitRead]
+)
+async def update_outfits(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    updates: Annotated[list[OutfitBatchUpdate], Batch]
+):
+    return await wardrobe_service.update_outfits(db=db, user_id=current_user.id, updates=updates)
+
+@router.delete("/outfits",
+response_model=BatchDeleted
+)
+async def delete_outfits(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    batch: BatchDelete
+):
+    return BatchDeleted(deleted=await wardrobe_service.delete_outfits(db=db, user_id=current_user.id, ids=batch.ids))
+
+# Shopping recommendations
+
+@router.get("/recommendations",
+response_model=CursorPage[ShoppingRecommendationRead]
+)
+async def list_recommendations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    page: Annotated[CursorParams, Query()],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None
+):
+    etag = await wardrobe_service.recommendations_etag(db=db, user_id=current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    recommendations, next_cursor = await wardrobe_service.list_recommendations(db=db, user_id=current_user.id, limit=page.limit, cursor=page.cursor)
+    response.headers.update(cache_headers(etag))
+    return CursorPage(items=recommendations, next_cursor=next_cursor)
+
+@router.get("/recommendations/top",
+response_model=list[ShoppingRecommendationRead]
+)
+async def top_recommendations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    params: Annotated[TopRecommendationsParams, Query()]
+):
+    return await recommendation_service.top_recommendations(db=db, user_id=current_user.id, limit=params.limit)
+
+@router.post("/recommendations",
+response_model=list[ShoppingRecommendationRead],
+status_code=status.HTTP_201_CREATED
+)
+async def create_recommendations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    recommendations_in: Annotated[list[ShoppingRecommendationCreate], Batch]
+):
+    return await wardrobe_service.create_recommendations(db=db, user_id=current_user.id, recommendations_in=recommendations_in)
+
+@router.patch("/recommendations",
+response_model=list[ShoppingRecommendationRead]
+)
+async def update_recommendations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    updates: Annotated[list[ShoppingRecommendationBatchUpdate], Batch]
+):
+    return await wardrobe_service.update_recommendations(db=db, user_id=current_user.id, updates=updates)
+
+@router.delete("/recommendations",
+response_model=BatchDeleted
+)
+async def delete_recommendations(
+    *,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: CurrentPrincipal,
+    batch: BatchDelete
+):
+    return BatchDeleted(deleted=await wardrobe_service.delete_recommendations(db=db, user_id=current_user.id, ids=batch.ids))
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -10,6 +11,85 @@ class Settings(BaseSettings):
     REDIS_URL: str
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int
 
+    # Database connection pool (per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARM_CONNECTIONS: int = 4
+    # SQLAlchemy compiled statements per engine, and asyncpg prepared statements per connection (0 behind pgbouncer in transaction mode)
+    DB_QUERY_CACHE_SIZE: int = 1200
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+
+    # Bulk inserts of at least this many rows use COPY on asyncpg
+    BULK_COPY_MIN_ROWS: int = 5000
+    # Most rows a single wardrobe batch create/update/delete request may carry
+    WARDROBE_BATCH_MAX_SIZE: int = 100
+    # Rows fetched per round trip from the server-side cursor behind streamed exports
+    EXPORT_STREAM_BATCH_SIZE: int = 500
+
+    # SQL instrumentation: statements slower than this are logged; one statement shape repeated this often in a request is flagged as N+1
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Read replicas (comma-separated URLs); reads of just-committed tables stay on the primary this long
+    DATABASE_REPLICA_URLS: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Password hashing pool (0 workers runs bcrypt in the default thread pool instead)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
+
+    # Per-process cache of authenticated users
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Per-process faceted search indexes over users' wardrobes
+    WARDROBE_INDEX_MAX_USERS: int = 2000
+    WARDROBE_INDEX_TTL_SECONDS: float = 3600.0
+
+    # Per-user rankings of open shopping recommendations materialized in Redis (rebuilt from Postgres once expired)
+    RECOMMENDATION_RANKING_TTL_SECONDS: int = 86400
+
+    # AI stylist replies streamed over SSE: generator backend, and chunks held in memory between appends to the stored reply
+    STYLIST_BACKEND: Literal["stub"] = "stub"
+    STYLIST_STUB_CHUNK_DELAY_SECONDS: float = 0.0
+    CONVERSATION_STREAM_CHECKPOINT_CHUNKS: int = 20
+
+    # Embed a minimal user claim set in access tokens so hot endpoints skip the database
+    STATELESS_ACCESS_TOKENS: bool = False
+
+    # Where refresh sessions live: "postgres" or "redis" (Postgres then only keeps an async audit trail)
+    SESSION_STORE: Literal["postgres", "redis"] = "postgres"
+    SESSION_AUDIT_TO_DB: bool = True
+    SESSION_AUDIT_QUEUE_SIZE: int = 10000
+    # A rotated refresh token presented again within this long is a double submit (401 only), later a replay (session revoked)
+    SESSION_REUSE_GRACE_SECONDS: float = 10.0
+
+    # Worker: purge of expired sessions and password reset tokens
+    SWEEPER_INTERVAL_SECONDS: float = 300.0
+    SWEEPER_BATCH_SIZE: int = 500
+    SWEEPER_BATCH_PAUSE_SECONDS: float = 0.5
+    SWEEPER_MAX_BATCHES_PER_RUN: int = 200
+
+    # Worker: monthly conversation_message partitions, created ahead and archived to gzipped CSV once past retention
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 3600.0
+    CONVERSATION_PARTITION_PREMAKE_MONTHS: int = 3
+    CONVERSATION_PARTITION_RETENTION_MONTHS: int = 12
+    CONVERSATION_ARCHIVE_DIR: str = "/var/lib/stylist/archive"
+    WORKER_METRICS_PORT: int = 9100
+
+    # Rate limiting: "redis" shares limits across workers, "memory" is per-process (tests/dev)
+    RATE_LIMIT_BACKEND: Literal["redis", "memory"] = "redis"
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_ACCOUNT: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    PASSWORD_RESET_RATE_LIMIT_PER_IP: int = 5
+    PASSWORD_RESET_RATE_LIMIT_PER_ACCOUNT: int = 3
+    PASSWORD_RESET_RATE_LIMIT_WINDOW_SECONDS: float = 900.0
+
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
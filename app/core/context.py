@@ -1,4 +1,11 @@
+from __future__ import annotations
+
 from uuid import UUID
 from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.core.query_stats import QueryStats
 
-request_id_var: ContextVar[UUID | None] = ContextVar("request_id", default=None)
\ No newline at end of file
+request_id_var: ContextVar[UUID | None] = ContextVar("request_id", default=None)
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
\ No newline at end of file
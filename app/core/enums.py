@@ -1,5 +1,20 @@
 from enum import Enum
 
+
 class MessageRole(str, Enum):
     USER = "user"
-    AI = "ai"
\ No newline at end of file
+    AI = "ai"
+
+
+class ReplyStatus(str, Enum):
+    STREAMING = "streaming"
+    COMPLETE = "complete"
+    INTERRUPTED = "interrupted"
+    FAILED = "failed"
+
+
+class PartitionState(str, Enum):
+    ATTACHED = "attached"
+    # DETACH ... CONCURRENTLY was interrupted; only DETACH ... FINALIZE completes it
+    DETACH_PENDING = "detach_pending"
+    DETACHED = "detached"
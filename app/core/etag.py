@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+
+def make_weak_etag(*versions: tuple[int, datetime | None]) -> str:
+    """
+    A weak ETag from (row count, last change) pairs. Any insert, update or delete moves
+    one of the two, so the tag changes whenever the rows behind a response might have.
+    """
+    parts = [f"{count}.{int(changed.replace(tzinfo=timezone.utc).timestamp() * 1_000_000) if changed else 0}" for count, changed in versions]
+    return f'W/"{"-".join(parts)}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored and any listed tag, or *, matches."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
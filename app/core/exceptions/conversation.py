@@ -0,0 +1,7 @@
+from app.core.exceptions.base import CustomException
+
+class ConversationException(CustomException):
+    pass
+
+class ConversationNotFoundException(ConversationException):
+    pass
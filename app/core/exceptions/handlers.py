@@ -1,12 +1,17 @@
 import structlog
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_429_TOO_MANY_REQUESTS, HTTP_503_SERVICE_UNAVAILABLE
 
 from app.core.context import request_id_var
 from app.core.exceptions.base import CustomException
 from app.core.exceptions.user import UserAlreadyExistsException, UserNotFoundException, InvalidCredentialsException
 from app.core.exceptions.session import InvalidSessionException
+from app.core.exceptions.security import PasswordHasherBusyException, RateLimitExceededException
+from app.core.exceptions.pagination import InvalidCursorException
+from app.core.exceptions.repository import ConcurrentUpdateException
+from app.core.exceptions.wardrobe import WardrobeObjectNotFoundException
+from app.core.exceptions.conversation import ConversationNotFoundException
 
 log = structlog.get_logger()
 
@@ -33,5 +38,36 @@ async def custom_exception_handler(request: Request, exc: CustomException):
         status_code = HTTP_401_UNAUTHORIZED
         headers = {"WWW-Authenticate": "Bearer"}
         log.warn("authentication_failed", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
+
+    elif isinstance(exc, PasswordHasherBusyException):
+        status_code = HTTP_503_SERVICE_UNAVAILABLE
+        detail = "The server is busy, please try again shortly."
+        headers = {"Retry-After": str(exc.retry_after)}
+        log.warn("password_hasher_busy", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
+
+    elif isinstance(exc, RateLimitExceededException):
+        status_code = HTTP_429_TOO_MANY_REQUESTS
+        detail = "Too many requests, please try again later."
+        headers = {"Retry-After": str(exc.retry_after)}
+
+    elif isinstance(exc, InvalidCursorException):
+        status_code = HTTP_400_BAD_REQUEST
+        detail = "Invalid pagination cursor."
+        log.warn("invalid_pagination_cursor", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
+
+    elif isinstance(exc, ConcurrentUpdateException):
+        status_code = HTTP_409_CONFLICT
+        detail = "The resource was modified by another request, reload it and try again."
+        log.warn("concurrent_update_rejected", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
+
+    elif isinstance(exc, WardrobeObjectNotFoundException):
+        status_code = HTTP_404_NOT_FOUND
+        detail = exc.detail
+        log.warn("wardrobe_object_not_found", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
+
+    elif isinstance(exc, ConversationNotFoundException):
+        status_code = HTTP_404_NOT_FOUND
+        detail = "Conversation not found."
+        log.warn("conversation_not_found", exception=exc.__class__.__name__, request_id=str(request_id_var.get()))
     
     return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
\ No newline at end of file
@@ -0,0 +1,7 @@
+from app.core.exceptions.base import CustomException
+
+class PaginationException(CustomException):
+    pass
+
+class InvalidCursorException(PaginationException):
+    pass
@@ -0,0 +1,7 @@
+from app.core.exceptions.base import CustomException
+
+class RepositoryException(CustomException):
+    pass
+
+class ConcurrentUpdateException(RepositoryException):
+    pass
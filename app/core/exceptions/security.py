@@ -0,0 +1,12 @@
+from app.core.exceptions.base import CustomException
+
+class SecurityException(CustomException):
+    pass
+
+class PasswordHasherBusyException(SecurityException):
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
+
+class RateLimitExceededException(SecurityException):
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
@@ -0,0 +1,16 @@
+from app.core.exceptions.base import CustomException
+
+class WardrobeException(CustomException):
+    pass
+
+class WardrobeObjectNotFoundException(WardrobeException):
+    detail = "Not found."
+
+class ClothingItemNotFoundException(WardrobeObjectNotFoundException):
+    detail = "Clothing item not found."
+
+class OutfitNotFoundException(WardrobeObjectNotFoundException):
+    detail = "Outfit not found."
+
+class ShoppingRecommendationNotFoundException(WardrobeObjectNotFoundException):
+    detail = "Shopping recommendation not found."
@@ -1,14 +1,105 @@
-import redis.asyncio as redis
-from app.core.config import settings
+import heapq
+import structlog
 from datetime import datetime, timezone
 
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+from app.core.redis import redis_client
+from app.core.pubsub import redis_subscriber
+from app.core.metrics import DENYLIST_LOOKUPS, DENYLIST_SIZE
+
+log = structlog.get_logger()
+
+KEY_PREFIX = "denylist:"
+EVENTS_CHANNEL = "denylist:events"
+# Entries written before KEY_PREFIX sit under the bare jti (a session UUID) with the value "denied".
+# They expire with their token, so these reads can go once KEY_PREFIX has been deployed for
+# longer than ACCESS_TOKEN_EXPIRE_MINUTES.
+LEGACY_KEY_PATTERN = "????????-????-????-????-????????????"
+
+class LocalDenylist:
+    """
+    Worker-local mirror of the Redis denylist.
+
+    Almost no token is ever denylisted, so keeping the handful that are in a
+    set (each dropped once its token would have expired anyway) lets the
+    common case skip Redis entirely. The mirror is exact, so a local answer
+    is final in both directions. While it is not `ready` (not yet bootstrapped,
+    or the pub/sub connection dropped) lookups go to Redis instead.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, jti: str, exp: float):
+        if exp <= datetime.now(timezone.utc).timestamp():
+            return
+        self._entries[jti] = exp
+        heapq.heappush(self._expiry_heap, (exp, jti))
+        DENYLIST_SIZE.set(len(self._entries))
+
+    def contains(self, jti: str) -> bool:
+        self._prune()
+        return jti in self._entries
+
+    def clear(self):
+        self._entries.clear()
+        self._expiry_heap.clear()
+        DENYLIST_SIZE.set(0)
+
+    def _prune(self):
+        now = datetime.now(timezone.utc).timestamp()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            exp, jti = heapq.heappop(self._expiry_heap)
+            if self._entries.get(jti) == exp:
+                del self._entries[jti]
+        DENYLIST_SIZE.set(len(self._entries))
+
+local_denylist = LocalDenylist()
 
 async def add_jti_to_denylist(jti: str, exp: int):
     time_to_expire = round(exp - datetime.now(timezone.utc).timestamp())
     if time_to_expire > 0:
-        await redis_client.setex(jti, time_to_expire, "denied")
+        await redis_client.setex(f"{KEY_PREFIX}{jti}", time_to_expire, exp)
+        local_denylist.add(jti, exp)
+        await redis_subscriber.publish(EVENTS_CHANNEL, f"{jti} {exp}")
 
 async def is_jti_denylisted(jti: str) -> bool:
-    return await redis_client.get(jti) is not None
+    if local_denylist.ready:
+        DENYLIST_LOOKUPS.labels(source="local").inc()
+        return local_denylist.contains(jti)
+
+    DENYLIST_LOOKUPS.labels(source="redis").inc()
+    return any(value is not None for value in await redis_client.mget([f"{KEY_PREFIX}{jti}", jti]))
+
+async def bootstrap_local_denylist():
+    """Loads every live denylist entry from Redis into the local mirror."""
+    local_denylist.clear()
+    keys = [key async for key in redis_client.scan_iter(match=f"{KEY_PREFIX}*", count=1000)]
+    if keys:
+        values = await redis_client.mget(keys)
+        for key, exp in zip(keys, values):
+            if exp is not None:
+                local_denylist.add(key[len(KEY_PREFIX):], float(exp))
+    now = datetime.now(timezone.utc).timestamp()
+    async for jti in redis_client.scan_iter(match=LEGACY_KEY_PATTERN, count=1000):
+        ttl_ms = await redis_client.pttl(jti)
+        if ttl_ms > 0:
+            local_denylist.add(jti, now + ttl_ms / 1000)
+    local_denylist.ready = True
+    log.info("JWT denylist mirror bootstrapped", entries=len(local_denylist))
+
+def _on_denylist_event(data: str):
+    jti, exp = data.split(" ", 1)
+    local_denylist.add(jti, float(exp))
+
+def _on_disconnect():
+    local_denylist.ready = False
 
+# Subscribing happens before bootstrap runs, so nothing published in between is lost
+redis_subscriber.subscribe(EVENTS_CHANNEL, _on_denylist_event)
+redis_subscriber.on_connect(bootstrap_local_denylist)
+redis_subscriber.on_disconnect(_on_disconnect)
@@ -44,5 +44,6 @@ def setup_logging():
         logging.getLogger(name).handlers = []
         logging.getLogger(name).propagate = False # Do not let them bubble up to root
 
-    # Set SQLAlchemy's logger to WARNING to hide INFO-level queries
+    # Set SQLAlchemy's logger to WARNING to hide INFO-level queries; slow queries and per-request
+    # query stats are reported by app.core.query_stats instead
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
\ No newline at end of file
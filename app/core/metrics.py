@@ -0,0 +1,83 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Password hashing
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password, including time queued for the pool",
+    ["operation"],
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hash operations currently queued or running in the pool",
+)
+PASSWORD_HASH_CAPACITY = Gauge(
+    "password_hash_capacity",
+    "Maximum number of password hash operations allowed in flight",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hash operations rejected because the pool was saturated or too slow",
+    ["reason"],
+)
+
+# Authenticated user cache
+USER_CACHE_HITS = Counter("user_cache_hits_total", "Authenticated user lookups served from the in-process cache")
+USER_CACHE_MISSES = Counter("user_cache_misses_total", "Authenticated user lookups that had to query the database")
+USER_CACHE_SIZE = Gauge("user_cache_size", "Users currently held in the in-process cache")
+
+# Wardrobe search index
+WARDROBE_INDEX_HITS = Counter("wardrobe_index_hits_total", "Wardrobe searches served from a cached in-process index")
+WARDROBE_INDEX_MISSES = Counter("wardrobe_index_misses_total", "Wardrobe searches that had to build the index from the database")
+WARDROBE_INDEX_SIZE = Gauge("wardrobe_index_size", "Wardrobe indexes currently held in the in-process cache")
+OUTFIT_SUGGESTION_DURATION = Histogram("outfit_suggestion_duration_seconds", "Time spent scoring outfit candidates over a wardrobe", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+WARDROBE_SEARCH_DURATION = Histogram("wardrobe_search_duration_seconds", "Time spent querying an in-memory wardrobe index", buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05))
+RECOMMENDATION_RANKING_READS = Counter("recommendation_ranking_reads_total", "Top recommendation reads by how the Redis ranking answered", ["result"])
+CONVERSATION_STREAMS = Counter("conversation_streams_total", "Streamed AI stylist replies by how they ended", ["status"])
+
+# JWT denylist
+DENYLIST_LOOKUPS = Counter("jwt_denylist_lookups_total", "Denylist checks by where they were answered", ["source"])
+DENYLIST_SIZE = Gauge("jwt_denylist_local_size", "Denylisted JTIs mirrored in this worker")
+
+# Expired row sweeper (worker)
+SWEEPER_ROWS_PURGED = Counter("sweeper_rows_purged_total", "Expired rows deleted by the sweeper", ["table"])
+SWEEPER_BATCH_DURATION = Histogram("sweeper_batch_duration_seconds", "Time taken by one sweeper delete batch", ["table"])
+
+# Partition maintenance (worker)
+PARTITIONS_CREATED = Counter("partitions_created_total", "Range partitions created ahead of time", ["table"])
+PARTITIONS_ARCHIVED = Counter("partitions_archived_total", "Partitions detached, archived to disk and dropped", ["table"])
+PARTITION_ARCHIVE_BYTES = Counter("partition_archive_bytes_total", "Compressed bytes written to partition archives", ["table"])
+
+# Rate limiting
+RATE_LIMIT_REJECTED = Counter("rate_limit_rejected_total", "Requests rejected by a rate limit", ["scope"])
+
+# Database connection pool
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured number of persistent connections in the pool")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out of the pool")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size")
+DB_COMPILED_CACHE = Counter("db_compiled_cache_total", "Statement executions by SQLAlchemy compiled cache result", ["result"])
+DB_COMPILED_CACHE_SIZE = Gauge("db_compiled_cache_size", "Compiled statements held in the primary engine's cache")
+DB_ROUTED_STATEMENTS = Counter("db_routed_statements_total", "Statements routed by the session, by target", ["target"])
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total time spent in SQL statements per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_SLOWEST_QUERY = Histogram(
+    "db_slowest_query_seconds",
+    "Duration of the slowest SQL statement in each HTTP request",
+    ["route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+DB_N_PLUS_ONE = Counter("db_n_plus_one_total", "Requests in which one statement shape repeated past N_PLUS_ONE_THRESHOLD", ["route"])
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
@@ -0,0 +1,41 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.context import query_stats_var
+from app.core.query_stats import QueryStats, observe_request
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI rather than BaseHTTPMiddleware so the stats are reported once the last
+    body chunk is sent, which for a streamed response is after its queries have run.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        query_stats_var.set(stats)
+        observed = False
+
+        def observe():
+            nonlocal observed
+            if not observed:
+                observed = True
+                # Label by route template, not the raw path, to keep the label set bounded
+                route = scope.get("route")
+                observe_request(stats, route.path if route is not None else "unmatched")
+
+        async def send_and_observe(message: Message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_and_observe)
+        finally:
+            # Still report requests that failed or disconnected before the body was complete
+            observe()
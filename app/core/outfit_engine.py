@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from app.schemas.wardrobe import ClothingItemRead
+
+# Outfits are one item per slot of a template; categories outside this map are never suggested
+CATEGORY_SLOTS = {
+    "shirt": "top", "t-shirt": "top", "blouse": "top", "sweater": "top", "top": "top", "hoodie": "top", "polo": "top",
+    "pants": "bottom", "jeans": "bottom", "trousers": "bottom", "shorts": "bottom", "skirt": "bottom", "chinos": "bottom",
+    "dress": "one_piece", "jumpsuit": "one_piece",
+    "shoes": "shoes", "sneakers": "shoes", "boots": "shoes", "heels": "shoes", "loafers": "shoes", "sandals": "shoes",
+}
+TEMPLATES = (("top", "bottom", "shoes"), ("one_piece", "shoes"))
+
+NEUTRAL_COLORS = frozenset({"black", "white", "grey", "gray", "navy", "beige", "cream", "brown", "denim", "tan", "khaki"})
+COMPLEMENTARY_COLORS = frozenset(map(frozenset, [
+    ("blue", "orange"), ("red", "green"), ("yellow", "purple"), ("pink", "green"), ("blue", "yellow"), ("burgundy", "olive"),
+]))
+# Harmony of a pair of colors; items without colors count as neutral
+NEUTRAL_HARMONY, SAME_HARMONY, COMPLEMENTARY_HARMONY, CLASH_HARMONY = 1.0, 0.9, 0.8, 0.3
+
+FORMALITY_RANGE = 4  # formality_level is on a 1-5 scale
+# Items never rated through an outfit score as if rated 3 of 5
+UNRATED_AFFINITY = 0.5
+
+# Upper bound on the scores held in memory at once while extending pairs with a third item
+SCORE_CELL_BUDGET = 1 << 20
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    formality: float = 0.4
+    color: float = 0.4
+    rating: float = 0.2
+
+@dataclass
+class OutfitCandidate:
+    items: list[ClothingItemRead]
+    score: float
+    formality: float
+    color_harmony: float
+    rating: float
+
+class _Slot:
+    """The items filling one slot, encoded as arrays for the scoring below."""
+
+    def __init__(self, items: list[ClothingItemRead], colors: dict[str, int], affinities: dict[int, float]):
+        self.items = items
+        self.formality = np.array([item.formality_level for item in items], dtype=np.float32)
+        self.affinity = np.array([affinities.get(item.id, UNRATED_AFFINITY) for item in items], dtype=np.float32)
+        # Each item's colors as a row of weights summing to 1, so harmony is the mean over its colors
+        self.colors = np.zeros((len(items), len(colors)), dtype=np.float32)
+        for row, item in enumerate(items):
+            indices = [colors[color] for color in _item_colors(item)]
+            self.colors[row, indices] = 1.0 / len(indices)
+
+def _item_colors(item: ClothingItemRead) -> set[str]:
+    return {color.lower() for color in item.colors} or {"neutral"}
+
+def _harmony_matrix(colors: dict[str, int]) -> np.ndarray:
+    names = list(colors)
+    harmony = np.full((len(names), len(names)), CLASH_HARMONY, dtype=np.float32)
+    for i, a in enumerate(names):
+        for j, b in enumerate(names):
+            if a in NEUTRAL_COLORS or b in NEUTRAL_COLORS or "neutral" in (a, b):
+                harmony[i, j] = NEUTRAL_HARMONY
+            elif a == b:
+                harmony[i, j] = SAME_HARMONY
+            elif frozenset((a, b)) in COMPLEMENTARY_COLORS:
+                harmony[i, j] = COMPLEMENTARY_HARMONY
+    return harmony
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Flat indices of the k highest scores, best first, without sorting the rest."""
+    if scores.size > k:
+        indices = np.argpartition(scores, -k, axis=None)[-k:]
+    else:
+        indices = np.arange(scores.size)
+    return indices[np.argsort(-scores.ravel()[indices], kind="stable")]
+
+class OutfitEngine:
+    """
+    Scores outfit candidates over one user's wardrobe. Items are encoded per slot as
+    NumPy arrays and every pair of slots is scored as a whole matrix at once, so a
+    template's candidates are never enumerated one by one in Python.
+
+    An outfit's score is the weighted mean of its pairwise formality coherence, its
+    pairwise color harmony and its items' past ratings, each in [0, 1]. Because it is a
+    sum of per-pair and per-item terms, the best third item a top/bottom pair could get
+    is bounded by row maxima; pairs are extended best bound first and the search stops
+    once no remaining pair can beat the current k-th outfit.
+    """
+
+    def __init__(self, weights: ScoreWeights = ScoreWeights()):
+        self.weights = weights
+
+    def suggest(self, items: Iterable[ClothingItemRead], *, affinities: dict[int, float], k: int) -> list[OutfitCandidate]:
+        """
+        The k best outfits from `items`. `affinities` maps item ids to the user's mean past
+        rating of outfits containing them, scaled to [0, 1].
+        """
+        by_slot: dict[str, list[ClothingItemRead]] = {}
+        for item in items:
+            slot = CATEGORY_SLOTS.get(item.category.lower())
+            if slot is not None:
+                by_slot.setdefault(slot, []).append(item)
+
+        colors = {}
+        for slot_items in by_slot.values():
+            for item in slot_items:
+                for color in sorted(_item_colors(item)):
+                    colors.setdefault(color, len(colors))
+        harmony = _harmony_matrix(colors)
+        slots = {name: _Slot(slot_items, colors, affinities) for name, slot_items in by_slot.items()}
+
+        candidates = []
+        for template in TEMPLATES:
+            if all(name in slots for name in template):
+                candidates.extend(self._best([slots[name] for name in template], harmony, k))
+        candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+        return candidates[:k]
+
+    def _pair_scores(self, a: _Slot, b: _Slot, harmony: np.ndarray, pairs: int) -> np.ndarray:
+        formality = 1.0 - np.abs(a.formality[:, None] - b.formality[None, :]) / FORMALITY_RANGE
+        color = a.colors @ harmony @ b.colors.T
+        return (self.weights.formality * formality + self.weights.color * color) / pairs
+
+    def _best(self, slots: list[_Slot], harmony: np.ndarray, k: int) -> list[OutfitCandidate]:
+        pairs = len(slots) * (len(slots) - 1) // 2
+        unary = [self.weights.rating * slot.affinity / len(slots) for slot in slots]
+
+        if len(slots) == 2:
+            first, second = slots
+            scores = self._pair_scores(first, second, harmony, pairs) + unary[0][:, None] + unary[1][None, :]
+            return [
+                self._candidate(slots, harmony, np.unravel_index(index, scores.shape), float(scores.flat[index]))
+                for index in _top_k(scores, k)
+            ]
+
+        first, second, third = slots
+        base = self._pair_scores(first, second, harmony, pairs) + unary[0][:, None] + unary[1][None, :]
+        with_third_first = self._pair_scores(first, third, harmony, pairs)
+        with_third_second = self._pair_scores(second, third, harmony, pairs)
+        # The most any third item could add to each pair, from per-row maxima
+        bound = (
+            base
+            + with_third_first.max(axis=1)[:, None]
+            + with_third_second.max(axis=1)[None, :]
+            + unary[2].max()
+        ).ravel()
+
+        chunk = max(1, SCORE_CELL_BUDGET // len(third.items))
+        best_scores = np.empty(0, dtype=np.float32)
+        best_triples = np.empty((0, 3), dtype=np.int64)
+
+        def extend(pair_indices: np.ndarray):
+            nonlocal best_scores, best_triples
+            i, j = np.divmod(pair_indices, len(second.items))
+            scores = base.ravel()[pair_indices][:, None] + with_third_first[i] + with_third_second[j] + unary[2][None, :]
+            top = _top_k(scores, k)
+            rows, third_indices = np.unravel_index(top, scores.shape)
+            best_scores = np.concatenate([best_scores, scores.ravel()[top]])
+            best_triples = np.concatenate([best_triples, np.stack([i[rows], j[rows], third_indices], axis=1)])
+            keep = _top_k(best_scores, k)
+            best_scores, best_triples = best_scores[keep], best_triples[keep]
+
+        def threshold() -> float:
+            return best_scores[-1] if len(best_scores) >= k else -np.inf
+
+        # Seed a threshold from the most promising pairs, so only pairs that can still beat it get sorted
+        seed = _top_k(bound, chunk)
+        extend(seed)
+        bound[seed] = -np.inf
+        remaining = np.flatnonzero(bound > threshold())
+        remaining = remaining[np.argsort(-bound[remaining], kind="stable")]
+        for start in range(0, len(remaining), chunk):
+            block = remaining[start:start + chunk]
+            if bound[block[0]] <= threshold():
+                break
+            extend(block)
+
+        return [
+            self._candidate(slots, harmony, triple, float(score))
+            for triple, score in zip(best_triples, best_scores)
+        ]
+
+    def _candidate(self, slots: list[_Slot], harmony: np.ndarray, indices: Iterable[int], score: float) -> OutfitCandidate:
+        """Re-derives the score's components for the few outfits returned."""
+        rows = [int(index) for index in indices]
+        pairs = [(a, b) for a in range(len(slots)) for b in range(a + 1, len(slots))]
+        formality = np.mean([
+            1.0 - abs(slots[a].formality[rows[a]] - slots[b].formality[rows[b]]) / FORMALITY_RANGE for a, b in pairs
+        ])
+        color = np.mean([slots[a].colors[rows[a]] @ harmony @ slots[b].colors[rows[b]] for a, b in pairs])
+        rating = np.mean([slot.affinity[row] for slot, row in zip(slots, rows)])
+        return OutfitCandidate(
+            items=[slot.items[row] for slot, row in zip(slots, rows)],
+            score=score,
+            formality=float(formality),
+            color_harmony=float(color),
+            rating=float(rating),
+        )
+
+outfit_engine = OutfitEngine()
@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from sqlalchemy import Column
+
+from app.core.exceptions.pagination import InvalidCursorException
+
+def encode_cursor(columns: Sequence[Column], obj: Any) -> str:
+    """Encodes the seek position just past `obj` as an opaque, URL-safe string."""
+    values = [getattr(obj, column.key) for column in columns]
+    payload = {
+        "k": [column.key for column in columns],
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence[Column]) -> list[Any]:
+    """Turns a cursor from encode_cursor back into seek values for the same columns."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["k"] != [column.key for column in columns] or len(payload["v"]) != len(columns):
+            raise InvalidCursorException()
+        return [_from_json(column, value) for column, value in zip(columns, payload["v"])]
+    except InvalidCursorException:
+        raise
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorException() from e
+
+def _from_json(column: Column, value: Any) -> Any:
+    if value is None:
+        raise InvalidCursorException()
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
@@ -0,0 +1,86 @@
+import asyncio
+import multiprocessing
+import time
+import structlog
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from app.core.config import settings
+from app.core.context import request_id_var
+from app.core.exceptions.security import PasswordHasherBusyException
+from app.core.metrics import PASSWORD_HASH_CAPACITY, PASSWORD_HASH_DURATION, PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_REJECTED
+from app.core.security import get_password_hash, verify_password
+
+log = structlog.get_logger()
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop so a burst of logins cannot stall every other
+    request on the worker. Work beyond `max_pending` is rejected straight away
+    instead of queueing behind the pool.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        PASSWORD_HASH_CAPACITY.set(max_pending)
+
+    def start(self):
+        if self._executor is None and self.max_workers > 0:
+            # spawn instead of fork: forking a process that already runs an event loop is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            log.info("Password hashing pool started", workers=self.max_workers)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            log.info("Password hashing pool stopped")
+
+    async def _run(self, operation: str, func, *args):
+        if self._in_flight >= self.max_pending:
+            PASSWORD_HASH_REJECTED.labels(reason="queue_full").inc()
+            log.warn("Password hashing pool saturated", operation=operation, request_id=str(request_id_var.get()))
+            raise PasswordHasherBusyException()
+
+        self.start()
+        self._in_flight += 1
+        PASSWORD_HASH_IN_FLIGHT.set(self._in_flight)
+        start_time = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, func, *args)
+        # The slot is held until the pool is done with the job, not just until we stop waiting for it
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # The job keeps running in the pool; we only stop waiting for it.
+            PASSWORD_HASH_REJECTED.labels(reason="timeout").inc()
+            log.warn("Password hashing timed out", operation=operation, request_id=str(request_id_var.get()))
+            raise PasswordHasherBusyException()
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation=operation).observe(time.perf_counter() - start_time)
+
+    def _release(self, future: asyncio.Future):
+        self._in_flight -= 1
+        PASSWORD_HASH_IN_FLIGHT.set(self._in_flight)
+        # Retrieve the outcome of a job nobody waited for, so it isn't logged as never retrieved
+        if not future.cancelled():
+            future.exception()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
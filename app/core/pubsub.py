@@ -0,0 +1,93 @@
+import asyncio
+import structlog
+from typing import Awaitable, Callable
+
+from app.core.redis import redis_client
+
+log = structlog.get_logger()
+
+MessageHandler = Callable[[str], Awaitable[None] | None]
+ConnectHook = Callable[[], Awaitable[None]]
+DisconnectHook = Callable[[], None]
+
+class RedisSubscriber:
+    """
+    One Redis pub/sub connection per worker process, shared by every in-process
+    cache that needs to hear about changes made by other workers.
+
+    Handlers are registered per channel before `start()`. Connect hooks run after
+    each (re)subscription so caches can resync anything they missed while the
+    connection was down; disconnect hooks run as soon as the connection is lost.
+    """
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        self.reconnect_delay = reconnect_delay
+        self._handlers: dict[str, MessageHandler] = {}
+        self._on_connect: list[ConnectHook] = []
+        self._on_disconnect: list[DisconnectHook] = []
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, channel: str, handler: MessageHandler):
+        self._handlers[channel] = handler
+
+    def on_connect(self, hook: ConnectHook):
+        self._on_connect.append(hook)
+
+    def on_disconnect(self, hook: DisconnectHook):
+        self._on_disconnect.append(hook)
+
+    async def publish(self, channel: str, message: str):
+        try:
+            await redis_client.publish(channel, message)
+        except Exception as e:
+            log.error("Failed to publish invalidation", channel=channel, error=str(e))
+
+    async def _dispatch(self, channel: str, data: str):
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        result = handler(data)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _listen(self):
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(*self._handlers)
+                for hook in self._on_connect:
+                    await hook()
+                log.info("Subscribed to Redis channels", channels=list(self._handlers))
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        await self._dispatch(message["channel"], message["data"])
+                    except Exception as e:
+                        log.exception("Failed to handle pub/sub message", channel=message["channel"], exc_info=e)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warn("Redis pub/sub connection lost, retrying", error=str(e))
+            finally:
+                for hook in self._on_disconnect:
+                    hook()
+                await pubsub.aclose()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self):
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+redis_subscriber = RedisSubscriber()
@@ -0,0 +1,76 @@
+import time
+import structlog
+from collections import Counter
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.context import query_stats_var, request_id_var
+from app.core.metrics import DB_N_PLUS_ONE, DB_QUERIES_PER_REQUEST, DB_SLOWEST_QUERY, DB_TIME_PER_REQUEST
+
+log = structlog.get_logger()
+
+class QueryStats:
+    """Database activity of a single request, filled in by the engine event hooks."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements of the same shape (same SQL, different parameters) run at least `threshold` times."""
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_query_start_time", None)
+    if start_time is None:
+        return
+    elapsed = time.perf_counter() - start_time
+
+    # SQLAlchemy runs these hooks in a greenlet that inherits the caller's context, so this is the request's stats
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        log.warn(
+            "slow_query",
+            duration_ms=round(elapsed * 1000, 2),
+            statement=statement[:1000],
+            request_id=str(request_id_var.get()),
+        )
+
+def instrument_engine(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+def observe_request(stats: QueryStats, route: str):
+    """Exports one finished request's stats and flags likely N+1 patterns."""
+    DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.count)
+    DB_TIME_PER_REQUEST.labels(route=route).observe(stats.total_time)
+    if stats.count:
+        DB_SLOWEST_QUERY.labels(route=route).observe(stats.slowest_time)
+
+    for statement, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD).items():
+        DB_N_PLUS_ONE.labels(route=route).inc()
+        log.warn(
+            "n_plus_one_detected",
+            route=route,
+            executions=count,
+            statement=statement[:1000],
+            request_id=str(request_id_var.get()),
+        )
@@ -0,0 +1,113 @@
+import math
+import time
+import uuid
+import structlog
+from collections import defaultdict, deque
+from typing import Awaitable, Callable
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.context import request_id_var
+from app.core.exceptions.security import RateLimitExceededException
+from app.core.metrics import RATE_LIMIT_REJECTED
+from app.core.redis import redis_client
+
+log = structlog.get_logger()
+
+# KEYS: window key
+# ARGV: now ms, window ms, limit, unique member
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return tonumber(oldest[2]) + window - now
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return -1
+"""
+
+class RedisSlidingWindowBackend:
+    """Sliding-window log kept in a Redis sorted set, so the limit holds across every gunicorn worker."""
+
+    def __init__(self):
+        self._script = redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        """Records a hit; returns the seconds until the next one would be allowed if over the limit."""
+        now_ms = int(time.time() * 1000)
+        wait_ms = await self._script(keys=[key], args=[now_ms, int(window * 1000), limit, f"{now_ms}-{uuid.uuid4().hex}"])
+        return None if wait_ms < 0 else wait_ms / 1000
+
+class InMemorySlidingWindowBackend:
+    """Per-process equivalent of the Redis backend, for tests and single-process development."""
+
+    def __init__(self):
+        self._hits: dict[str, deque[float]] = defaultdict(deque)
+
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        now = time.monotonic()
+        hits = self._hits[key]
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return hits[0] + window - now
+        hits.append(now)
+        return None
+
+    def reset(self):
+        self._hits.clear()
+
+RateLimitKey = Callable[[Request], Awaitable[str | None]]
+
+async def client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+def form_field(name: str) -> RateLimitKey:
+    async def key(request: Request) -> str | None:
+        value = (await request.form()).get(name)
+        return value.strip().lower() if isinstance(value, str) and value else None
+    return key
+
+def json_field(name: str) -> RateLimitKey:
+    async def key(request: Request) -> str | None:
+        try:
+            value = (await request.json()).get(name)
+        except (ValueError, AttributeError):
+            return None
+        return value.strip().lower() if isinstance(value, str) and value else None
+    return key
+
+class RateLimit:
+    """
+    FastAPI dependency that rejects a request with 429 once `key(request)` has
+    been seen `limit` times within the last `window` seconds. Use it in the
+    route's `dependencies=[...]` so it runs before the endpoint does any work.
+    """
+
+    def __init__(self, *, scope: str, limit: int, window: float, key: RateLimitKey):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.key = key
+
+    async def __call__(self, request: Request):
+        identity = await self.key(request)
+        if identity is None:
+            return
+
+        try:
+            retry_after = await rate_limiter.hit(f"ratelimit:{self.scope}:{identity}", self.limit, self.window)
+        except Exception as e:
+            # Fail open: losing Redis should not lock everyone out of logging in
+            log.error("Rate limiter unavailable", scope=self.scope, error=str(e), request_id=str(request_id_var.get()))
+            return
+
+        if retry_after is not None:
+            RATE_LIMIT_REJECTED.labels(scope=self.scope).inc()
+            log.warn("Rate limit exceeded", scope=self.scope, request_id=str(request_id_var.get()))
+            raise RateLimitExceededException(retry_after=max(1, math.ceil(retry_after)))
+
+rate_limiter = InMemorySlidingWindowBackend() if settings.RATE_LIMIT_BACKEND == "memory" else RedisSlidingWindowBackend()
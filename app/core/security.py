@@ -5,6 +5,9 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+# Bump whenever the shape of the "usr" claim changes; older tokens then fall back to a DB lookup
+PRINCIPAL_CLAIMS_VERSION = 1
+
 def verify_password(plain_password: str, hashed_password:str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -18,6 +21,9 @@ def create_token(data: dict, expires_delta: timedelta, secret_key: str):
     return jwt.encode(to_encode, secret_key, algorithm=settings.ALGORITHM)
 
 
+def build_principal_claims(*, user_id: int, is_active: bool, token_version: int) -> dict:
+    return {"v": PRINCIPAL_CLAIMS_VERSION, "id": user_id, "act": is_active, "tv": token_version}
+
 def create_access_token(data: dict) -> str:
     expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return create_token(data, expires_delta, settings.ACCESS_SECRET_KEY)
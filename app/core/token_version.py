@@ -0,0 +1,52 @@
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pubsub import redis_subscriber
+from app.core.redis import redis_client
+
+BUMP_CHANNEL = "token_version:bump"
+
+def _key(user_id: int) -> str:
+    return f"user:{user_id}:token_version"
+
+class TokenVersionStore:
+    """
+    Per-user counter embedded in stateless access tokens. Bumping it revokes
+    every access token issued to that user before the bump.
+
+    Versions are mirrored locally so validating a token stays CPU-only; the
+    mirror is only trusted while this worker hears bumps over pub/sub.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.enabled = False
+
+    async def get(self, user_id: int) -> int:
+        version = self._cache.get(user_id) if self.enabled else None
+        if version is None:
+            version = int(await redis_client.get(_key(user_id)) or 0)
+            if self.enabled:
+                self._cache.set(user_id, version)
+        return version
+
+    async def bump(self, user_id: int) -> int:
+        version = await redis_client.incr(_key(user_id))
+        self._cache.pop(user_id)
+        await redis_subscriber.publish(BUMP_CHANNEL, str(user_id))
+        return version
+
+    def _evict(self, data: str):
+        self._cache.pop(int(data))
+
+    async def _on_connect(self):
+        self.enabled = True
+
+    def _on_disconnect(self):
+        self.enabled = False
+        self._cache.clear()
+
+token_version_store = TokenVersionStore(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+redis_subscriber.subscribe(BUMP_CHANNEL, token_version_store._evict)
+redis_subscriber.on_connect(token_version_store._on_connect)
+redis_subscriber.on_disconnect(token_version_store._on_disconnect)
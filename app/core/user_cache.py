@@ -0,0 +1,78 @@
+import copy
+from typing import Any
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import USER_CACHE_HITS, USER_CACHE_MISSES, USER_CACHE_SIZE
+from app.core.pubsub import redis_subscriber
+from app.models.user import User
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+class UserCache:
+    """
+    Per-process cache of authenticated users keyed by email.
+
+    Entries are column snapshots rather than ORM instances so that nothing a
+    request does to its own `User` object can leak into the cache. A hit is
+    attached to the caller's session without emitting a SELECT.
+
+    Fill by reading `epoch` before the user row and passing it to `set`, so a row
+    read before an invalidation that landed in between is not cached.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.enabled = False
+        # Bumped by every eviction, so a user read before one is not cached
+        self.epoch = 0
+
+    async def get(self, *, db: AsyncSession, email: str) -> User | None:
+        snapshot = self._cache.get(email)
+        if snapshot is None:
+            USER_CACHE_MISSES.inc()
+            return None
+
+        USER_CACHE_HITS.inc()
+        user = User(**copy.deepcopy(snapshot))
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    def set(self, user: User, *, epoch: int):
+        if not self.enabled or epoch != self.epoch:
+            return
+        snapshot: dict[str, Any] = copy.deepcopy(user.model_dump())
+        self._cache.set(user.email, snapshot)
+        USER_CACHE_SIZE.set(len(self._cache))
+
+    def _evict(self, email: str):
+        self.epoch += 1
+        self._cache.pop(email)
+        USER_CACHE_SIZE.set(len(self._cache))
+
+    def clear(self):
+        self.epoch += 1
+        self._cache.clear()
+        USER_CACHE_SIZE.set(0)
+
+    async def _on_connect(self):
+        self.enabled = True
+
+    def _on_disconnect(self):
+        self.enabled = False
+        # Bumped by every eviction, so a user read before one is not cached
+        self.epoch = 0
+        self.clear()
+
+    async def invalidate(self, email: str):
+        """Drops the user here and tells every other worker to do the same."""
+        self._evict(email)
+        await redis_subscriber.publish(INVALIDATION_CHANNEL, email)
+
+user_cache = UserCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+redis_subscriber.subscribe(INVALIDATION_CHANNEL, user_cache._evict)
+redis_subscriber.on_connect(user_cache._on_connect)
+redis_subscriber.on_disconnect(user_cache._on_disconnect)
@@ -0,0 +1,224 @@
+import uuid
+from typing import Iterable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import WARDROBE_INDEX_HITS, WARDROBE_INDEX_MISSES, WARDROBE_INDEX_SIZE
+from app.core.pubsub import redis_subscriber
+from app.schemas.wardrobe import ClothingItemRead
+
+INVALIDATION_CHANNEL = "wardrobe_index:invalidate"
+
+# Tags this worker's invalidations so it does not throw away the index it just updated itself
+PROCESS_ID = uuid.uuid4().hex
+
+FACETS = ("category", "color", "fit_type")
+
+def _iter_slots(bits: int) -> Iterable[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+class WardrobeIndex:
+    """
+    Inverted index over one user's clothing items. Every item gets a slot; each category,
+    color, fit type and formality level maps to an int bitset of the slots that have it.
+    Filters AND/OR whole bitsets, so a query never looks at items one by one until the
+    matches are materialized. Values are matched case-insensitively.
+    """
+
+    def __init__(self):
+        self.items: dict[int, ClothingItemRead] = {}
+        self._slot_of: dict[int, int] = {}
+        self._item_at: dict[int, int] = {}
+        self._free_slots: list[int] = []
+        self._next_slot = 0
+        self._live = 0
+        self._postings: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        self._levels: dict[int, int] = {}
+
+    @classmethod
+    def build(cls, items: Iterable[ClothingItemRead]) -> "WardrobeIndex":
+        index = cls()
+        for item in items:
+            index.upsert(item)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @staticmethod
+    def _values(item: ClothingItemRead) -> dict[str, set[str]]:
+        return {
+            "category": {item.category.lower()},
+            "color": {color.lower() for color in item.colors},
+            "fit_type": {item.fit_type.lower()} if item.fit_type else set(),
+        }
+
+    def upsert(self, item: ClothingItemRead):
+        if item.id in self.items:
+            self.remove(item.id)
+        slot = self._free_slots.pop() if self._free_slots else self._next_slot
+        if slot == self._next_slot:
+            self._next_slot += 1
+
+        bit = 1 << slot
+        self.items[item.id] = item
+        self._slot_of[item.id] = slot
+        self._item_at[slot] = item.id
+        self._live |= bit
+        for facet, values in self._values(item).items():
+            postings = self._postings[facet]
+            for value in values:
+                postings[value] = postings.get(value, 0) | bit
+        self._levels[item.formality_level] = self._levels.get(item.formality_level, 0) | bit
+
+    def remove(self, item_id: int):
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        slot = self._slot_of.pop(item_id)
+        del self._item_at[slot]
+        bit = 1 << slot
+        self._live &= ~bit
+        for facet, values in self._values(item).items():
+            postings = self._postings[facet]
+            for value in values:
+                postings[value] &= ~bit
+                if not postings[value]:
+                    del postings[value]
+        self._levels[item.formality_level] &= ~bit
+        if not self._levels[item.formality_level]:
+            del self._levels[item.formality_level]
+        self._free_slots.append(slot)
+
+    def _facet_mask(self, facet: str, values: list[str], match_all: bool = False) -> int:
+        postings = self._postings[facet]
+        if match_all:
+            mask = self._live
+            for value in values:
+                mask &= postings.get(value.lower(), 0)
+            return mask
+        mask = 0
+        for value in values:
+            mask |= postings.get(value.lower(), 0)
+        return mask
+
+    def _formality_mask(self, low: int | None, high: int | None) -> int:
+        # Formality is a small scale, so a range is an OR over a handful of level bitsets
+        mask = 0
+        for level, bits in self._levels.items():
+            if (low is None or level >= low) and (high is None or level <= high):
+                mask |= bits
+        return mask
+
+    def search(
+        self,
+        *,
+        category: list[str] | None = None,
+        color: list[str] | None = None,
+        colors_match_all: bool = False,
+        fit_type: list[str] | None = None,
+        formality_min: int | None = None,
+        formality_max: int | None = None,
+    ) -> tuple[list[ClothingItemRead], dict[str, dict[str, int]]]:
+        """
+        Items matching every given facet (any of the listed values within a facet, or all
+        colors with colors_match_all), newest first, plus counts per facet value. Each
+        facet's counts apply every filter except its own, so they show how many items
+        picking another value of that facet would give.
+        """
+        masks = {}
+        if category:
+            masks["category"] = self._facet_mask("category", category)
+        if color:
+            masks["color"] = self._facet_mask("color", color, match_all=colors_match_all)
+        if fit_type:
+            masks["fit_type"] = self._facet_mask("fit_type", fit_type)
+        if formality_min is not None or formality_max is not None:
+            masks["formality_level"] = self._formality_mask(formality_min, formality_max)
+
+        def combined(excluding: str | None = None) -> int:
+            mask = self._live
+            for facet, facet_mask in masks.items():
+                if facet != excluding:
+                    mask &= facet_mask
+            return mask
+
+        facets = {}
+        for facet in FACETS:
+            base = combined(excluding=facet)
+            counts = {value: (bits & base).bit_count() for value, bits in self._postings[facet].items()}
+            facets[facet] = {value: count for value, count in sorted(counts.items()) if count}
+        base = combined(excluding="formality_level")
+        counts = {level: (bits & base).bit_count() for level, bits in sorted(self._levels.items())}
+        facets["formality_level"] = {str(level): count for level, count in counts.items() if count}
+
+        matched = [self.items[self._item_at[slot]] for slot in _iter_slots(combined())]
+        matched.sort(key=lambda item: (item.created_at, item.id), reverse=True)
+        return matched, facets
+
+class WardrobeIndexCache:
+    """
+    Per-process LRU of WardrobeIndex by user id. Writes in this worker update the cached
+    index in place; other workers drop theirs over pub/sub and rebuild on next use.
+    Like the user cache, nothing is cached while the pub/sub connection is down.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.enabled = False
+        # Bumped by every change, so an index built from rows read before one is not cached
+        self.epoch = 0
+
+    def get(self, user_id: int) -> WardrobeIndex | None:
+        index = self._cache.get(user_id) if self.enabled else None
+        if index is None:
+            WARDROBE_INDEX_MISSES.inc()
+        else:
+            WARDROBE_INDEX_HITS.inc()
+        return index
+
+    def set(self, user_id: int, index: WardrobeIndex, *, epoch: int):
+        if not self.enabled or epoch != self.epoch:
+            return
+        self._cache.set(user_id, index)
+        WARDROBE_INDEX_SIZE.set(len(self._cache))
+
+    async def items_changed(self, user_id: int, *, upserted: Iterable[ClothingItemRead] = (), deleted: Iterable[int] = ()):
+        """Applies committed item writes to this worker's index and tells every other worker to drop theirs."""
+        self.epoch += 1
+        index = self._cache.get(user_id)
+        if index is not None:
+            for item in upserted:
+                index.upsert(item)
+            for item_id in deleted:
+                index.remove(item_id)
+        await redis_subscriber.publish(INVALIDATION_CHANNEL, f"{PROCESS_ID}:{user_id}")
+
+    def _evict(self, data: str):
+        origin, _, user_id = data.partition(":")
+        if origin == PROCESS_ID:
+            return
+        self.epoch += 1
+        self._cache.pop(int(user_id))
+        WARDROBE_INDEX_SIZE.set(len(self._cache))
+
+    def clear(self):
+        self.epoch += 1
+        self._cache.clear()
+        WARDROBE_INDEX_SIZE.set(0)
+
+    async def _on_connect(self):
+        self.enabled = True
+
+    def _on_disconnect(self):
+        self.enabled = False
+        self.clear()
+
+wardrobe_index = WardrobeIndexCache(max_size=settings.WARDROBE_INDEX_MAX_USERS, ttl=settings.WARDROBE_INDEX_TTL_SECONDS)
+
+redis_subscriber.subscribe(INVALIDATION_CHANNEL, wardrobe_index._evict)
+redis_subscriber.on_connect(wardrobe_index._on_connect)
+redis_subscriber.on_disconnect(wardrobe_index._on_disconnect)
@@ -1,13 +1,271 @@
+import asyncio
+import itertools
+import time
+import structlog
+from contextlib import asynccontextmanager, contextmanager
+from typing import Awaitable, Callable, Iterable
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.redis import redis_client
+from app.core.metrics import (
+    DB_COMPILED_CACHE, DB_COMPILED_CACHE_SIZE, DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_SIZE, DB_POOL_WAIT, DB_ROUTED_STATEMENTS,
+)
+from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import event, make_url
+from sqlalchemy.engine import default
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.util import await_only
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+log = structlog.get_logger()
 
-async def get_db() -> AsyncSession:
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start_time)
+
+_CACHE_RESULTS = {
+    default.CACHE_HIT: "hit",
+    default.CACHE_MISS: "miss",
+    default.CACHING_DISABLED: "disabled",
+    default.NO_CACHE_KEY: "no_key",
+    default.NO_DIALECT_SUPPORT: "unsupported",
+}
+
+def _count_compiled_cache_result(conn, cursor, statement, parameters, context, executemany):
+    DB_COMPILED_CACHE.labels(result=_CACHE_RESULTS.get(context.cache_hit, "unknown")).inc()
+
+def _create_engine(url: str):
+    url = make_url(url)
+    if url.get_driver_name() == "asyncpg":
+        # Server-side prepared statements are cached per connection, keyed by SQL text
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)})
+    created = create_async_engine(
+        url,
+        echo=False,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
     )
+    event.listen(created.sync_engine, "before_cursor_execute", _count_compiled_cache_result)
+    instrument_engine(created.sync_engine)
+    return created
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engines = [_create_engine(url.strip()) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+_replica_counter = itertools.count()
+
+class RecentWrites:
+    """
+    Marks tables committed to within the read-your-writes window with a short-lived
+    Redis key (`recent_write:{table}`), so a read served by any worker after a commit
+    in another one still goes to the primary. If Redis cannot be reached, every
+    table is treated as recently written and reads fall back to the primary.
+    """
+
+    def __init__(self, *, window: float, redis=redis_client):
+        self.window = window
+        self.redis = redis
+
+    @staticmethod
+    def _key(table: str) -> str:
+        return f"recent_write:{table}"
+
+    async def mark(self, tables: Iterable[str]):
+        tables = sorted(tables)
+        if not tables:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for table in tables:
+                    pipe.set(self._key(table), 1, px=max(1, int(self.window * 1000)))
+                await pipe.execute()
+        except Exception as e:
+            log.error("Failed to mark recent writes", tables=tables, error=str(e))
+
+    async def written(self, tables: Iterable[str]) -> set[str]:
+        """The subset of `tables` committed to by any worker within the window."""
+        tables = list(tables)
+        try:
+            values = await self.redis.mget([self._key(table) for table in tables])
+        except Exception as e:
+            log.warn("Failed to read recent writes, reading from the primary", error=str(e))
+            return set(tables)
+        return {table for table, value in zip(tables, values) if value is not None}
+
+recent_writes = RecentWrites(window=settings.READ_YOUR_WRITES_SECONDS)
+
+def _statement_tables(mapper, clause) -> set[str]:
+    tables = {table.name for table in mapper.tables} if mapper is not None else set()
+    if clause is not None:
+        tables.update(table.name for table in find_tables(clause, include_joins=True, include_crud=True))
+    return tables
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to the replicas in round-robin order and everything else
+    to the primary. Once a session has written, the rest of its transaction stays
+    on the primary, and tables committed to by any worker are read from the primary
+    for READ_YOUR_WRITES_SECONDS so replica lag never hides a write that just
+    happened. Those markers are only looked up for a SELECT that would otherwise go
+    to a replica, once per table per session, so a session that never reads from a
+    replica never asks Redis. Set `db.info["use_primary"] = True` to pin a session
+    to the primary outright, or wrap reads in `use_primary(db)`.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not replica_engines:
+            return engine.sync_engine
+
+        tables = _statement_tables(mapper, clause)
+        is_read = not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None
+        if not is_read:
+            self.info.setdefault("written_tables", set()).update(tables)
+
+        if not is_read or "written_tables" in self.info or self.info.get("use_primary") or self._recently_written(tables):
+            DB_ROUTED_STATEMENTS.labels(target="primary").inc()
+            return engine.sync_engine
+
+        DB_ROUTED_STATEMENTS.labels(target="replica").inc()
+        return replica_engines[next(_replica_counter) % len(replica_engines)].sync_engine
+
+    def _recently_written(self, tables: set[str]) -> bool:
+        written = self.info.setdefault("recent_writes", set())
+        checked = self.info.setdefault("recent_writes_checked", set())
+        unchecked = tables - checked
+        if unchecked:
+            # get_bind runs inside AsyncSession's greenlet, so the Redis lookup can be awaited from here
+            written.update(await_only(recent_writes.written(unchecked)))
+            checked.update(unchecked)
+        return not tables.isdisjoint(written)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_committed_writes(session: RoutingSession):
+    tables = session.info.pop("written_tables", set())
+    session.info.setdefault("recent_writes", set()).update(tables)
+    session.info.setdefault("recent_writes_checked", set()).update(tables)
+    # Marked in Redis by RoutingAsyncSession.commit, which can await
+    session.info.setdefault("committed_tables", set()).update(tables)
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_rolled_back_writes(session: RoutingSession):
+    session.info.pop("written_tables", None)
+
+class RoutingAsyncSession(AsyncSession):
+    sync_session_class = RoutingSession
+
+    async def commit(self):
+        await super().commit()
+        await recent_writes.mark(self.info.pop("committed_tables", ()))
+
+# Built once per process; get_db only opens sessions from it
+async_session = async_sessionmaker(engine, class_=RoutingAsyncSession, expire_on_commit=False)
+
+DB_POOL_SIZE.set(settings.DB_POOL_SIZE)
+DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+DB_POOL_OVERFLOW.set_function(lambda: max(engine.pool.overflow(), 0))
+DB_COMPILED_CACHE_SIZE.set_function(lambda: len(engine.sync_engine._compiled_cache or ()))
+
+async def warm_pool():
+    """Opens connections up front so the first requests after startup do not pay for the handshakes."""
+    count = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    connections = await asyncio.gather(*(
+        target.connect() for target in [engine, *replica_engines] for _ in range(count)
+    ))
+    for connection in connections:
+        await connection.close()
+
+async def dispose_engines():
+    for target in [engine, *replica_engines]:
+        await target.dispose()
+
+@contextmanager
+def use_primary(db: AsyncSession):
+    """
+    Sends the reads inside the block to the primary. Meant for rows that are about to
+    be cached, so a lagging replica cannot seed a cache with data already overwritten.
+    """
+    previous = db.info.get("use_primary")
+    db.info["use_primary"] = True
+    try:
+        yield db
+    finally:
+        if previous is None:
+            db.info.pop("use_primary", None)
+        else:
+            db.info["use_primary"] = previous
+
+async def get_db() -> AsyncSession:
     async with async_session() as db:
-        yield db
\ No newline at end of file
+        yield db
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession):
+    """
+    Groups repository calls into one transaction. The outermost block commits once
+    on success and rolls back on error; nested blocks run in a SAVEPOINT, so a failed
+    inner step can be caught without losing the work around it. Every statement in
+    the transaction, reads before its first write included, goes to the primary, so
+    rows it checks or diffs against are never a lagging replica's copy.
+
+        async with unit_of_work(db):
+            user = await user_repo.create(db=db, obj_in=...)
+            await session_repo.create_session(db=db, ...)
+    """
+    depth = db.info.get("uow_depth", 0)
+    callbacks = db.info.setdefault("uow_on_commit", [])
+    db.info["uow_depth"] = depth + 1
+    try:
+        if depth:
+            registered = len(callbacks)
+            try:
+                async with db.begin_nested():
+                    yield db
+            except BaseException:
+                del callbacks[registered:]
+                raise
+            return
+
+        with use_primary(db):
+            try:
+                yield db
+                await db.commit()
+            except BaseException:
+                callbacks.clear()
+                await db.rollback()
+                raise
+    finally:
+        db.info["uow_depth"] = depth
+
+    pending = callbacks[:]
+    callbacks.clear()
+    for callback in pending:
+        try:
+            await callback()
+        except Exception as e:
+            log.exception("After-commit callback failed", exc_info=e)
+
+async def on_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]):
+    """
+    Runs `callback` once the enclosing unit of work has committed, and not at all if
+    it rolls back. Meant for side effects outside the database, such as cache
+    invalidation, that must not be observed before the write is. Outside a unit of
+    work the callback runs immediately.
+    """
+    if db.info.get("uow_depth", 0):
+        db.info.setdefault("uow_on_commit", []).append(callback)
+    else:
+        await callback()
@@ -7,20 +7,37 @@ from app.api.v1.api import api_router
 from app.core.exceptions.base import CustomException
 from app.core.exceptions.handlers import custom_exception_handler, generic_exception_handler
 from app.core.middlewares.correlation import CorrelationIDMiddleware
+from app.core.middlewares.query_stats import QueryStatsMiddleware
 from app.core.logging_config import setup_logging
 from app.core.rabbitmq import rabbitmq_manager
+from app.db import dispose_engines, warm_pool
+from app.core.password_hasher import password_hasher
+from app.core.pubsub import redis_subscriber
+from app.repositories.session_repo import session_repo
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
     await rabbitmq_manager._get_connection()
+    await warm_pool()
+    password_hasher.start()
+    redis_subscriber.start()
+    if session_repo.audit is not None:
+        session_repo.audit.start()
     yield
+    if session_repo.audit is not None:
+        await session_repo.audit.stop()
+    await redis_subscriber.stop()
+    password_hasher.shutdown()
     await rabbitmq_manager.close()
+    await dispose_engines()
 
 app = FastAPI(title="Production Grade FastAPI", lifespan=lifespan)
 
 Instrumentator().instrument(app).expose(app)
 
+# Added first so it runs inside CorrelationIDMiddleware and sees the request id
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(CorrelationIDMiddleware)
 app.add_exception_handler(Exception, generic_exception_handler)
 app.add_exception_handler(CustomException, custom_exception_handler)
@@ -3,7 +3,7 @@
 from .user import User
 from .session import Session
 from .password_reset_token import PasswordResetToken
-from .wardrobe import ClothingItem, Outfit, ShoppingRecommendation
+from .wardrobe import ClothingItem, Outfit, OutfitItem, ShoppingRecommendation
 from .conversation import Conversation
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     "PasswordResetToken",
     "ClothingItem",
     "Outfit",
+    "OutfitItem",
     "ShoppingRecommendation",
     "Conversation",
 ]
\ No newline at end of file
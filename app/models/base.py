@@ -1,6 +1,10 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 
+# JSONB in Postgres so columns can be GIN-indexed and filtered with @> / ?; plain JSON on SQLite for tests
+JSONType = JSONB().with_variant(JSON(), "sqlite")
+
 class TimestampModel(SQLModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime | None = Field(default=None, sa_column_kwargs={"onupdate": datetime.utcnow})
\ No newline at end of file
@@ -1,8 +1,9 @@
-from sqlmodel import Field, Relationship, JSON, Column
+from sqlmodel import Field, Relationship, Column, Index
+from sqlalchemy import Integer, Sequence
 from typing import TYPE_CHECKING
+from datetime import datetime
 
-
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, JSONType
 from app.core.enums import MessageRole
 
 if TYPE_CHECKING:
@@ -11,24 +12,36 @@ if TYPE_CHECKING:
 class Conversation(TimestampModel, table=True):
     """Model representing the chat room or session header"""
 
+    __table_args__ = (Index("ix_conversation_user_id_created_at_id", "user_id", "created_at", "id"),)
+
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
     chat_name: str
 
     # Relationships
-    messages: list["ConversationMessage"] = Relationship(back_populates="conversation")
+    # Never loaded whole; read history through ConversationMessageRepo's pages or export stream
+    messages: list["ConversationMessage"] = Relationship(back_populates="conversation", sa_relationship_kwargs={"lazy": "raise"})
     user: "User" = Relationship(back_populates="conversations")
 
 
 class ConversationMessage(TimestampModel, table=True):
-    """Model representing a single message within a conversation"""
+    """
+    Model representing a single message within a conversation.
+    Range-partitioned by month on created_at in Postgres (see PartitionMaintainer), so the
+    partition key is part of the primary key; ids still come from one shared sequence.
+    """
 
     __tablename__ = "conversation_message"
+    __table_args__ = (
+        Index("ix_conversation_message_conversation_id_created_at_id", "conversation_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: int | None = Field(default=None, primary_key=True)
+    id: int | None = Field(default=None, sa_column=Column(Integer, Sequence("conversation_message_id_seq"), primary_key=True))
+    created_at: datetime = Field(default_factory=datetime.utcnow, primary_key=True)
     conversation_id: int = Field(foreign_key="conversation.id")
     role: MessageRole
-    content: dict = Field(sa_column=Column(JSON))
+    content: dict = Field(sa_column=Column(JSONType))
 
     # Relationships
     conversation: "Conversation" = Relationship(back_populates="messages")
\ No newline at end of file
@@ -13,7 +13,7 @@ class PasswordResetToken(TimestampModel, table=True):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     token_hash: str = Field(unique=True, index=True)
-    expires_at: datetime
+    expires_at: datetime = Field(index=True)
     user_id: int = Field(foreign_key="user.id")
 
     user: "User" = Relationship(back_populates="password_reset_tokens")
\ No newline at end of file
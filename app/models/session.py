@@ -10,9 +10,11 @@ if TYPE_CHECKING:
 
 class Session(TimestampModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    expires_at: datetime
+    expires_at: datetime = Field(index=True)
     user_id: int = Field(foreign_key='user.id')
     user_agent: str = Field(default=None)
     ip_address: str = Field(default=None)
+    # The id this session was rotated from, used to spot a refresh token being replayed
+    previous_id: uuid.UUID | None = Field(default=None, index=True)
 
     user: "User" = Relationship(back_populates="sessions")
\ No newline at end of file
@@ -1,7 +1,7 @@
-from sqlmodel import Field, Relationship, SQLModel, JSON, Column
+from sqlmodel import Field, Relationship, SQLModel, Column, Index
 from typing import TYPE_CHECKING, Any
 
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, JSONType
 
 if TYPE_CHECKING:
     from app.models.session import Session
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
     from app.models.conversation import Conversation
 
 class User(TimestampModel, table=True):
+    __table_args__ = (Index("ix_user_style_preferences", "style_preferences", postgresql_using="gin"),)
+
     id: int | None = Field(default=None, primary_key=True)
     email: str = Field(unique=True, index=True)
     hashed_password: str
@@ -18,10 +20,10 @@ class User(TimestampModel, table=True):
     # AI Stylist related fields
     body_type: str | None = Field(default=None)
     skin_tone: str | None = Field(default=None)
-    style_preferences: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
+    style_preferences: dict[str, Any] | None = Field(default=None, sa_column=Column(JSONType))
     budget_range: str | None = Field(default=None)
     lifestyle: str | None = Field(default=None)
-    sizing_info: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
+    sizing_info: dict[str, Any] | None = Field(default=None, sa_column=Column(JSONType))
 
     # Relationships
     sessions: list["Session"] = Relationship(back_populates="user")
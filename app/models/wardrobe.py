@@ -1,58 +1,97 @@
-from sqlmodel import Field, Relationship, JSON, Column
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Relationship, Column, Index
 from typing import TYPE_CHECKING
 
-from app.models.base import TimestampModel
+from app.models.base import TimestampModel, JSONType
 
 if TYPE_CHECKING:
     from app.models.user import User
 
 
+class OutfitItem(SQLModel, table=True):
+    """Association between an outfit and the clothing items it is made of, in display order"""
+
+    __tablename__ = "outfit_item"
+
+    outfit_id: int = Field(foreign_key="outfit.id", primary_key=True, ondelete="CASCADE")
+    clothing_item_id: int = Field(foreign_key="clothingitem.id", primary_key=True, index=True, ondelete="CASCADE")
+    position: int = Field(default=0, description="Order of the item within the outfit")
+
+
 class ClothingItem(TimestampModel, table=True):
     """Model representing a single clothing item in a user's wardrobe"""
 
+    __table_args__ = (
+        Index("ix_clothingitem_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_clothingitem_colors", "colors", postgresql_using="gin"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
 
     description: str = Field(description="description of the clothing item")
     category: str = Field(description="Main category (shirt, pants, dress, shoes, etc.)")
-    colors: list[str] = Field(sa_column=Column(JSON), default_factory=list)
+    colors: list[str] = Field(sa_column=Column(JSONType), default_factory=list)
     fit_type: str | None = Field(default=None, description="Fit type (slim, regular, loose, etc.)")
     formality_level: int = Field(default=3, description="Formality level on 1-5 scale")
     image_url: str | None = Field(default=None, description="URL to stored image of the item")
 
     # Relationships
     user: "User" = Relationship(back_populates="clothing_items")
+    outfits: list["Outfit"] = Relationship(
+        back_populates="clothing_items",
+        link_model=OutfitItem,
+        sa_relationship_kwargs={"viewonly": True, "lazy": "raise"},
+    )
 
 
 class Outfit(TimestampModel, table=True):
     """Model representing a complete outfit combination"""
 
+    __table_args__ = (
+        Index("ix_outfit_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
 
     name: str | None = Field(default=None, description="User-given name for the outfit")
-    clothing_items: list[int] = Field(sa_column=Column(JSON), default_factory=list)
     description: str | None = Field(default=None, description="occasion, weather, season, vibe, etc")
     user_rating: int | None = Field(default=None, description="User rating (1-5 stars)")
 
     # Relationships
     user: "User" = Relationship(back_populates="outfits")
+    # Written through OutfitRepo.set_items, which owns the positions; loaded in one batched query per page of outfits
+    clothing_items: list["ClothingItem"] = Relationship(
+        back_populates="outfits",
+        link_model=OutfitItem,
+        sa_relationship_kwargs={"viewonly": True, "lazy": "selectin", "order_by": "OutfitItem.position"},
+    )
 
 
 class ShoppingRecommendation(TimestampModel, table=True):
     """Model representing a shopping recommendation for the user"""
 
     __tablename__ = "shopping_recommendation"
+    __table_args__ = (
+        Index("ix_shopping_recommendation_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Only open recommendations are ever ranked, and purchased ones pile up over time
+        Index(
+            "ix_shopping_recommendation_user_id_open_priority", "user_id", text("priority_score DESC"), text("id DESC"),
+            postgresql_where=text("NOT purchased"),
+        ),
+        Index("ix_shopping_recommendation_complementary_items", "complementary_items", postgresql_using="gin", postgresql_ops={"complementary_items": "jsonb_path_ops"}),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
+    user_id: int = Field(foreign_key="user.id")
 
     item_type: str = Field(description="Type of item to purchase")
     description: str = Field(description="Detailed description of the recommended item")
     reasoning: str = Field(description="AI reasoning for why this item is recommended")
     priority_score: float = Field(description="Priority score (0.0-1.0) for this recommendation")
     estimated_price_range: str | None = Field(default=None)
-    complementary_items: list[int] = Field(sa_column=Column(JSON), default_factory=list)
+    complementary_items: list[int] = Field(sa_column=Column(JSONType), default_factory=list)
     purchased: bool = Field(default=False)
 
     # Relationships
@@ -1,11 +1,27 @@
-from typing import Any, Type
-from sqlmodel import SQLModel, select
+import enum
+import json
+from datetime import datetime
+from typing import Any, Literal, Type
+from sqlalchemy import JSON, bindparam, func, insert, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Select
+from sqlmodel import SQLModel, select, delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.encoders import jsonable_encoder
 
+from app.core.config import settings
+from app.core.exceptions.repository import ConcurrentUpdateException
+from app.core.pagination import decode_cursor, encode_cursor
+
 class BaseRepo:
+    """
+    Generic data access for one model. Writes are flushed, never committed: callers
+    group them into a transaction with app.db.unit_of_work.
+    """
+
     def __init__(self, model: Type[SQLModel]):
         self.model = model
+        self._field_statements: dict[str, Select] = {}
 
     async def get_by_id(self, *, db: AsyncSession, id: Any) -> SQLModel | None:
         return await db.get(self.model, id)
@@ -15,36 +31,252 @@ class BaseRepo:
         result = await db.exec(statement)
         return result.all()
 
+    async def get_page(
+        self,
+        *,
+        db: AsyncSession,
+        limit: int = 20,
+        cursor: str | None = None,
+        user_id: int | None = None,
+        order_by: Literal["created_at", "id"] = "created_at",
+    ) -> tuple[list[SQLModel], str | None]:
+        """
+        Keyset pagination, newest first. Instead of OFFSET it seeks past the cursor on
+        (created_at, id), or on id alone, so page 10,000 costs the same as page 1.
+        With `user_id` the scan runs on the model's (user_id, created_at, id) index.
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        columns = [self.model.created_at, self.model.id] if order_by == "created_at" else [self.model.id]
+
+        statement = select(self.model)
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        return await self._seek_page(db=db, statement=statement, columns=columns, limit=limit, cursor=cursor)
+
+    async def _seek_page(self, *, db: AsyncSession, statement: Select, columns: list, limit: int, cursor: str | None) -> tuple[list[SQLModel], str | None]:
+        # Newest first past the cursor on `columns`; `statement` carries any filters that lead the index
+        if cursor is not None:
+            values = decode_cursor(cursor, columns)
+            # The redundant bound on the leading column is what Postgres can prune partitions with; it cannot from the row comparison
+            statement = statement.where(columns[0] <= values[0], tuple_(*columns) < tuple_(*values))
+        statement = statement.order_by(*(column.desc() for column in columns)).limit(limit + 1)
+
+        items = (await db.exec(statement)).all()
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(columns, items[-1])
+
+    async def get_many_by_ids(self, *, db: AsyncSession, ids: list[Any], user_id: int | None = None) -> list[SQLModel]:
+        if not ids:
+            return []
+        statement = select(self.model).where(self.model.id.in_(ids))
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        result = await db.exec(statement.order_by(self.model.id))
+        return result.all()
+
+    async def get_version(self, *, db: AsyncSession, user_id: int) -> tuple[int, datetime | None]:
+        """The user's row count and latest created_at/updated_at, which together change on every write."""
+        statement = select(
+            func.count(),
+            func.max(func.coalesce(self.model.updated_at, self.model.created_at)),
+        ).where(self.model.user_id == user_id)
+        count, changed = (await db.exec(statement)).one()
+        return count, changed
+
     async def get_by_field(self, *, db: AsyncSession, field_name: str, value: Any) -> SQLModel | None:
-        statement = select(self.model).where(getattr(self.model, field_name) == value)
-        result = await db.exec(statement)
+        result = await db.exec(self._field_statement(field_name), params={"value": value})
         return result.first()
 
+    async def find_by_json(
+        self,
+        *,
+        db: AsyncSession,
+        field_name: str,
+        contains: Any = None,
+        has_key: str | None = None,
+        has_any_key: list[str] | None = None,
+        user_id: int | None = None,
+        limit: int = 100,
+    ) -> list[SQLModel]:
+        """
+        Filters on a JSONB column in the database, where its GIN index can serve the query.
+        `contains` is containment (@>), e.g. ["blue"] or {"style": "casual"}; `has_key` and
+        `has_any_key` match top-level keys, or string elements of an array (? and ?|).
+        Postgres only.
+        """
+        column = getattr(self.model, field_name)
+        statement = select(self.model)
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        if contains is not None:
+            statement = statement.where(column.contains(contains))
+        if has_key is not None:
+            statement = statement.where(column.has_key(has_key))
+        if has_any_key:
+            statement = statement.where(column.has_any(postgresql.array(has_any_key)))
+        result = await db.exec(statement.order_by(self.model.id).limit(limit))
+        return result.all()
+
+    def _field_statement(self, field_name: str) -> Select:
+        # Built once per field and reused, so SQLAlchemy's memoized cache key skips re-traversal on every call
+        statement = self._field_statements.get(field_name)
+        if statement is None:
+            statement = select(self.model).where(getattr(self.model, field_name) == bindparam("value"))
+            self._field_statements[field_name] = statement
+        return statement
+
     async def create(self, *, db: AsyncSession, obj_in: dict[str, Any]) -> SQLModel:
         db_obj = self.model(**obj_in)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await db.flush()
         return db_obj
 
-    async def update(self, *, db: AsyncSession, db_obj: SQLModel, obj_in: dict[str, Any]) -> SQLModel:
-        obj_data = jsonable_encoder(db_obj)
+    async def create_many(self, *, db: AsyncSession, objs_in: list[dict[str, Any]]) -> list[SQLModel]:
+        """
+        Inserts a batch in as few round trips as the driver allows.
+        Rows go out as multi-row INSERT ... RETURNING statements; on asyncpg, batches of
+        at least BULK_COPY_MIN_ROWS are streamed with COPY instead.
+        """
+        if not objs_in:
+            return []
+        rows = self._validate_rows(objs_in)
+
+        if len(rows) >= settings.BULK_COPY_MIN_ROWS and db.bind.dialect.driver == "asyncpg":
+            created = await self._copy_rows(db=db, rows=rows)
+        else:
+            created = list(await db.scalars(insert(self.model).returning(self.model, sort_by_parameter_order=True), rows))
+        return created
 
+    async def upsert_many(
+        self,
+        *,
+        db: AsyncSession,
+        objs_in: list[dict[str, Any]],
+        conflict_columns: list[str],
+        update_columns: list[str] | None = None,
+    ) -> list[SQLModel]:
+        """
+        Inserts a batch, updating rows that collide on `conflict_columns` (which need a
+        unique index) instead. By default every column except the conflict columns, the
+        primary key and created_at is overwritten. Returns the stored rows.
+        """
+        if not objs_in:
+            return []
+        rows = self._validate_rows(objs_in)
+
+        table = self.model.__table__
+        if update_columns is None:
+            skip = {*conflict_columns, "created_at", "updated_at", *(column.name for column in table.primary_key)}
+            update_columns = [column for column in rows[0] if column not in skip]
+
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(self.model)
+        update_set = {column: statement.excluded[column] for column in update_columns}
+        if "updated_at" in table.columns and "updated_at" not in update_set:
+            update_set["updated_at"] = datetime.utcnow()
+        statement = (
+            statement.on_conflict_do_update(index_elements=conflict_columns, set_=update_set)
+            .returning(self.model, sort_by_parameter_order=True)
+            .execution_options(populate_existing=True)
+        )
+
+        return list(await db.scalars(statement, rows))
+
+    def _validate_rows(self, objs_in: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Validates the whole batch up front and fills in model defaults, so nothing is sent if any row is bad."""
+        primary_keys = {column.name for column in self.model.__table__.primary_key}
+        rows = []
+        for obj_in in objs_in:
+            row = self.model.model_validate(obj_in).model_dump()
+            for key in primary_keys:
+                if row.get(key) is None:
+                    row.pop(key, None)
+            rows.append(row)
+        return rows
+
+    async def _copy_rows(self, *, db: AsyncSession, rows: list[dict[str, Any]]) -> list[SQLModel]:
+        table = self.model.__table__
+        connection = await db.connection()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+
+        # COPY cannot return generated keys, so serial ids are taken from the sequence first
+        if "id" in table.columns and "id" not in rows[0]:
+            ids = await driver_connection.fetch(
+                "SELECT nextval(pg_get_serial_sequence($1, 'id')) FROM generate_series(1, $2)",
+                table.name, len(rows),
+            )
+            for row, record in zip(rows, ids):
+                row["id"] = record[0]
+
+        columns = list(rows[0])
+        json_columns = {column.name for column in table.columns if isinstance(column.type, JSON)}
+        records = [
+            tuple(_copy_value(row[column], column in json_columns) for column in columns)
+            for row in rows
+        ]
+        await driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+        return [self.model(**row) for row in rows]
+
+    async def update(self, *, db: AsyncSession, db_obj: SQLModel, obj_in: dict[str, Any], optimistic: bool = False) -> SQLModel:
+        """
+        Writes only the columns that actually change in a single UPDATE ... RETURNING
+        and refreshes `db_obj` from the returned row, with no follow-up SELECT.
+        With `optimistic`, the row is only updated if its updated_at still matches the
+        one `db_obj` was loaded with; otherwise ConcurrentUpdateException is raised.
+        """
         if isinstance(obj_in, SQLModel):
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         else:
             update_data = obj_in
 
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        columns = self.model.__table__.columns
+        changes = {field: value for field, value in update_data.items() if field in columns and getattr(db_obj, field) != value}
+        if not changes:
+            return db_obj
 
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        statement = update(self.model).where(self.model.id == db_obj.id).values(**changes)
+        if optimistic:
+            statement = statement.where(self.model.updated_at.is_not_distinct_from(db_obj.updated_at))
+        statement = statement.returning(self.model).execution_options(populate_existing=True)
+
+        updated = (await db.scalars(statement)).one_or_none()
+        if updated is None:
+            raise ConcurrentUpdateException()
+        return updated
 
     async def delete(self, *, db: AsyncSession, db_obj: SQLModel) -> SQLModel | None:
             await db.delete(db_obj)
-            await db.commit()
-            return db_obj
\ No newline at end of file
+            await db.flush()
+            return db_obj
+
+    async def delete_many(self, *, db: AsyncSession, ids: list[Any], user_id: int | None = None) -> list[Any]:
+        """Deletes the rows in one statement and returns the ids that actually existed."""
+        if not ids:
+            return []
+        statement = delete(self.model).where(self.model.id.in_(ids))
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        return list(await db.scalars(statement.returning(self.model.id)))
+
+    async def delete_expired_batch(self, *, db: AsyncSession, now: datetime, batch_size: int) -> int:
+        """
+        Deletes up to `batch_size` rows whose `expires_at` has passed, for models that have one.
+        Rows locked by in-flight requests are skipped rather than waited on.
+        """
+        expired_ids = (
+            select(self.model.id)
+            .where(self.model.expires_at < now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.exec(delete(self.model).where(self.model.id.in_(expired_ids.scalar_subquery())))
+        return result.rowcount
+
+def _copy_value(value: Any, is_json: bool) -> Any:
+    if is_json:
+        return json.dumps(jsonable_encoder(value))
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
@@ -0,0 +1,69 @@
+from typing import AsyncIterator
+from datetime import datetime
+from sqlalchemy import func
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.repositories.base_repo import BaseRepo
+from app.models.base import JSONType
+from app.models.conversation import Conversation, ConversationMessage
+
+class ConversationRepo(BaseRepo):
+    def __init__(self):
+        super().__init__(Conversation)
+
+    async def get_for_user(self, *, db: AsyncSession, id: int, user_id: int) -> Conversation | None:
+        conversation = await self.get_by_id(db=db, id=id)
+        if conversation is None or conversation.user_id != user_id:
+            return None
+        return conversation
+
+class ConversationMessageRepo(BaseRepo):
+    def __init__(self):
+        super().__init__(ConversationMessage)
+
+    async def get_page_for_conversation(
+        self, *, db: AsyncSession, conversation_id: int, limit: int = 20, cursor: str | None = None
+    ) -> tuple[list[ConversationMessage], str | None]:
+        """Newest-first page of a conversation's messages, seeking on the (conversation_id, created_at, id) index."""
+        statement = select(ConversationMessage).where(ConversationMessage.conversation_id == conversation_id)
+        columns = [ConversationMessage.created_at, ConversationMessage.id]
+        return await self._seek_page(db=db, statement=statement, columns=columns, limit=limit, cursor=cursor)
+
+    async def stream_for_conversation(self, *, db: AsyncSession, conversation_id: int) -> AsyncIterator[ConversationMessage]:
+        """
+        Yields every message of a conversation, oldest first, from a server-side cursor
+        that fetches EXPORT_STREAM_BATCH_SIZE rows at a time, so memory stays flat
+        however long the conversation is. `db` must stay open until iteration ends.
+        """
+        statement = (
+            select(ConversationMessage)
+            .where(ConversationMessage.conversation_id == conversation_id)
+            .order_by(ConversationMessage.created_at, ConversationMessage.id)
+            .execution_options(yield_per=settings.EXPORT_STREAM_BATCH_SIZE)
+        )
+        result = await db.stream_scalars(statement)
+        async for message in result:
+            yield message
+
+    async def append_text(self, *, db: AsyncSession, message: ConversationMessage, text: str, status: str | None = None):
+        """
+        Appends to the `text` of a message's content (and optionally sets its `status`) in
+        the database, so a streamed reply is stored a slice at a time without the whole of
+        it ever being held or rewritten here. Matches on created_at too, so Postgres only
+        touches the one partition.
+        """
+        patch = [
+            "text", func.coalesce(ConversationMessage.content["text"].astext, "").concat(text),
+            *(("status", status) if status is not None else ()),
+        ]
+        statement = (
+            update(ConversationMessage)
+            .where(ConversationMessage.id == message.id, ConversationMessage.created_at == message.created_at)
+            .values(content=ConversationMessage.content.op("||", return_type=JSONType)(func.jsonb_build_object(*patch)), updated_at=datetime.utcnow())
+        )
+        await db.exec(statement)
+
+conversation_repo = ConversationRepo()
+conversation_message_repo = ConversationMessageRepo()
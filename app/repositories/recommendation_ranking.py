@@ -0,0 +1,131 @@
+import structlog
+from typing import Iterable
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.schemas.wardrobe import ShoppingRecommendationRead
+
+log = structlog.get_logger()
+
+# Fixed-width members, so Redis' lexicographic tie-break on equal scores matches "id DESC"
+MEMBER_WIDTH = 12
+
+# KEYS: ranked zset, data hash
+# ARGV: limit
+TOP_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return false
+end
+local members = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #members == 0 then
+    return {}
+end
+return redis.call('HMGET', KEYS[2], unpack(members))
+"""
+
+# KEYS: ranked zset, data hash, generation
+# ARGV: generation read before the rows were, ttl seconds, then member, score, payload for every open recommendation
+BUILD_SCRIPT = """
+if (redis.call('GET', KEYS[3]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('HSET', KEYS[2], '~', '1')
+for i = 3, #ARGV, 3 do
+    redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# KEYS: ranked zset, data hash, generation
+# ARGV: ttl seconds, number of upserts, then member, score, payload per upsert, then members to remove
+APPLY_SCRIPT = """
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[1])
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+local upserts = tonumber(ARGV[2])
+local i = 3
+for _ = 1, upserts do
+    redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+    redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+    i = i + 3
+end
+for j = i, #ARGV do
+    redis.call('ZREM', KEYS[1], ARGV[j])
+    redis.call('HDEL', KEYS[2], ARGV[j])
+end
+return 1
+"""
+
+class RecommendationRanking:
+    """
+    Each user's open (not yet purchased) shopping recommendations, materialized in Redis
+    as a sorted set of ids by priority_score (`recommendations:{id}:ranked`) next to a hash
+    of their serialized rows (`recommendations:{id}:data`), so a top-k read is one script
+    call. The hash always carries a `~` sentinel, which tells an empty ranking apart from
+    one that was never built.
+
+    Committed writes are applied in place when the ranking exists and otherwise left for
+    the next read to build from Postgres. Every write bumps `recommendations:{id}:gen`,
+    and a build only lands if the generation it started from is still current.
+    """
+
+    def __init__(self, *, ttl: int):
+        self.ttl = ttl
+        self._top = redis_client.register_script(TOP_SCRIPT)
+        self._build = redis_client.register_script(BUILD_SCRIPT)
+        self._apply = redis_client.register_script(APPLY_SCRIPT)
+
+    @staticmethod
+    def _keys(user_id: int) -> list[str]:
+        prefix = f"recommendations:{user_id}"
+        return [f"{prefix}:ranked", f"{prefix}:data", f"{prefix}:gen"]
+
+    @staticmethod
+    def _entry(recommendation: ShoppingRecommendationRead) -> list:
+        return [f"{recommendation.id:0{MEMBER_WIDTH}d}", recommendation.priority_score, recommendation.model_dump_json()]
+
+    async def top(self, user_id: int, limit: int) -> list[ShoppingRecommendationRead] | None:
+        """The user's `limit` highest-priority open recommendations, or None if the ranking is not built."""
+        payloads = await self._top(keys=self._keys(user_id)[:2], args=[limit])
+        if payloads is None:
+            return None
+        return [ShoppingRecommendationRead.model_validate_json(payload) for payload in payloads if payload is not None]
+
+    async def generation(self, user_id: int) -> str:
+        return await redis_client.get(self._keys(user_id)[2]) or "0"
+
+    async def build(self, user_id: int, recommendations: Iterable[ShoppingRecommendationRead], *, generation: str) -> bool:
+        """Replaces the ranking with `recommendations`, unless a write has landed since `generation` was read."""
+        args = [generation, self.ttl]
+        for recommendation in recommendations:
+            args.extend(self._entry(recommendation))
+        return bool(await self._build(keys=self._keys(user_id), args=args))
+
+    async def apply(self, user_id: int, *, upserted: Iterable[ShoppingRecommendationRead] = (), removed: Iterable[int] = ()):
+        """
+        Applies committed writes: open recommendations are (re)ranked, purchased or deleted
+        ones dropped. Runs after the commit, so a Redis failure is logged rather than raised;
+        the key expiry bounds how long a ranking can then stay stale.
+        """
+        upserts, removals = [], []
+        for recommendation in upserted:
+            if recommendation.purchased:
+                removals.append(recommendation.id)
+            else:
+                upserts.append(recommendation)
+        args = [self.ttl, len(upserts)]
+        for recommendation in upserts:
+            args.extend(self._entry(recommendation))
+        args.extend(f"{id:0{MEMBER_WIDTH}d}" for id in [*removals, *removed])
+        try:
+            await self._apply(keys=self._keys(user_id), args=args)
+        except Exception as e:
+            log.error("Failed to update recommendation ranking", user_id=user_id, error=str(e))
+
+recommendation_ranking = RecommendationRanking(ttl=settings.RECOMMENDATION_RANKING_TTL_SECONDS)
@@ -1,18 +1,45 @@
 import uuid
-from sqlmodel import select
+from datetime import datetime
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.models.session import Session as SessionModel
 from app.repositories.base_repo import BaseRepo
+from app.repositories.session_store import SessionStore, SqlSessionStore, RedisSessionStore, SessionAuditWriter
+from app.schemas.session import SessionInfo
 
 class SessionRepo(BaseRepo):
+    """
+    Refresh sessions, backed by whichever SessionStore SESSION_STORE selects.
+    With the Redis store, the `session` table only receives an asynchronous audit trail.
+    """
+
     def __init__(self):
         super().__init__(SessionModel)
+        self.audit: SessionAuditWriter | None = None
+        if settings.SESSION_STORE == "redis":
+            if settings.SESSION_AUDIT_TO_DB:
+                self.audit = SessionAuditWriter(SqlSessionStore(), max_size=settings.SESSION_AUDIT_QUEUE_SIZE)
+            self.store: SessionStore = RedisSessionStore(audit=self.audit)
+        else:
+            self.store = SqlSessionStore()
+
+    async def create_session(self, *, db: AsyncSession, user_id: int, email: str, is_active: bool, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo:
+        return await self.store.create(db=db, user_id=user_id, email=email, is_active=is_active, expires_at=expires_at, user_agent=user_agent, ip_address=ip_address)
+
+    async def get_session(self, *, db: AsyncSession, id: uuid.UUID) -> SessionInfo | None:
+        return await self.store.get(db=db, id=id)
+
+    async def rotate(self, *, db: AsyncSession, id: uuid.UUID, new_id: uuid.UUID, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo | None:
+        return await self.store.rotate(db=db, id=id, new_id=new_id, expires_at=expires_at, user_agent=user_agent, ip_address=ip_address)
+
+    async def revoke_successor_of(self, *, db: AsyncSession, previous_id: uuid.UUID, rotated_before: datetime) -> SessionInfo | None:
+        return await self.store.revoke_successor_of(db=db, previous_id=previous_id, rotated_before=rotated_before)
+
+    async def delete_session(self, *, db: AsyncSession, id: uuid.UUID):
+        await self.store.delete(db=db, id=id)
 
-    async def get_session_with_user(self, *, db: AsyncSession, id: uuid.UUID) -> SessionModel | None:
-        statement = select(self.model).where(self.model.id==id).options(selectinload(self.model.user))
-        result = await db.exec(statement)
-        return result.one_or_none()
+    async def delete_all_for_user(self, *, db: AsyncSession, user_id: int):
+        await self.store.delete_all_for_user(db=db, user_id=user_id)
 
-session_repo = SessionRepo()
\ No newline at end of file
+session_repo = SessionRepo()
@@ -0,0 +1,310 @@
+import asyncio
+import uuid
+import structlog
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from sqlalchemy import bindparam
+from sqlmodel import select, update, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.redis import redis_client
+from app.db import async_session, unit_of_work
+from app.models.session import Session as SessionModel
+from app.models.user import User
+from app.repositories.base_repo import BaseRepo
+from app.schemas.session import SessionInfo
+
+log = structlog.get_logger()
+
+class SessionStore(ABC):
+    """Storage backend for refresh sessions. `db` is accepted by every method so callers need not care which one is active."""
+
+    @abstractmethod
+    async def create(self, *, db: AsyncSession, user_id: int, email: str, is_active: bool, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo:
+        ...
+
+    @abstractmethod
+    async def get(self, *, db: AsyncSession, id: uuid.UUID) -> SessionInfo | None:
+        ...
+
+    @abstractmethod
+    async def rotate(self, *, db: AsyncSession, id: uuid.UUID, new_id: uuid.UUID, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo | None:
+        """Atomically moves an unexpired session to `new_id`; None if it no longer exists."""
+
+    @abstractmethod
+    async def revoke_successor_of(self, *, db: AsyncSession, previous_id: uuid.UUID, rotated_before: datetime) -> SessionInfo | None:
+        """Deletes whichever session was rotated out of `previous_id`, if that rotation happened before `rotated_before`."""
+
+    @abstractmethod
+    async def delete(self, *, db: AsyncSession, id: uuid.UUID):
+        ...
+
+    @abstractmethod
+    async def delete_all_for_user(self, *, db: AsyncSession, user_id: int):
+        ...
+
+
+# Looked up on every refresh and logout; built once so only the id is bound per call
+GET_SESSION_WITH_USER = (
+    select(SessionModel, User.email, User.is_active)
+    .join(User)
+    .where(SessionModel.id == bindparam("id"))
+)
+
+class SqlSessionStore(SessionStore):
+    def __init__(self):
+        self.repo = BaseRepo(SessionModel)
+        self.model = SessionModel
+
+    async def create(self, *, db: AsyncSession, user_id: int, email: str, is_active: bool, expires_at: datetime, user_agent: str | None, ip_address: str | None, id: uuid.UUID | None = None) -> SessionInfo:
+        session_data = {"expires_at": expires_at, "user_id": user_id, "user_agent": user_agent, "ip_address": ip_address}
+        if id is not None:
+            session_data["id"] = id
+        new_session = await self.repo.create(db=db, obj_in=session_data)
+        return SessionInfo(email=email, is_active=is_active, **new_session.model_dump())
+
+    async def get(self, *, db: AsyncSession, id: uuid.UUID) -> SessionInfo | None:
+        result = await db.exec(GET_SESSION_WITH_USER, params={"id": id})
+        row = result.first()
+        if row is None:
+            return None
+        session, email, is_active = row
+        return SessionInfo(email=email, is_active=is_active, **session.model_dump())
+
+    async def rotate(self, *, db: AsyncSession, id: uuid.UUID, new_id: uuid.UUID, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo | None:
+        """
+        Swaps the session over to `new_id` in place with a single
+        UPDATE ... FROM "user" ... RETURNING, so there is never a moment without
+        a session and the user's email comes back in the same round trip.
+        The old id is kept in `previous_id` for replay detection.
+        """
+        now = datetime.utcnow()
+        statement = (
+            update(self.model)
+            .where(self.model.id == id, self.model.expires_at > now, self.model.user_id == User.id)
+            .values(
+                id=new_id,
+                previous_id=self.model.id,
+                expires_at=expires_at,
+                user_agent=user_agent,
+                ip_address=ip_address,
+                updated_at=now,
+            )
+            .returning(self.model.id, self.model.user_id, self.model.expires_at, self.model.user_agent, self.model.ip_address, User.email, User.is_active)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.exec(statement)
+        rotated = result.first()
+        return SessionInfo(**rotated._mapping) if rotated else None
+
+    async def revoke_successor_of(self, *, db: AsyncSession, previous_id: uuid.UUID, rotated_before: datetime) -> SessionInfo | None:
+        # rotate() stamps updated_at, and nothing else updates a session afterwards
+        statement = (
+            delete(self.model)
+            .where(self.model.previous_id == previous_id, self.model.updated_at < rotated_before, self.model.user_id == User.id)
+            .returning(self.model.id, self.model.user_id, self.model.expires_at, User.email)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.exec(statement)
+        revoked = result.first()
+        return SessionInfo(**revoked._mapping) if revoked else None
+
+    async def delete(self, *, db: AsyncSession, id: uuid.UUID):
+        await db.exec(delete(self.model).where(self.model.id == id))
+
+    async def delete_all_for_user(self, *, db: AsyncSession, user_id: int):
+        await db.exec(delete(self.model).where(self.model.user_id == user_id))
+
+
+# KEYS: old session, new session, rotated marker for the old id
+# ARGV: expires_at epoch, expires_at epoch ms, user_agent, ip_address, old id, new id, now epoch ms
+ROTATE_SCRIPT = """
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl <= 0 then return false end
+local data = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[2], unpack(data))
+redis.call('HSET', KEYS[2], 'expires_at', ARGV[1], 'user_agent', ARGV[3], 'ip_address', ARGV[4])
+redis.call('PEXPIREAT', KEYS[2], ARGV[2])
+redis.call('SET', KEYS[3], ARGV[6] .. ' ' .. ARGV[7], 'PX', ttl)
+local user_sessions = 'user:' .. redis.call('HGET', KEYS[2], 'user_id') .. ':sessions'
+redis.call('SREM', user_sessions, ARGV[5])
+redis.call('SADD', user_sessions, ARGV[6])
+redis.call('PEXPIREAT', user_sessions, ARGV[2])
+return data
+"""
+
+# KEYS: rotated marker for the replayed id
+# ARGV: rotated_before epoch ms
+REVOKE_SUCCESSOR_SCRIPT = """
+local marker = redis.call('GET', KEYS[1])
+if not marker then return false end
+local successor, rotated_at = string.match(marker, '^(%S+) (%d+)$')
+if not successor then
+    -- Written before markers carried the rotation time
+    successor, rotated_at = marker, 0
+end
+if tonumber(rotated_at) >= tonumber(ARGV[1]) then return false end
+local key = 'session:' .. successor
+local data = redis.call('HGETALL', key)
+redis.call('DEL', key, KEYS[1])
+if #data == 0 then return false end
+table.insert(data, 'id')
+table.insert(data, successor)
+return data
+"""
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions as Redis hashes (`session:{id}`) that expire natively at `expires_at`,
+    so refresh validation is one Redis call and nothing needs sweeping.
+    A per-user set (`user:{id}:sessions`) allows revoking every session of a user.
+    """
+
+    def __init__(self, audit: "SessionAuditWriter | None" = None):
+        self.audit = audit
+        self._rotate = redis_client.register_script(ROTATE_SCRIPT)
+        self._revoke_successor = redis_client.register_script(REVOKE_SUCCESSOR_SCRIPT)
+
+    @staticmethod
+    def _key(id: uuid.UUID | str) -> str:
+        return f"session:{id}"
+
+    @staticmethod
+    def _user_key(user_id: int | str) -> str:
+        return f"user:{user_id}:sessions"
+
+    @staticmethod
+    def _to_info(id: uuid.UUID | str, fields: dict[str, str]) -> SessionInfo:
+        return SessionInfo(
+            id=id,
+            user_id=int(fields["user_id"]),
+            email=fields["email"],
+            is_active=fields.get("is_active", "1") == "1",
+            expires_at=datetime.utcfromtimestamp(float(fields["expires_at"])),
+            user_agent=fields.get("user_agent") or None,
+            ip_address=fields.get("ip_address") or None,
+        )
+
+    def _submit_audit(self, operation: str, **kwargs):
+        if self.audit is not None:
+            self.audit.submit(operation, **kwargs)
+
+    async def create(self, *, db: AsyncSession, user_id: int, email: str, is_active: bool, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo:
+        id = uuid.uuid4()
+        expires_epoch = _epoch(expires_at)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key(id), mapping={
+                "user_id": user_id,
+                "email": email,
+                "is_active": "1" if is_active else "0",
+                "expires_at": expires_epoch,
+                "user_agent": user_agent or "",
+                "ip_address": ip_address or "",
+            })
+            pipe.pexpireat(self._key(id), int(expires_epoch * 1000))
+            pipe.sadd(self._user_key(user_id), str(id))
+            # Every session gets the same lifetime, so the newest one always expires last
+            pipe.pexpireat(self._user_key(user_id), int(expires_epoch * 1000))
+            await pipe.execute()
+
+        self._submit_audit("create", id=id, user_id=user_id, email=email, is_active=is_active, expires_at=expires_at, user_agent=user_agent, ip_address=ip_address)
+        return SessionInfo(id=id, user_id=user_id, email=email, is_active=is_active, expires_at=expires_at, user_agent=user_agent, ip_address=ip_address)
+
+    async def get(self, *, db: AsyncSession, id: uuid.UUID) -> SessionInfo | None:
+        fields = await redis_client.hgetall(self._key(id))
+        return self._to_info(id, fields) if fields else None
+
+    async def rotate(self, *, db: AsyncSession, id: uuid.UUID, new_id: uuid.UUID, expires_at: datetime, user_agent: str | None, ip_address: str | None) -> SessionInfo | None:
+        expires_epoch = _epoch(expires_at)
+        data = await self._rotate(
+            keys=[self._key(id), self._key(new_id), f"session:rotated:{id}"],
+            args=[expires_epoch, int(expires_epoch * 1000), user_agent or "", ip_address or "", str(id), str(new_id), int(_epoch(datetime.utcnow()) * 1000)],
+        )
+        if not data:
+            return None
+
+        fields = dict(zip(data[::2], data[1::2]))
+        fields.update(expires_at=expires_epoch, user_agent=user_agent or "", ip_address=ip_address or "")
+        self._submit_audit("rotate", id=id, new_id=new_id, expires_at=expires_at, user_agent=user_agent, ip_address=ip_address)
+        return self._to_info(new_id, fields)
+
+    async def revoke_successor_of(self, *, db: AsyncSession, previous_id: uuid.UUID, rotated_before: datetime) -> SessionInfo | None:
+        data = await self._revoke_successor(keys=[f"session:rotated:{previous_id}"], args=[int(_epoch(rotated_before) * 1000)])
+        if not data:
+            return None
+
+        fields = dict(zip(data[::2], data[1::2]))
+        await redis_client.srem(self._user_key(fields["user_id"]), fields["id"])
+        self._submit_audit("delete", id=uuid.UUID(fields["id"]))
+        return self._to_info(fields["id"], fields)
+
+    async def delete(self, *, db: AsyncSession, id: uuid.UUID):
+        user_id = await redis_client.hget(self._key(id), "user_id")
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(id))
+            if user_id is not None:
+                pipe.srem(self._user_key(user_id), str(id))
+            await pipe.execute()
+        self._submit_audit("delete", id=id)
+
+    async def delete_all_for_user(self, *, db: AsyncSession, user_id: int):
+        session_ids = await redis_client.smembers(self._user_key(user_id))
+        await redis_client.delete(self._user_key(user_id), *(self._key(id) for id in session_ids))
+        self._submit_audit("delete_all_for_user", user_id=user_id)
+
+
+class SessionAuditWriter:
+    """
+    Replays Redis session changes into the Postgres `session` table in the
+    background, in order, so the durable trail never sits on the request path.
+    When the queue is full, entries are dropped rather than applying backpressure.
+    """
+
+    def __init__(self, store: SqlSessionStore, max_size: int):
+        self.store = store
+        self._queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue(maxsize=max_size)
+        self._task: asyncio.Task | None = None
+
+    def submit(self, operation: str, **kwargs):
+        try:
+            self._queue.put_nowait((operation, kwargs))
+        except asyncio.QueueFull:
+            log.warn("Session audit queue full, dropping entry", operation=operation)
+
+    async def _apply(self, operation: str, kwargs: dict):
+        async with async_session() as db, unit_of_work(db):
+            if operation == "rotate":
+                await self.store.rotate(db=db, **kwargs)
+            elif operation == "create":
+                await self.store.create(db=db, **kwargs)
+            elif operation == "delete":
+                await self.store.delete(db=db, **kwargs)
+            elif operation == "delete_all_for_user":
+                await self.store.delete_all_for_user(db=db, **kwargs)
+
+    async def _run(self):
+        while True:
+            operation, kwargs = await self._queue.get()
+            try:
+                await self._apply(operation, kwargs)
+            except Exception as e:
+                log.exception("Failed to write session audit entry", operation=operation, exc_info=e)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,8 +1,17 @@
+from typing import Any
+from sqlalchemy import bindparam
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.db import on_commit, unit_of_work
 from app.repositories.base_repo import BaseRepo
 from app.models.user import User
+from app.core.user_cache import user_cache
+from app.core.token_version import token_version_store
+from app.repositories.session_repo import session_repo
+
+# Hit on every authenticated request, so the statement is built once and only the email is bound per call
+GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
 
 
 class UserRepo(BaseRepo):
@@ -10,6 +19,39 @@ class UserRepo(BaseRepo):
         super().__init__(User)
 
     async def get_by_email(self, *, db:AsyncSession, email: str) -> User | None:
-        return await self.get_by_field(db=db, field_name="email", value=email)
+        result = await db.exec(GET_BY_EMAIL, params={"email": email})
+        return result.first()
+
+    async def find_by_style_preferences(self, *, db: AsyncSession, preferences: dict[str, Any], limit: int = 100) -> list[User]:
+        """Users whose style_preferences include every given key/value, e.g. {"style": "casual"}."""
+        return await self.find_by_json(db=db, field_name="style_preferences", contains=preferences, limit=limit)
+
+    async def update(self, *, db: AsyncSession, db_obj: User, obj_in: dict[str, Any]) -> User:
+        changed = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        # The UPDATE refreshes db_obj in place, so read the cached key before it changes
+        old_email = db_obj.email
+        user = await super().update(db=db, db_obj=db_obj, obj_in=obj_in)
+        email, user_id = user.email, user.id
+        await on_commit(db, lambda: user_cache.invalidate(old_email))
+        if email != old_email:
+            await on_commit(db, lambda: user_cache.invalidate(email))
+        if "is_active" in changed or "hashed_password" in changed:
+            # Stateless access tokens carry is_active, so revoke the ones already issued
+            await on_commit(db, lambda: token_version_store.bump(user_id))
+        if changed.get("is_active") is False:
+            # The Redis session store is outside the transaction, so sessions only end once the deactivation commits
+            async def end_sessions():
+                async with unit_of_work(db):
+                    await session_repo.delete_all_for_user(db=db, user_id=user_id)
+
+            await on_commit(db, end_sessions)
+        return user
+
+    async def delete(self, *, db: AsyncSession, db_obj: User) -> User | None:
+        email, user_id = db_obj.email, db_obj.id
+        user = await super().delete(db=db, db_obj=db_obj)
+        await on_commit(db, lambda: user_cache.invalidate(email))
+        await on_commit(db, lambda: token_version_store.bump(user_id))
+        return user
 
 user_repo = UserRepo()
\ No newline at end of file
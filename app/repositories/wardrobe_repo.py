@@ -0,0 +1,146 @@
+from typing import Any
+from datetime import datetime
+from sqlalchemy import func, insert, not_
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repositories.base_repo import BaseRepo
+from app.models.wardrobe import ClothingItem, Outfit, OutfitItem, ShoppingRecommendation
+from app.core.exceptions.wardrobe import ClothingItemNotFoundException
+
+class ClothingItemRepo(BaseRepo):
+    def __init__(self):
+        super().__init__(ClothingItem)
+
+    async def get_all_for_user(self, *, db: AsyncSession, user_id: int) -> list[ClothingItem]:
+        result = await db.exec(select(ClothingItem).where(ClothingItem.user_id == user_id))
+        return result.all()
+
+    async def get_by_colors(self, *, db: AsyncSession, user_id: int, colors: list[str], match_all: bool = True, limit: int = 100) -> list[ClothingItem]:
+        """A user's items in all of `colors` (or any of them with match_all=False)."""
+        if match_all:
+            return await self.find_by_json(db=db, field_name="colors", contains=colors, user_id=user_id, limit=limit)
+        return await self.find_by_json(db=db, field_name="colors", has_any_key=colors, user_id=user_id, limit=limit)
+
+class OutfitRepo(BaseRepo):
+    def __init__(self):
+        super().__init__(Outfit)
+
+    async def create(self, *, db: AsyncSession, obj_in: dict[str, Any]) -> Outfit:
+        obj_in = dict(obj_in)
+        item_ids = obj_in.pop("clothing_items", [])
+        outfit = await super().create(db=db, obj_in=obj_in)
+        return await self.set_items(db=db, outfit=outfit, item_ids=item_ids)
+
+    async def create_many(self, *, db: AsyncSession, objs_in: list[dict[str, Any]]) -> list[Outfit]:
+        """Inserts the outfits and all of their item links in one statement each, then loads them back with their items."""
+        if not objs_in:
+            return []
+        item_ids = [list(dict.fromkeys(obj_in.get("clothing_items", []))) for obj_in in objs_in]
+        outfits = await super().create_many(db=db, objs_in=[
+            {field: value for field, value in obj_in.items() if field != "clothing_items"} for obj_in in objs_in
+        ])
+        await self._link_items(db=db, links=list(zip(outfits, item_ids)))
+        return await self.get_many_with_items(db=db, ids=[outfit.id for outfit in outfits])
+
+    async def update(self, *, db: AsyncSession, db_obj: Outfit, obj_in: dict[str, Any], optimistic: bool = False) -> Outfit:
+        obj_in = dict(obj_in)
+        item_ids = obj_in.pop("clothing_items", None)
+        if item_ids is not None:
+            # The links live in outfit_item, so the outfit row is touched for its updated_at to reflect them
+            obj_in["updated_at"] = datetime.utcnow()
+        outfit = await super().update(db=db, db_obj=db_obj, obj_in=obj_in, optimistic=optimistic)
+        if item_ids is not None:
+            outfit = await self.set_items(db=db, outfit=outfit, item_ids=item_ids)
+        return outfit
+
+    async def set_items(self, *, db: AsyncSession, outfit: Outfit, item_ids: list[int]) -> Outfit:
+        """
+        Replaces the outfit's items with `item_ids`, in that order. Every id must be one of
+        the outfit owner's clothing items, otherwise ClothingItemNotFoundException is raised.
+        """
+        await db.exec(delete(OutfitItem).where(OutfitItem.outfit_id == outfit.id))
+        await self._link_items(db=db, links=[(outfit, list(dict.fromkeys(item_ids)))])
+        await db.refresh(outfit, attribute_names=["clothing_items"])
+        return outfit
+
+    async def _link_items(self, *, db: AsyncSession, links: list[tuple[Outfit, list[int]]]):
+        for user_id in {outfit.user_id for outfit, _ in links}:
+            wanted = {item_id for outfit, item_ids in links if outfit.user_id == user_id for item_id in item_ids}
+            if not wanted:
+                continue
+            owned = (await db.exec(
+                select(ClothingItem.id).where(ClothingItem.id.in_(wanted), ClothingItem.user_id == user_id)
+            )).all()
+            if len(owned) != len(wanted):
+                raise ClothingItemNotFoundException()
+
+        rows = [
+            {"outfit_id": outfit.id, "clothing_item_id": item_id, "position": position}
+            for outfit, item_ids in links
+            for position, item_id in enumerate(item_ids)
+        ]
+        if rows:
+            await db.exec(insert(OutfitItem), params=rows)
+
+    async def get_many_with_items(self, *, db: AsyncSession, ids: list[int]) -> list[Outfit]:
+        """Loads the outfits and all of their items in two queries, however many outfits there are."""
+        if not ids:
+            return []
+        statement = (
+            select(Outfit)
+            .where(Outfit.id.in_(ids))
+            .options(selectinload(Outfit.clothing_items))
+            .order_by(Outfit.id)
+            # Outfits already in the session, e.g. just inserted, get their items reloaded too
+            .execution_options(populate_existing=True)
+        )
+        result = await db.exec(statement)
+        return result.all()
+
+    async def get_item_ratings(self, *, db: AsyncSession, user_id: int) -> dict[int, float]:
+        """Mean user_rating of the rated outfits each of the user's items appears in, by item id."""
+        statement = (
+            select(OutfitItem.clothing_item_id, func.avg(Outfit.user_rating))
+            .join(Outfit, Outfit.id == OutfitItem.outfit_id)
+            .where(Outfit.user_id == user_id, Outfit.user_rating.is_not(None))
+            .group_by(OutfitItem.clothing_item_id)
+        )
+        result = await db.exec(statement)
+        return {item_id: float(rating) for item_id, rating in result.all()}
+
+    async def get_containing_item(self, *, db: AsyncSession, user_id: int, item_id: int, limit: int = 100) -> list[Outfit]:
+        """The user's outfits that use the item, found through outfit_item's clothing_item_id index."""
+        statement = (
+            select(Outfit)
+            .join(OutfitItem, OutfitItem.outfit_id == Outfit.id)
+            .where(OutfitItem.clothing_item_id == item_id, Outfit.user_id == user_id)
+            .order_by(Outfit.id)
+            .limit(limit)
+        )
+        result = await db.exec(statement)
+        return result.all()
+
+class ShoppingRecommendationRepo(BaseRepo):
+    def __init__(self):
+        super().__init__(ShoppingRecommendation)
+
+    async def get_open_by_priority(self, *, db: AsyncSession, user_id: int, limit: int | None = None) -> list[ShoppingRecommendation]:
+        """The user's not yet purchased recommendations, highest priority first, read straight off the partial index."""
+        statement = (
+            select(ShoppingRecommendation)
+            # Written exactly as the index predicate so the planner can use it
+            .where(ShoppingRecommendation.user_id == user_id, not_(ShoppingRecommendation.purchased))
+            .order_by(ShoppingRecommendation.priority_score.desc(), ShoppingRecommendation.id.desc())
+            .limit(limit)
+        )
+        result = await db.exec(statement)
+        return result.all()
+
+    async def get_complementing_item(self, *, db: AsyncSession, user_id: int, item_id: int, limit: int = 100) -> list[ShoppingRecommendation]:
+        return await self.find_by_json(db=db, field_name="complementary_items", contains=[item_id], user_id=user_id, limit=limit)
+
+clothing_item_repo = ClothingItemRepo()
+outfit_repo = OutfitRepo()
+shopping_recommendation_repo = ShoppingRecommendationRepo()
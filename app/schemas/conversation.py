@@ -1,6 +1,24 @@
+from datetime import datetime
 from sqlmodel import SQLModel
 
+from app.core.enums import MessageRole
+
 class ConversationCreate(SQLModel):
     chat_name: str
     input_data: dict
-    recommendations: dict = {}
\ No newline at end of file
+    recommendations: dict = {}
+
+class ConversationMessageCreate(SQLModel):
+    content: dict
+
+class ConversationRead(SQLModel):
+    id: int
+    chat_name: str
+    created_at: datetime
+
+class ConversationMessageRead(SQLModel):
+    id: int
+    conversation_id: int
+    role: MessageRole
+    content: dict
+    created_at: datetime
@@ -0,0 +1,17 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Field
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 100
+
+class CursorParams(SQLModel):
+    """Query parameters for cursor-paginated endpoints; use as `Annotated[CursorParams, Query()]`."""
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of results. Pass `next_cursor` back as `cursor` to fetch the next page; it is null on the last page."""
+    items: list[T]
+    next_cursor: str | None = None
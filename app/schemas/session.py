@@ -0,0 +1,13 @@
+import uuid
+from datetime import datetime
+from sqlmodel import SQLModel
+
+class SessionInfo(SQLModel):
+    """A refresh session as returned by any session store."""
+    id: uuid.UUID
+    user_id: int
+    email: str
+    is_active: bool = True
+    expires_at: datetime
+    user_agent: str | None = None
+    ip_address: str | None = None
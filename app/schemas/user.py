@@ -10,6 +10,12 @@ class UserRead(SQLModel):
     email: EmailStr
     is_active: bool
 
+class Principal(SQLModel):
+    """The authenticated caller as far as the access token can tell without the database."""
+    id: int
+    email: str
+    is_active: bool
+
 class ForgotPassword(SQLModel):
     email: EmailStr
 
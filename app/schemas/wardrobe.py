@@ -1,4 +1,8 @@
-from sqlmodel import SQLModel
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+from app.core.config import settings
+from app.schemas.pagination import MAX_PAGE_SIZE
 
 class ClothingItemCreate(SQLModel):
     description: str
@@ -14,6 +18,38 @@ class ClothingItemUpdate(SQLModel):
     fit_type: str | None = None
     formality_level: int | None = None
 
+class ClothingItemBatchUpdate(ClothingItemUpdate):
+    """One row of a batch update; send the `updated_at` last read to have it refused if the row changed since."""
+    id: int
+    updated_at: datetime | None = None
+
+class ClothingItemRead(SQLModel):
+    id: int
+    description: str
+    category: str
+    colors: list[str]
+    fit_type: str | None
+    formality_level: int
+    image_url: str | None
+    created_at: datetime
+    updated_at: datetime | None
+
+class WardrobeSearchParams(SQLModel):
+    """Facet filters for `/wardrobe/items/search`; repeat a parameter to match any of several values."""
+    category: list[str] = []
+    color: list[str] = []
+    colors_match_all: bool = False
+    fit_type: list[str] = []
+    formality_min: int | None = None
+    formality_max: int | None = None
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE)
+    offset: int = Field(default=0, ge=0)
+
+class WardrobeSearchResult(SQLModel):
+    total: int
+    items: list[ClothingItemRead]
+    facets: dict[str, dict[str, int]]
+
 class OutfitCreate(SQLModel):
     name: str | None = None
     clothing_items: list[int]
@@ -25,6 +61,30 @@ class OutfitUpdate(SQLModel):
     description: str | None = None
     user_rating: int | None = None
 
+class OutfitBatchUpdate(OutfitUpdate):
+    id: int
+    updated_at: datetime | None = None
+
+class OutfitRead(SQLModel):
+    id: int
+    name: str | None
+    description: str | None
+    user_rating: int | None
+    clothing_items: list[ClothingItemRead]
+    created_at: datetime
+    updated_at: datetime | None
+
+class OutfitSuggestionParams(SQLModel):
+    limit: int = Field(default=10, ge=1, le=MAX_PAGE_SIZE)
+
+class OutfitSuggestion(SQLModel):
+    """A generated outfit; the score is the weighted mean of the three components, each in [0, 1]."""
+    clothing_items: list[ClothingItemRead]
+    score: float
+    formality: float
+    color_harmony: float
+    rating: float
+
 class ShoppingRecommendationCreate(SQLModel):
     item_type: str
     description: str
@@ -32,3 +92,36 @@ class ShoppingRecommendationCreate(SQLModel):
     priority_score: float
     estimated_price_range: str | None = None
     complementary_items: list[int] = []
+
+class ShoppingRecommendationUpdate(SQLModel):
+    description: str | None = None
+    reasoning: str | None = None
+    priority_score: float | None = None
+    estimated_price_range: str | None = None
+    complementary_items: list[int] | None = None
+    purchased: bool | None = None
+
+class ShoppingRecommendationBatchUpdate(ShoppingRecommendationUpdate):
+    id: int
+    updated_at: datetime | None = None
+
+class ShoppingRecommendationRead(SQLModel):
+    id: int
+    item_type: str
+    description: str
+    reasoning: str
+    priority_score: float
+    estimated_price_range: str | None
+    complementary_items: list[int]
+    purchased: bool
+    created_at: datetime
+    updated_at: datetime | None
+
+class TopRecommendationsParams(SQLModel):
+    limit: int = Field(default=10, ge=1, le=MAX_PAGE_SIZE)
+
+class BatchDelete(SQLModel):
+    ids: list[int] = Field(min_length=1, max_length=settings.WARDROBE_BATCH_MAX_SIZE)
+
+class BatchDeleted(SQLModel):
+    deleted: list[int]
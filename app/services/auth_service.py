@@ -1,16 +1,23 @@
+import uuid
 import structlog
 from fastapi import HTTPException, status, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timedelta
+from jose import jwt, JWTError
 
 from app.repositories.user_repo import user_repo
 from app.repositories.session_repo import session_repo
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token, build_principal_claims
+from app.core.password_hasher import password_hasher
 from app.core.config import settings
 from app.core.context import request_id_var
-from app.models.session import Session as SessionModel
+from app.schemas.session import SessionInfo
+from app.models.user import User
 from app.core.exceptions.user import InvalidCredentialsException
+from app.core.exceptions.session import InvalidSessionException
 from app.core.jwt_denylist import add_jti_to_denylist
+from app.core.token_version import token_version_store
+from app.db import unit_of_work
 
 log = structlog.get_logger()
 
@@ -19,29 +26,43 @@ class AuthService:
         self.user_repo = user_repo
         self.session_repo = session_repo
 
-    async def generate_tokens_with_session(self, *, db: AsyncSession, user_id: int, email: str, request: Request) -> tuple[str, str, SessionModel]:
-        """Prepares the data dictionary for creating a new session."""
-        expires_delta = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
-        session_data = {
-            "expires_at": datetime.utcnow() + expires_delta,
-            "user_id": user_id,
-            "user_agent": request.headers.get("user-agent"),
-            "ip_address": request.client.host
-        }
-        new_session = await self.session_repo.create(db=db, obj_in=session_data)
-        jti = str(new_session.id)
-        access_token = create_access_token(data={"sub": email, "jti": jti})
+    async def build_access_token_claims(self, *, user_id: int, email: str, is_active: bool, jti: str) -> dict:
+        claims = {"sub": email, "jti": jti}
+        if settings.STATELESS_ACCESS_TOKENS:
+            token_version = await token_version_store.get(user_id)
+            claims["usr"] = build_principal_claims(user_id=user_id, is_active=is_active, token_version=token_version)
+        return claims
+
+    async def issue_tokens(self, *, user_id: int, email: str, is_active: bool, session_id: uuid.UUID) -> tuple[str, str]:
+        jti = str(session_id)
+        access_token = create_access_token(data=await self.build_access_token_claims(user_id=user_id, email=email, is_active=is_active, jti=jti))
         refresh_token = create_refresh_token(data={"sub": email, "jti": jti})
+        return access_token, refresh_token
+
+    async def generate_tokens_with_session(self, *, db: AsyncSession, user: User, request: Request) -> tuple[str, str, SessionInfo]:
+        """Creates a new refresh session for the user and issues tokens bound to it."""
+        expires_delta = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+        async with unit_of_work(db):
+            new_session = await self.session_repo.create_session(
+                db=db,
+                user_id=user.id,
+                email=user.email,
+                is_active=user.is_active,
+                expires_at=datetime.utcnow() + expires_delta,
+                user_agent=request.headers.get("user-agent"),
+                ip_address=request.client.host
+            )
+        access_token, refresh_token = await self.issue_tokens(user_id=user.id, email=user.email, is_active=user.is_active, session_id=new_session.id)
         return access_token, refresh_token, new_session
 
     async def login(self, *, db: AsyncSession, request: Request, email: str, password: str) -> tuple[str, str]:
         log.info("Login attempt", email=email, request_id=str(request_id_var.get()))
         
         user = await self.user_repo.get_by_email(db=db, email=email)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsException()
         
-        access_token, refresh_token, new_session = await self.generate_tokens_with_session(db=db, user_id=user.id, email=user.email, request=request)
+        access_token, refresh_token, new_session = await self.generate_tokens_with_session(db=db, user=user, request=request)
         log.info(
             "Login successful",
             email=email,
@@ -50,29 +71,54 @@ class AuthService:
         )
         return access_token, refresh_token
 
-    async def refresh(self, *, db: AsyncSession, request: Request, old_session: SessionModel) -> tuple[str, str]:
-        log.info(
-            "Token refresh attempt",
-            email=old_session.user.email,
-            session_id=old_session.id,
-            request_id=str(request_id_var.get())
-        )
-        
-        await self.session_repo.delete(db=db, db_obj=old_session)
+    async def refresh(self, *, db: AsyncSession, request: Request, session_id: uuid.UUID) -> tuple[str, str]:
+        log.info("Token refresh attempt", session_id=session_id, request_id=str(request_id_var.get()))
+
+        revoked = None
+        async with unit_of_work(db):
+            rotated = await self.session_repo.rotate(
+                db=db,
+                id=session_id,
+                new_id=uuid.uuid4(),
+                expires_at=datetime.utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+                user_agent=request.headers.get("user-agent"),
+                ip_address=request.client.host,
+            )
+            if rotated is None:
+                # A validly signed token for a session that has already been rotated means
+                # either the client or an attacker is replaying it; end the session for both.
+                # A rotation moments ago is the same client refreshing twice at once, so the
+                # loser of that race only gets a 401 and the winner keeps its new session.
+                revoked = await self.session_repo.revoke_successor_of(
+                    db=db,
+                    previous_id=session_id,
+                    rotated_before=datetime.utcnow() - timedelta(seconds=settings.SESSION_REUSE_GRACE_SECONDS),
+                )
+
+        if rotated is None:
+            if revoked is not None:
+                log.warn(
+                    "Refresh token reuse detected, session revoked",
+                    session_id=session_id,
+                    revoked_session_id=revoked.id,
+                    email=revoked.email,
+                    request_id=str(request_id_var.get())
+                )
+            raise InvalidSessionException()
 
-        access_token, refresh_token, new_session = await self.generate_tokens_with_session(db=db, user_id=old_session.user_id, email=old_session.user.email, request=request)
+        access_token, refresh_token = await self.issue_tokens(user_id=rotated.user_id, email=rotated.email, is_active=rotated.is_active, session_id=rotated.id)
         log.info(
             "Token refresh successful",
-            email=new_session.user.email,
-            new_session_id=new_session.id,
+            email=rotated.email,
+            new_session_id=rotated.id,
             request_id=str(request_id_var.get())
         )
         return access_token, refresh_token
 
-    async def logout(self, *, db: AsyncSession, session_to_delete: SessionModel, access_token: str):
+    async def logout(self, *, db: AsyncSession, session_to_delete: SessionInfo, access_token: str):
         log.info(
             "Logout attempt",
-            email=session_to_delete.user.email,
+            email=session_to_delete.email,
             session_id=session_to_delete.id,
             request_id=str(request_id_var.get())
         )
@@ -85,10 +131,11 @@ class AuthService:
         except JWTError:
             log.warn("Invalid access token provided during logout", request_id=str(request_id_var.get()))
 
-        await self.session_repo.delete(db=db, db_obj=session_to_delete)
+        async with unit_of_work(db):
+            await self.session_repo.delete_session(db=db, id=session_to_delete.id)
         log.info(
             "Logout Successful",
-            email=session_to_delete.user.email,
+            email=session_to_delete.email,
             request_id=str(request_id_var.get())
         )
 
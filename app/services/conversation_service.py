@@ -0,0 +1,111 @@
+import json
+import anyio
+import structlog
+from typing import AsyncIterator
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repositories.conversation_repo import conversation_repo, conversation_message_repo
+from app.models.conversation import Conversation, ConversationMessage
+from app.schemas.conversation import ConversationMessageRead
+from app.services.stylist_service import stylist
+from app.core.config import settings
+from app.core.context import request_id_var
+from app.core.enums import MessageRole, ReplyStatus
+from app.core.exceptions.conversation import ConversationNotFoundException
+from app.core.metrics import CONVERSATION_STREAMS
+from app.db import async_session, unit_of_work
+
+log = structlog.get_logger()
+
+def sse_event(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+class ConversationService:
+    def __init__(self):
+        self.repo = conversation_repo
+        self.message_repo = conversation_message_repo
+        self.stylist = stylist
+
+    async def list_conversations(self, *, db: AsyncSession, user_id: int, limit: int, cursor: str | None) -> tuple[list[Conversation], str | None]:
+        return await self.repo.get_page(db=db, user_id=user_id, limit=limit, cursor=cursor)
+
+    async def get_conversation(self, *, db: AsyncSession, user_id: int, conversation_id: int) -> Conversation:
+        conversation = await self.repo.get_for_user(db=db, id=conversation_id, user_id=user_id)
+        if conversation is None:
+            raise ConversationNotFoundException()
+        return conversation
+
+    async def list_messages(
+        self, *, db: AsyncSession, user_id: int, conversation_id: int, limit: int, cursor: str | None
+    ) -> tuple[list[ConversationMessage], str | None]:
+        await self.get_conversation(db=db, user_id=user_id, conversation_id=conversation_id)
+        return await self.message_repo.get_page_for_conversation(db=db, conversation_id=conversation_id, limit=limit, cursor=cursor)
+
+    async def export_messages(self, *, conversation_id: int) -> AsyncIterator[bytes]:
+        """
+        The conversation as NDJSON, one message per line, oldest first. Runs on its own
+        session because the response body is sent after the request's session is closed;
+        check access with get_conversation before starting the response.
+        """
+        exported = 0
+        async with async_session() as db:
+            async for message in self.message_repo.stream_for_conversation(db=db, conversation_id=conversation_id):
+                yield ConversationMessageRead.model_validate(message).model_dump_json().encode() + b"\n"
+                exported += 1
+        log.info("Conversation exported", conversation_id=conversation_id, messages=exported, request_id=str(request_id_var.get()))
+
+    async def add_user_message(self, *, db: AsyncSession, user_id: int, conversation_id: int, content: dict) -> ConversationMessage:
+        await self.get_conversation(db=db, user_id=user_id, conversation_id=conversation_id)
+        async with unit_of_work(db):
+            return await self.message_repo.create(
+                db=db, obj_in={"conversation_id": conversation_id, "role": MessageRole.USER, "content": content}
+            )
+
+    async def stream_reply(self, *, conversation_id: int, content: dict) -> AsyncIterator[bytes]:
+        """
+        The stylist's reply to `content` as Server-Sent Events: `start` with the stored
+        message's id, one `chunk` per generated piece of text, then `done` or `error`.
+        The AI message is inserted up front and its text appended every
+        CONVERSATION_STREAM_CHECKPOINT_CHUNKS chunks, so only that many are ever held here
+        and a dropped client still leaves the reply so far, marked interrupted. Runs on its
+        own session, like export_messages.
+        """
+        async with async_session() as db:
+            async with unit_of_work(db):
+                reply = await self.message_repo.create(db=db, obj_in={
+                    "conversation_id": conversation_id,
+                    "role": MessageRole.AI,
+                    "content": {"text": "", "status": ReplyStatus.STREAMING.value},
+                })
+            yield sse_event("start", {"message_id": reply.id})
+
+            pending: list[str] = []
+            chunks = 0
+            status = ReplyStatus.INTERRUPTED
+            try:
+                async for chunk in self.stylist.stream(conversation_id=conversation_id, content=content):
+                    pending.append(chunk)
+                    chunks += 1
+                    yield sse_event("chunk", {"text": chunk})
+                    if len(pending) >= settings.CONVERSATION_STREAM_CHECKPOINT_CHUNKS:
+                        async with unit_of_work(db):
+                            await self.message_repo.append_text(db=db, message=reply, text="".join(pending))
+                        pending.clear()
+                status = ReplyStatus.COMPLETE
+            except Exception as e:
+                status = ReplyStatus.FAILED
+                log.exception("Stylist reply failed", conversation_id=conversation_id, message_id=reply.id, exc_info=e)
+            finally:
+                # Shielded so the last slice and the status are stored even when the client has gone away
+                with anyio.CancelScope(shield=True):
+                    async with unit_of_work(db):
+                        await self.message_repo.append_text(db=db, message=reply, text="".join(pending), status=status.value)
+                CONVERSATION_STREAMS.labels(status=status.value).inc()
+                log.info("Stylist reply streamed", conversation_id=conversation_id, message_id=reply.id, chunks=chunks, status=status.value)
+
+            if status == ReplyStatus.COMPLETE:
+                yield sse_event("done", {"message_id": reply.id, "chunks": chunks})
+            else:
+                yield sse_event("error", {"message_id": reply.id, "detail": "The stylist could not finish this reply"})
+
+conversation_service = ConversationService()
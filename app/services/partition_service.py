@@ -0,0 +1,176 @@
+import asyncio
+import gzip
+import os
+import re
+import structlog
+from datetime import date, datetime
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.enums import PartitionState
+from app.core.metrics import PARTITIONS_CREATED, PARTITIONS_ARCHIVED, PARTITION_ARCHIVE_BYTES
+from app.db import engine
+
+log = structlog.get_logger()
+
+# Compressed in the worker thread in chunks of about this size rather than per COPY message
+ARCHIVE_WRITE_CHUNK = 1 << 20
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+class PartitionMaintainer:
+    """
+    Keeps a table range-partitioned by month on created_at. Partitions are created
+    `premake_months` ahead so inserts never miss one; partitions that ended more than
+    `retention_months` ago are detached, copied to `archive_dir` as gzipped CSV and dropped.
+    Each step is safe to re-run: a partition that was detached but not yet archived is
+    picked up again on the next pass, and one left pending by an interrupted concurrent
+    detach is finalized first.
+    """
+
+    def __init__(self, *, table: str, premake_months: int, retention_months: int, archive_dir: str, interval: float):
+        self.table = table
+        self.premake_months = premake_months
+        self.retention_months = retention_months
+        self.archive_dir = archive_dir
+        self.interval = interval
+        self._name_pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$")
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.table}_p{month:%Y_%m}"
+
+    def partition_month(self, name: str) -> date | None:
+        match = self._name_pattern.match(name)
+        return date(int(match[1]), int(match[2]), 1) if match else None
+
+    def archive_path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, f"{name}.csv.gz")
+
+    async def _partitions(self) -> dict[str, PartitionState]:
+        """Monthly partition tables by name, mapped to whether they are attached, detached or stuck in between."""
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT c.relname, c.relispartition, coalesce(i.inhdetachpending, false) FROM pg_class c "
+                    "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+                    "WHERE c.relkind = 'r' AND c.relname LIKE :prefix"
+                ),
+                {"prefix": f"{self.table}\\_p%"},
+            )
+            return {
+                name: PartitionState.DETACH_PENDING if pending else PartitionState.ATTACHED if attached else PartitionState.DETACHED
+                for name, attached, pending in result.all()
+                if self.partition_month(name)
+            }
+
+    async def create_partitions(self, *, now: datetime) -> list[str]:
+        existing = await self._partitions()
+        created = []
+        for offset in range(self.premake_months + 1):
+            month = add_months(month_start(now), offset)
+            name = self.partition_name(month)
+            if name not in existing:
+                await self._create(name, month)
+                PARTITIONS_CREATED.labels(table=self.table).inc()
+                created.append(name)
+        return created
+
+    async def archive_partitions(self, *, now: datetime) -> list[str]:
+        cutoff = add_months(month_start(now), -self.retention_months)
+        archived = []
+        for name, state in sorted((await self._partitions()).items()):
+            if add_months(self.partition_month(name), 1) > cutoff:
+                continue
+            if state != PartitionState.DETACHED:
+                await self._detach(name, finalize=state == PartitionState.DETACH_PENDING)
+            await self._archive(name)
+            PARTITIONS_ARCHIVED.labels(table=self.table).inc()
+            archived.append(name)
+        return archived
+
+    async def _create(self, name: str, month: date):
+        # Bounds are dates this class generated; DDL cannot take bind parameters
+        async with engine.connect() as conn:
+            await conn.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{self.table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            await conn.commit()
+
+    async def _detach(self, name: str, *, finalize: bool = False):
+        # CONCURRENTLY only takes a SHARE UPDATE EXCLUSIVE lock on the parent, but cannot run in a transaction.
+        # If it is interrupted the partition stays pending detach, which only FINALIZE can complete.
+        mode = "FINALIZE" if finalize else "CONCURRENTLY"
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f'ALTER TABLE "{self.table}" DETACH PARTITION "{name}" {mode}'))
+
+    async def _archive(self, name: str):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.archive_path(name)
+        partial_path = f"{path}.partial"
+        archive = await asyncio.to_thread(gzip.open, partial_path, "wb")
+        pending = bytearray()
+
+        async def write(chunk: bytes):
+            pending.extend(chunk)
+            if len(pending) >= ARCHIVE_WRITE_CHUNK:
+                data = bytes(pending)
+                pending.clear()
+                await asyncio.to_thread(archive.write, data)
+
+        try:
+            async with engine.connect() as conn:
+                driver_connection = (await conn.get_raw_connection()).driver_connection
+                await driver_connection.copy_from_table(name, output=write, format="csv", header=True)
+            await asyncio.to_thread(archive.write, bytes(pending))
+        finally:
+            await asyncio.to_thread(archive.close)
+        await asyncio.to_thread(_fsync_and_replace, partial_path, path)
+
+        # The archive is durable on disk before the rows are gone
+        async with engine.connect() as conn:
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+            await conn.commit()
+        size = os.path.getsize(path)
+        PARTITION_ARCHIVE_BYTES.labels(table=self.table).inc(size)
+        log.info("Partition archived", table=self.table, partition=name, path=path, bytes=size)
+
+    async def maintain_once(self) -> dict[str, list[str]]:
+        now = datetime.utcnow()
+        created = await self.create_partitions(now=now)
+        archived = await self.archive_partitions(now=now)
+        log.info("Partitions maintained", table=self.table, created=created, archived=archived)
+        return {"created": created, "archived": archived}
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.maintain_once()
+            except Exception as e:
+                log.exception("Partition maintenance failed", table=self.table, exc_info=e)
+            await asyncio.sleep(self.interval)
+
+def _fsync_and_replace(partial_path: str, path: str):
+    with open(partial_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(partial_path, path)
+    # The rename itself is only durable once the directory entry is
+    directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+conversation_message_partitions = PartitionMaintainer(
+    table="conversation_message",
+    premake_months=settings.CONVERSATION_PARTITION_PREMAKE_MONTHS,
+    retention_months=settings.CONVERSATION_PARTITION_RETENTION_MONTHS,
+    archive_dir=settings.CONVERSATION_ARCHIVE_DIR,
+    interval=settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+)
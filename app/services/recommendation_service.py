@@ -0,0 +1,48 @@
+import structlog
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.context import request_id_var
+from app.core.metrics import RECOMMENDATION_RANKING_READS
+from app.db import use_primary
+from app.repositories.recommendation_ranking import recommendation_ranking
+from app.repositories.wardrobe_repo import shopping_recommendation_repo
+from app.schemas.wardrobe import ShoppingRecommendationRead
+
+log = structlog.get_logger()
+
+class RecommendationService:
+    """
+    Serves a user's highest-priority open shopping recommendations from the Redis
+    ranking, building it from the partial (user_id, priority_score DESC) index on a miss.
+    """
+
+    def __init__(self):
+        self.repo = shopping_recommendation_repo
+        self.ranking = recommendation_ranking
+
+    async def top_recommendations(self, *, db: AsyncSession, user_id: int, limit: int) -> list[ShoppingRecommendationRead]:
+        try:
+            top = await self.ranking.top(user_id, limit)
+        except Exception as e:
+            # Redis being down costs one indexed LIMIT query, not the endpoint
+            RECOMMENDATION_RANKING_READS.labels(result="error").inc()
+            log.error("Recommendation ranking unavailable", user_id=user_id, error=str(e), request_id=str(request_id_var.get()))
+            recommendations = await self.repo.get_open_by_priority(db=db, user_id=user_id, limit=limit)
+            return [ShoppingRecommendationRead.model_validate(recommendation) for recommendation in recommendations]
+
+        if top is not None:
+            RECOMMENDATION_RANKING_READS.labels(result="hit").inc()
+            return top
+
+        RECOMMENDATION_RANKING_READS.labels(result="miss").inc()
+        # Read before the rows, so a write committed in between makes the build stand down
+        generation = await self.ranking.generation(user_id)
+        # The ranking is kept until it expires, so it must not start from a replica behind the last write
+        with use_primary(db):
+            rows = await self.repo.get_open_by_priority(db=db, user_id=user_id)
+        recommendations = [ShoppingRecommendationRead.model_validate(recommendation) for recommendation in rows]
+        built = await self.ranking.build(user_id, recommendations, generation=generation)
+        log.info("Recommendation ranking built", user_id=user_id, count=len(recommendations), built=built, request_id=str(request_id_var.get()))
+        return recommendations[:limit]
+
+recommendation_service = RecommendationService()
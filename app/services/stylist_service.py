@@ -0,0 +1,44 @@
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable
+
+from app.core.config import settings
+
+class Stylist(ABC):
+    """
+    Generates the AI stylist's reply to a user message as a stream of text chunks.
+    Backends subclass this and register in STYLISTS under a name, which is also added to
+    the STYLIST_BACKEND Literal in config so an unknown backend fails settings validation.
+    """
+
+    @abstractmethod
+    def stream(self, *, conversation_id: int, content: dict) -> AsyncIterator[str]:
+        ...
+
+class StubStylist(Stylist):
+    """Deterministic local backend for development and tests: a fixed reply built from the message, one word per chunk."""
+
+    def __init__(self, *, chunk_delay: float = 0.0):
+        self.chunk_delay = chunk_delay
+
+    @staticmethod
+    def reply(content: dict) -> str:
+        prompt = content.get("text") or json.dumps(content, sort_keys=True)
+        return (
+            f"Here is a look for {prompt}. Start from a neutral base, add one statement piece in your "
+            "strongest color, and keep the shoes at the same formality as the rest of the outfit."
+        )
+
+    async def stream(self, *, conversation_id: int, content: dict) -> AsyncIterator[str]:
+        for chunk in re.findall(r"\S+\s*", self.reply(content)):
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield chunk
+
+STYLISTS: dict[str, Callable[[], Stylist]] = {
+    "stub": lambda: StubStylist(chunk_delay=settings.STYLIST_STUB_CHUNK_DELAY_SECONDS),
+}
+
+stylist = STYLISTS[settings.STYLIST_BACKEND]()
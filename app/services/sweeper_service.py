@@ -0,0 +1,72 @@
+import asyncio
+import time
+import structlog
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.metrics import SWEEPER_ROWS_PURGED, SWEEPER_BATCH_DURATION
+from app.db import async_session, unit_of_work
+from app.repositories.base_repo import BaseRepo
+from app.repositories.session_repo import session_repo
+from app.repositories.password_reset_token_repo import password_reset_token_repo
+
+log = structlog.get_logger()
+
+class ExpiredRowSweeper:
+    """
+    Periodically purges rows past their `expires_at` in small batches, pausing
+    between batches and capping the work per run so it never competes with
+    foreground traffic for long.
+    """
+
+    def __init__(self, *, repos: list[BaseRepo], batch_size: int, batch_pause: float, max_batches_per_run: int, interval: float):
+        self.repos = repos
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.max_batches_per_run = max_batches_per_run
+        self.interval = interval
+
+    async def sweep_repo(self, repo: BaseRepo, budget: int) -> tuple[int, int]:
+        table = repo.model.__tablename__
+        purged = 0
+        batches = 0
+        while batches < budget:
+            start_time = time.perf_counter()
+            async with async_session() as db, unit_of_work(db):
+                deleted = await repo.delete_expired_batch(db=db, now=datetime.utcnow(), batch_size=self.batch_size)
+            SWEEPER_BATCH_DURATION.labels(table=table).observe(time.perf_counter() - start_time)
+            SWEEPER_ROWS_PURGED.labels(table=table).inc(deleted)
+            purged += deleted
+            batches += 1
+
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+        return purged, batches
+
+    async def sweep_once(self) -> dict[str, int]:
+        purged = {}
+        budget = self.max_batches_per_run
+        for repo in self.repos:
+            if budget <= 0:
+                break
+            purged[repo.model.__tablename__], batches = await self.sweep_repo(repo, budget)
+            budget -= batches
+        log.info("Expired rows swept", purged=purged)
+        return purged
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception as e:
+                log.exception("Expired row sweep failed", exc_info=e)
+            await asyncio.sleep(self.interval)
+
+expired_row_sweeper = ExpiredRowSweeper(
+    repos=[session_repo, password_reset_token_repo],
+    batch_size=settings.SWEEPER_BATCH_SIZE,
+    batch_pause=settings.SWEEPER_BATCH_PAUSE_SECONDS,
+    max_batches_per_run=settings.SWEEPER_MAX_BATCHES_PER_RUN,
+    interval=settings.SWEEPER_INTERVAL_SECONDS,
+)
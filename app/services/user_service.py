@@ -11,10 +11,11 @@ from app.repositories.password_reset_token_repo import password_reset_token_repo
 from app.schemas.user import UserCreate, ResetPassword
 from app.models.user import User
 from app.core.context import request_id_var
-from app.core.security import get_password_hash
-from app.core.exceptions.user import UserAlreadyExistsException, UserNotFoundException
+from app.core.password_hasher import password_hasher
+from app.core.exceptions.user import UserAlreadyExistsException, UserNotFoundException, InvalidCredentialsException
 from app.core.config import settings
 from app.core.rabbitmq import rabbitmq_manager
+from app.db import unit_of_work
 
 log = structlog.get_logger()
 
@@ -25,19 +26,19 @@ class UserService:
 
     async def register_new_user(self, *, db: AsyncSession, user_in: UserCreate) -> User:      
         user_data = user_in.model_dump(include={"email"})
-        user_data["hashed_password"] = get_password_hash(user_in.password)
+        user_data["hashed_password"] = await password_hasher.hash(user_in.password)
 
         log.info("Attempting to register new user", email=user_in.email, request_id=str(request_id_var.get()))
 
         try:
-            new_user = await self.repo.create(db=db, obj_in=user_data)
-            log.info("New user registered", email=new_user.email, request_id=str(request_id_var.get()))
-            return new_user
-
+            async with unit_of_work(db):
+                new_user = await self.repo.create(db=db, obj_in=user_data)
         except IntegrityError:
-            await db.rollback()
             raise UserAlreadyExistsException()
 
+        log.info("New user registered", email=new_user.email, request_id=str(request_id_var.get()))
+        return new_user
+
     async def request_password_reset(self, *, email:str):
         log.info("Password reset requested", email=email, request_id=str(request_id_var.get()))
         message_body = {
@@ -60,7 +61,8 @@ class UserService:
             "expires_at": datetime.utcnow() + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES),
             "user_id": user.id
         }
-        await self.password_reset_token_repo.create(db=db, obj_in=token_data)
+        async with unit_of_work(db):
+            await self.password_reset_token_repo.create(db=db, obj_in=token_data)
         return user.email, raw_token
 
     async def reset_password(self, *, db: AsyncSession, payload: ResetPassword):
@@ -69,11 +71,12 @@ class UserService:
         if not token_obj or token_obj.expires_at < datetime.utcnow():
             raise InvalidCredentialsException(detail="Invalid or expired password reset token.")
         
-        user = await self.repo.get_by_id(db=db, id=token_obj.user_id)
-        user.hashed_password = get_password_hash(payload.new_password)
-        db.add(user)
-        await self.password_reset_token_repo.delete_all_for_user(db=db, user_id=user.id)
-        await db.commit()
+        hashed_password = await password_hasher.hash(payload.new_password)
+        async with unit_of_work(db):
+            user = await self.repo.get_by_id(db=db, id=token_obj.user_id)
+            # UserRepo.update drops the cached user and bumps the token version once this commits
+            await self.repo.update(db=db, db_obj=user, obj_in={"hashed_password": hashed_password})
+            await self.password_reset_token_repo.delete_all_for_user(db=db, user_id=user.id)
         log.info("Password reset successful", email=user.email, user_id=user.id)
         
 user_service = UserService()
\ No newline at end of file
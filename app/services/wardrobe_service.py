@@ -0,0 +1,226 @@
+import asyncio
+import time
+import structlog
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.repositories.base_repo import BaseRepo
+from app.repositories.recommendation_ranking import recommendation_ranking
+from app.repositories.wardrobe_repo import clothing_item_repo, outfit_repo, shopping_recommendation_repo
+from app.models.wardrobe import ClothingItem, Outfit, ShoppingRecommendation
+from app.schemas.wardrobe import (
+    ClothingItemCreate, ClothingItemBatchUpdate, ClothingItemRead, WardrobeSearchParams, WardrobeSearchResult,
+    OutfitCreate, OutfitBatchUpdate, OutfitSuggestion,
+    ShoppingRecommendationCreate, ShoppingRecommendationBatchUpdate, ShoppingRecommendationRead,
+)
+from app.core.context import request_id_var
+from app.core.etag import make_weak_etag
+from app.core.metrics import OUTFIT_SUGGESTION_DURATION, WARDROBE_SEARCH_DURATION
+from app.core.outfit_engine import outfit_engine
+from app.core.wardrobe_index import WardrobeIndex, wardrobe_index
+from app.core.exceptions.repository import ConcurrentUpdateException
+from app.core.exceptions.wardrobe import (
+    WardrobeObjectNotFoundException, ClothingItemNotFoundException, OutfitNotFoundException, ShoppingRecommendationNotFoundException,
+)
+from app.db import unit_of_work, on_commit, use_primary
+
+log = structlog.get_logger()
+
+class WardrobeService:
+    """
+    Batch writes and versioned reads over a user's clothing items, outfits and shopping
+    recommendations. Every batch runs in one transaction: it applies in full or not at all.
+    """
+
+    def __init__(self):
+        self.item_repo = clothing_item_repo
+        self.outfit_repo = outfit_repo
+        self.recommendation_repo = shopping_recommendation_repo
+
+    # Versions: read before the rows they describe, so a write landing in between makes the
+    # client's tag stale (and it refetches) rather than pinning it to rows it never got
+    async def items_etag(self, *, db: AsyncSession, user_id: int) -> str:
+        return make_weak_etag(await self.item_repo.get_version(db=db, user_id=user_id))
+
+    async def outfits_etag(self, *, db: AsyncSession, user_id: int) -> str:
+        # Outfits embed their items, so editing or deleting an item changes them too
+        return make_weak_etag(
+            await self.outfit_repo.get_version(db=db, user_id=user_id),
+            await self.item_repo.get_version(db=db, user_id=user_id),
+        )
+
+    async def recommendations_etag(self, *, db: AsyncSession, user_id: int) -> str:
+        return make_weak_etag(await self.recommendation_repo.get_version(db=db, user_id=user_id))
+
+    async def list_items(self, *, db: AsyncSession, user_id: int, limit: int, cursor: str | None) -> tuple[list[ClothingItem], str | None]:
+        return await self.item_repo.get_page(db=db, user_id=user_id, limit=limit, cursor=cursor)
+
+    async def list_outfits(self, *, db: AsyncSession, user_id: int, limit: int, cursor: str | None) -> tuple[list[Outfit], str | None]:
+        return await self.outfit_repo.get_page(db=db, user_id=user_id, limit=limit, cursor=cursor)
+
+    async def list_recommendations(self, *, db: AsyncSession, user_id: int, limit: int, cursor: str | None) -> tuple[list[ShoppingRecommendation], str | None]:
+        return await self.recommendation_repo.get_page(db=db, user_id=user_id, limit=limit, cursor=cursor)
+
+    async def _get_index(self, *, db: AsyncSession, user_id: int) -> WardrobeIndex:
+        index = wardrobe_index.get(user_id)
+        if index is None:
+            epoch = wardrobe_index.epoch
+            # Cached until the next write, so never built from a replica that has not seen the last one
+            with use_primary(db):
+                items = await self.item_repo.get_all_for_user(db=db, user_id=user_id)
+            index = WardrobeIndex.build(ClothingItemRead.model_validate(item) for item in items)
+            wardrobe_index.set(user_id, index, epoch=epoch)
+        return index
+
+    async def search_items(self, *, db: AsyncSession, user_id: int, params: WardrobeSearchParams) -> WardrobeSearchResult:
+        index = await self._get_index(db=db, user_id=user_id)
+        start_time = time.perf_counter()
+        matched, facets = index.search(
+            category=params.category,
+            color=params.color,
+            colors_match_all=params.colors_match_all,
+            fit_type=params.fit_type,
+            formality_min=params.formality_min,
+            formality_max=params.formality_max,
+        )
+        WARDROBE_SEARCH_DURATION.observe(time.perf_counter() - start_time)
+        return WardrobeSearchResult(total=len(matched), items=matched[params.offset:params.offset + params.limit], facets=facets)
+
+    async def suggest_outfits(self, *, db: AsyncSession, user_id: int, limit: int) -> list[OutfitSuggestion]:
+        """The best-scoring outfits that can be put together from the user's items, rated or not."""
+        items = list((await self._get_index(db=db, user_id=user_id)).items.values())
+        ratings = await self.outfit_repo.get_item_ratings(db=db, user_id=user_id)
+        affinities = {item_id: (rating - 1) / 4 for item_id, rating in ratings.items()}
+
+        # NumPy releases the GIL, so scoring a large wardrobe does not stall the event loop
+        start_time = time.perf_counter()
+        candidates = await asyncio.to_thread(outfit_engine.suggest, items, affinities=affinities, k=limit)
+        OUTFIT_SUGGESTION_DURATION.observe(time.perf_counter() - start_time)
+        log.info("Outfits suggested", items=len(items), count=len(candidates), user_id=user_id, request_id=str(request_id_var.get()))
+        return [
+            OutfitSuggestion(
+                clothing_items=candidate.items,
+                score=candidate.score,
+                formality=candidate.formality,
+                color_harmony=candidate.color_harmony,
+                rating=candidate.rating,
+            )
+            for candidate in candidates
+        ]
+
+    def _index_items(self, user_id: int) -> Callable[[list[ClothingItem]], Awaitable[None]]:
+        async def apply(items: list[ClothingItem]):
+            await wardrobe_index.items_changed(user_id, upserted=[ClothingItemRead.model_validate(item) for item in items])
+        return apply
+
+    def _unindex_items(self, user_id: int) -> Callable[[list[int]], Awaitable[None]]:
+        async def apply(ids: list[int]):
+            await wardrobe_index.items_changed(user_id, deleted=ids)
+        return apply
+
+    def _rank_recommendations(self, user_id: int) -> Callable[[list[ShoppingRecommendation]], Awaitable[None]]:
+        async def apply(recommendations: list[ShoppingRecommendation]):
+            await recommendation_ranking.apply(
+                user_id, upserted=[ShoppingRecommendationRead.model_validate(recommendation) for recommendation in recommendations]
+            )
+        return apply
+
+    def _unrank_recommendations(self, user_id: int) -> Callable[[list[int]], Awaitable[None]]:
+        async def apply(ids: list[int]):
+            await recommendation_ranking.apply(user_id, removed=ids)
+        return apply
+
+    async def create_items(self, *, db: AsyncSession, user_id: int, items_in: list[ClothingItemCreate]) -> list[ClothingItem]:
+        return await self._create_many(self.item_repo, db=db, user_id=user_id, objs_in=items_in, after_commit=self._index_items(user_id))
+
+    async def create_outfits(self, *, db: AsyncSession, user_id: int, outfits_in: list[OutfitCreate]) -> list[Outfit]:
+        return await self._create_many(self.outfit_repo, db=db, user_id=user_id, objs_in=outfits_in)
+
+    async def create_recommendations(self, *, db: AsyncSession, user_id: int, recommendations_in: list[ShoppingRecommendationCreate]) -> list[ShoppingRecommendation]:
+        return await self._create_many(
+            self.recommendation_repo, db=db, user_id=user_id, objs_in=recommendations_in, after_commit=self._rank_recommendations(user_id)
+        )
+
+    async def update_items(self, *, db: AsyncSession, user_id: int, updates: list[ClothingItemBatchUpdate]) -> list[ClothingItem]:
+        return await self._update_many(self.item_repo, ClothingItemNotFoundException, db=db, user_id=user_id, updates=updates, after_commit=self._index_items(user_id))
+
+    async def update_outfits(self, *, db: AsyncSession, user_id: int, updates: list[OutfitBatchUpdate]) -> list[Outfit]:
+        return await self._update_many(self.outfit_repo, OutfitNotFoundException, db=db, user_id=user_id, updates=updates)
+
+    async def update_recommendations(self, *, db: AsyncSession, user_id: int, updates: list[ShoppingRecommendationBatchUpdate]) -> list[ShoppingRecommendation]:
+        return await self._update_many(
+            self.recommendation_repo, ShoppingRecommendationNotFoundException,
+            db=db, user_id=user_id, updates=updates, after_commit=self._rank_recommendations(user_id),
+        )
+
+    async def delete_items(self, *, db: AsyncSession, user_id: int, ids: list[int]) -> list[int]:
+        return await self._delete_many(self.item_repo, db=db, user_id=user_id, ids=ids, after_commit=self._unindex_items(user_id))
+
+    async def delete_outfits(self, *, db: AsyncSession, user_id: int, ids: list[int]) -> list[int]:
+        return await self._delete_many(self.outfit_repo, db=db, user_id=user_id, ids=ids)
+
+    async def delete_recommendations(self, *, db: AsyncSession, user_id: int, ids: list[int]) -> list[int]:
+        return await self._delete_many(self.recommendation_repo, db=db, user_id=user_id, ids=ids, after_commit=self._unrank_recommendations(user_id))
+
+    # `after_commit` gets the batch's result once its transaction has committed
+    async def _create_many(
+        self, repo: BaseRepo, *, db: AsyncSession, user_id: int, objs_in: list[SQLModel], after_commit: Callable[[list], Awaitable[None]] | None = None
+    ) -> list[SQLModel]:
+        async with unit_of_work(db):
+            created = await repo.create_many(db=db, objs_in=[{**obj_in.model_dump(), "user_id": user_id} for obj_in in objs_in])
+            if after_commit is not None:
+                await on_commit(db, lambda: after_commit(created))
+        log.info("Wardrobe batch created", table=repo.model.__tablename__, count=len(created), user_id=user_id, request_id=str(request_id_var.get()))
+        return created
+
+    async def _update_many(
+        self,
+        repo: BaseRepo,
+        not_found: type[WardrobeObjectNotFoundException],
+        *,
+        db: AsyncSession,
+        user_id: int,
+        updates: list[SQLModel],
+        after_commit: Callable[[list], Awaitable[None]] | None = None,
+    ) -> list[SQLModel]:
+        async with unit_of_work(db):
+            existing = {obj.id: obj for obj in await repo.get_many_by_ids(db=db, ids=[update.id for update in updates], user_id=user_id)}
+            if any(update.id not in existing for update in updates):
+                raise not_found()
+            # A row the client read at a different updated_at than the one just loaded fails the whole batch,
+            # and the optimistic UPDATE then catches one written between that load and the update
+            if any(
+                "updated_at" in update.model_fields_set and _as_naive_utc(update.updated_at) != existing[update.id].updated_at
+                for update in updates
+            ):
+                raise ConcurrentUpdateException()
+            updated = [
+                await repo.update(
+                    db=db, db_obj=existing[update.id], obj_in=update.model_dump(exclude_unset=True, exclude={"id", "updated_at"}), optimistic=True,
+                )
+                for update in updates
+            ]
+            if after_commit is not None:
+                await on_commit(db, lambda: after_commit(updated))
+        log.info("Wardrobe batch updated", table=repo.model.__tablename__, count=len(updated), user_id=user_id, request_id=str(request_id_var.get()))
+        return updated
+
+    async def _delete_many(
+        self, repo: BaseRepo, *, db: AsyncSession, user_id: int, ids: list[int], after_commit: Callable[[list], Awaitable[None]] | None = None
+    ) -> list[int]:
+        async with unit_of_work(db):
+            deleted = await repo.delete_many(db=db, ids=ids, user_id=user_id)
+            if after_commit is not None:
+                await on_commit(db, lambda: after_commit(deleted))
+        log.info("Wardrobe batch deleted", table=repo.model.__tablename__, count=len(deleted), user_id=user_id, request_id=str(request_id_var.get()))
+        return deleted
+
+def _as_naive_utc(value: datetime | None) -> datetime | None:
+    # updated_at is stored as naive UTC; clients may echo it back with an offset
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+wardrobe_service = WardrobeService()
@@ -0,0 +1,73 @@
+"""
+Insert throughput for ClothingItem rows: one create() per row, create_many with
+multi-row INSERT ... RETURNING, and create_many over COPY.
+
+Needs a migrated Postgres (asyncpg) at DATABASE_URL:
+
+    python -m benchmarks.bench_bulk_insert
+"""
+import asyncio
+import time
+
+from sqlmodel import delete
+
+from app.core.config import settings
+from app.db import async_session, engine, unit_of_work
+from app.models.wardrobe import ClothingItem
+from app.repositories.base_repo import BaseRepo
+from app.repositories.user_repo import user_repo
+
+BATCH_SIZES = (500, 20_000)
+# Per-row inserts are only timed on the small batch; they would take minutes on the large one
+PER_ROW_LIMIT = 1_000
+
+repo = BaseRepo(ClothingItem)
+
+def make_rows(user_id: int, count: int) -> list[dict]:
+    return [
+        {"user_id": user_id, "description": f"bench item {i}", "category": "shirt", "colors": ["blue", "white"], "formality_level": i % 5 + 1}
+        for i in range(count)
+    ]
+
+async def per_row(rows: list[dict]):
+    async with async_session() as db:
+        for row in rows:
+            async with unit_of_work(db):
+                await repo.create(db=db, obj_in=row)
+
+async def insert_returning(rows: list[dict]):
+    settings.BULK_COPY_MIN_ROWS = len(rows) + 1
+    async with async_session() as db, unit_of_work(db):
+        await repo.create_many(db=db, objs_in=rows)
+
+async def copy(rows: list[dict]):
+    settings.BULK_COPY_MIN_ROWS = 1
+    async with async_session() as db, unit_of_work(db):
+        await repo.create_many(db=db, objs_in=rows)
+
+async def clear(user_id: int):
+    async with async_session() as db:
+        await db.exec(delete(ClothingItem).where(ClothingItem.user_id == user_id))
+        await db.commit()
+
+async def main():
+    async with async_session() as db, unit_of_work(db):
+        user = await user_repo.get_by_email(db=db, email="bench-bulk@example.com")
+        if user is None:
+            user = await user_repo.create(db=db, obj_in={"email": "bench-bulk@example.com", "hashed_password": "x"})
+
+    for count in BATCH_SIZES:
+        rows = make_rows(user.id, count)
+        for label, method in (("per-row create", per_row), ("INSERT ... RETURNING", insert_returning), ("COPY", copy)):
+            if method is per_row and count > PER_ROW_LIMIT:
+                continue
+            await clear(user.id)
+            start = time.perf_counter()
+            await method(rows)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>7} rows  {label:<22} {count / elapsed:10.0f} rows/s")
+    await clear(user.id)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""
+Per-request cost of the JWT denylist check, with and without the local mirror.
+
+Needs the usual .env (or environment) and a reachable Redis at REDIS_URL:
+
+    python -m benchmarks.bench_jwt_denylist
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.core.jwt_denylist import add_jti_to_denylist, bootstrap_local_denylist, is_jti_denylisted, local_denylist
+from app.core.redis import redis_client
+
+ITERATIONS = 5000
+DENYLISTED = 200
+
+async def measure(label: str) -> float:
+    jtis = [str(uuid.uuid4()) for _ in range(ITERATIONS)]
+    start = time.perf_counter()
+    for jti in jtis:
+        await is_jti_denylisted(jti)
+    per_call_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+    print(f"{label:<28} {per_call_us:10.2f} us/request")
+    return per_call_us
+
+async def main():
+    exp = int(datetime.now(timezone.utc).timestamp()) + 600
+    for _ in range(DENYLISTED):
+        await add_jti_to_denylist(str(uuid.uuid4()), exp)
+
+    local_denylist.ready = False
+    redis_us = await measure("redis GET per request")
+
+    await bootstrap_local_denylist()
+    local_us = await measure("local mirror")
+
+    print(f"{'saved per request':<28} {redis_us - local_us:10.2f} us")
+    await redis_client.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
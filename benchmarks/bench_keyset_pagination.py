@@ -0,0 +1,88 @@
+"""
+Latency of fetching page 1 and page 10,000 of one user's wardrobe with
+OFFSET/LIMIT (get_multi style) against the keyset cursor used by get_page.
+
+Seeds PAGE_SIZE * DEEP_PAGE clothing items for a throwaway user on first run.
+Needs a migrated Postgres at DATABASE_URL:
+
+    python -m benchmarks.bench_keyset_pagination
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlmodel import func, insert, select
+
+from app.core.pagination import encode_cursor
+from app.db import async_session, engine, unit_of_work
+from app.models.wardrobe import ClothingItem
+from app.repositories.base_repo import BaseRepo
+from app.repositories.user_repo import user_repo
+
+PAGE_SIZE = 20
+DEEP_PAGE = 10_000
+REPEATS = 20
+SEED_CHUNK = 5_000
+
+repo = BaseRepo(ClothingItem)
+
+async def seed(user_id: int):
+    async with async_session() as db:
+        existing = (await db.exec(select(func.count()).select_from(ClothingItem).where(ClothingItem.user_id == user_id))).one()
+        wanted = PAGE_SIZE * DEEP_PAGE
+        start = datetime.utcnow() - timedelta(days=365)
+        for offset in range(existing, wanted, SEED_CHUNK):
+            rows = [
+                {"user_id": user_id, "description": f"bench item {i}", "category": "shirt", "colors": [], "formality_level": 3, "created_at": start + timedelta(seconds=i)}
+                for i in range(offset, min(offset + SEED_CHUNK, wanted))
+            ]
+            await db.exec(insert(ClothingItem), params=rows)
+            await db.commit()
+
+async def offset_page(user_id: int, page: int):
+    async with async_session() as db:
+        statement = (
+            select(ClothingItem)
+            .where(ClothingItem.user_id == user_id)
+            .order_by(ClothingItem.created_at.desc(), ClothingItem.id.desc())
+            .offset((page - 1) * PAGE_SIZE)
+            .limit(PAGE_SIZE)
+        )
+        return (await db.exec(statement)).all()
+
+async def keyset_page(user_id: int, cursor: str | None):
+    async with async_session() as db:
+        return await repo.get_page(db=db, limit=PAGE_SIZE, cursor=cursor, user_id=user_id)
+
+async def cursor_for_page(user_id: int, page: int) -> str | None:
+    if page == 1:
+        return None
+    previous_page = await offset_page(user_id, page - 1)
+    return encode_cursor([ClothingItem.created_at, ClothingItem.id], previous_page[-1])
+
+async def measure(fetch) -> float:
+    await fetch()
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await fetch()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+async def main():
+    async with async_session() as db, unit_of_work(db):
+        user = await user_repo.get_by_email(db=db, email="bench-pagination@example.com")
+        if user is None:
+            user = await user_repo.create(db=db, obj_in={"email": "bench-pagination@example.com", "hashed_password": "x"})
+    await seed(user.id)
+
+    for page in (1, DEEP_PAGE):
+        cursor = await cursor_for_page(user.id, page)
+        offset_ms = await measure(lambda: offset_page(user.id, page))
+        keyset_ms = await measure(lambda: keyset_page(user.id, cursor))
+        print(f"page {page:>6}   offset {offset_ms:8.2f} ms   keyset {keyset_ms:8.2f} ms")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
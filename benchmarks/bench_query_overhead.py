@@ -0,0 +1,53 @@
+"""
+Per-query Python overhead of repository lookups: building a fresh select() on
+every call against executing a prebuilt statement with bound parameters.
+
+Runs against an in-memory SQLite database so the numbers are dominated by
+SQLAlchemy's statement construction and cache-key work, not the server:
+
+    python -m benchmarks.bench_query_overhead
+"""
+import time
+
+from sqlalchemy import bindparam, create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, select
+
+import app.models  # noqa: F401  registers every table on the metadata
+from app.models.user import User
+
+ITERATIONS = 20_000
+USERS = 100
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+def fresh_statement(db: Session, email: str):
+    return db.exec(select(User).where(User.email == email)).first()
+
+def prebuilt_statement(db: Session, email: str):
+    return db.exec(GET_BY_EMAIL, params={"email": email}).first()
+
+def measure(label: str, lookup) -> float:
+    emails = [f"user{i % USERS}@example.com" for i in range(ITERATIONS)]
+    with Session(engine) as db:
+        lookup(db, emails[0])
+        start = time.perf_counter()
+        for email in emails:
+            lookup(db, email)
+        per_query_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+    print(f"{label:<22} {per_query_us:8.2f} us/query")
+    return per_query_us
+
+def main():
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(User(email=f"user{i}@example.com", hashed_password="x") for i in range(USERS))
+        db.commit()
+
+    before = measure("fresh select()", fresh_statement)
+    after = measure("prebuilt statement", prebuilt_statement)
+    print(f"{'saved per query':<22} {before - after:8.2f} us ({(before - after) / before:.0%})")
+
+if __name__ == "__main__":
+    main()
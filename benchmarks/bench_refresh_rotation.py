@@ -0,0 +1,103 @@
+"""
+Refresh token rotation under a concurrent refresh storm: the old
+select + delete + create path against the single UPDATE ... RETURNING rotation.
+
+Every session is refreshed by two clients at once (a double-submitted refresh),
+so besides latency the run also reports how many sessions ended up with more
+than one successor. Needs a migrated Postgres at DATABASE_URL:
+
+    python -m benchmarks.bench_refresh_rotation
+"""
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import delete, select
+
+from app.db import async_session, engine, unit_of_work
+from app.models.session import Session as SessionModel
+from app.repositories.session_repo import session_repo
+from app.repositories.session_store import SqlSessionStore
+from app.repositories.user_repo import user_repo
+
+SESSIONS = 500
+CLIENTS_PER_SESSION = 2
+
+sql_store = SqlSessionStore()
+
+async def legacy_refresh(session_id: uuid.UUID) -> bool:
+    async with async_session() as db, unit_of_work(db):
+        statement = select(SessionModel).where(SessionModel.id == session_id).options(selectinload(SessionModel.user))
+        old_session = (await db.exec(statement)).one_or_none()
+        if not old_session or old_session.expires_at < datetime.utcnow():
+            return False
+        await session_repo.delete(db=db, db_obj=old_session)
+        await session_repo.create(db=db, obj_in={
+            "expires_at": datetime.utcnow() + timedelta(days=7),
+            "user_id": old_session.user_id,
+            "user_agent": "bench",
+            "ip_address": "127.0.0.1",
+        })
+        return True
+
+async def rotate_refresh(session_id: uuid.UUID) -> bool:
+    async with async_session() as db, unit_of_work(db):
+        rotated = await sql_store.rotate(
+            db=db,
+            id=session_id,
+            new_id=uuid.uuid4(),
+            expires_at=datetime.utcnow() + timedelta(days=7),
+            user_agent="bench",
+            ip_address="127.0.0.1",
+        )
+        return rotated is not None
+
+async def seed_sessions(user_id: int) -> list[uuid.UUID]:
+    async with async_session() as db:
+        await db.exec(delete(SessionModel).where(SessionModel.user_id == user_id))
+        sessions = [
+            SessionModel(expires_at=datetime.utcnow() + timedelta(days=7), user_id=user_id, user_agent="bench", ip_address="127.0.0.1")
+            for _ in range(SESSIONS)
+        ]
+        db.add_all(sessions)
+        await db.commit()
+        return [s.id for s in sessions]
+
+async def timed(refresh, session_id: uuid.UUID) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        ok = await refresh(session_id)
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+async def run(label: str, refresh, user_id: int):
+    session_ids = await seed_sessions(user_id)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(timed(refresh, sid) for sid in session_ids for _ in range(CLIENTS_PER_SESSION)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    succeeded = sum(1 for r in results if r[1])
+    print(
+        f"{label:<10} {len(results) / elapsed:8.0f} refresh/s"
+        f"  p50 {statistics.median(latencies):7.2f} ms"
+        f"  p95 {latencies[int(len(latencies) * 0.95)]:7.2f} ms"
+        f"  double-rotated sessions {max(succeeded - SESSIONS, 0)}"
+    )
+
+async def main():
+    async with async_session() as db, unit_of_work(db):
+        user = await user_repo.get_by_email(db=db, email="bench-refresh@example.com")
+        if user is None:
+            user = await user_repo.create(db=db, obj_in={"email": "bench-refresh@example.com", "hashed_password": "x"})
+
+    await run("legacy", legacy_refresh, user.id)
+    await run("rotate", rotate_refresh, user.id)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
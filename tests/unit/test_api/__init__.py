@@ -0,0 +1 @@
+# API tests package
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Unit tests for authentication dependencies
+"""
+import asyncio
+import pytest
+from app.api.v1 import dependencies
+from app.api.v1.dependencies import get_current_principal, get_current_user
+from app.core.config import settings
+from app.core.exceptions.user import InvalidCredentialsException
+from app.core.security import build_principal_claims
+from app.core.token_version import token_version_store
+from app.core.user_cache import UserCache, user_cache
+from app.models.user import User
+
+
+@pytest.fixture
+def stateless_tokens(monkeypatch):
+    """Enable stateless tokens with user 1 at token version 2"""
+    monkeypatch.setattr(settings, "STATELESS_ACCESS_TOKENS", True)
+    monkeypatch.setattr(token_version_store, "enabled", True)
+    token_version_store._cache.set(1, 2)
+    yield
+    token_version_store._cache.clear()
+
+
+class TestGetCurrentPrincipal:
+    """Test resolving the caller from the token claim set"""
+
+    def test_principal_from_claims(self, stateless_tokens):
+        """Test that a current claim set resolves without touching the database"""
+        payload = {"sub": "test@example.com", "jti": "abc", "usr": build_principal_claims(user_id=1, is_active=True, token_version=2)}
+
+        principal = asyncio.run(get_current_principal(db=None, payload=payload))
+
+        assert principal.id == 1
+        assert principal.email == "test@example.com"
+        assert principal.is_active is True
+
+    def test_revoked_token_version_is_rejected(self, stateless_tokens):
+        """Test that tokens issued before a version bump are refused"""
+        payload = {"sub": "test@example.com", "jti": "abc", "usr": build_principal_claims(user_id=1, is_active=True, token_version=1)}
+
+        with pytest.raises(InvalidCredentialsException):
+            asyncio.run(get_current_principal(db=None, payload=payload))
+
+
+class TestGetCurrentUser:
+    """Test filling the user cache on a miss"""
+
+    @pytest.fixture
+    def user(self, session, monkeypatch):
+        monkeypatch.setattr(user_cache, "_cache", UserCache(max_size=2, ttl=60)._cache)
+        monkeypatch.setattr(user_cache, "enabled", True)
+        user = User(id=1, email="test@example.com", hashed_password="hashed_password")
+        session.add(user)
+        session.commit()
+        return user
+
+    def test_invalidation_during_fill_is_not_cached(self, user, async_session, monkeypatch):
+        """Test that a row read from the primary before an invalidation landed is served but not cached"""
+        get_by_email = dependencies.user_repo.get_by_email
+        pinned = []
+
+        async def racing_get_by_email(*, db, email):
+            pinned.append(db.info.get("use_primary"))
+            found = await get_by_email(db=db, email=email)
+            user_cache._evict(email)
+            return found
+
+        monkeypatch.setattr(dependencies.user_repo, "get_by_email", racing_get_by_email)
+        payload = {"sub": "test@example.com", "jti": "abc"}
+
+        assert asyncio.run(get_current_user(db=async_session, payload=payload)).id == 1
+        assert pinned == [True]
+        assert user_cache._cache.get("test@example.com") is None
+
+        monkeypatch.setattr(dependencies.user_repo, "get_by_email", get_by_email)
+        asyncio.run(get_current_user(db=async_session, payload=payload))
+        assert user_cache._cache.get("test@example.com") is not None
@@ -0,0 +1,39 @@
+"""
+Unit tests for wardrobe endpoint request validation
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.dependencies import get_current_principal
+from app.api.v1.endpoints import wardrobe
+from app.core.config import settings
+from app.db import get_db
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(wardrobe.router, prefix="/wardrobe")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_principal] = lambda: None
+    return TestClient(app)
+
+
+class TestBatchDeleteLimits:
+    """Test that batch deletes are bounded like the other batch endpoints"""
+
+    @pytest.mark.parametrize("path", ["/wardrobe/items", "/wardrobe/outfits", "/wardrobe/recommendations"])
+    def test_empty_batch_is_rejected(self, client, path):
+        """Test that a delete without ids is a validation error"""
+        response = client.request("DELETE", path, json={"ids": []})
+
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("path", ["/wardrobe/items", "/wardrobe/outfits", "/wardrobe/recommendations"])
+    def test_oversized_batch_is_rejected(self, client, path):
+        """Test that a delete over WARDROBE_BATCH_MAX_SIZE ids is a validation error"""
+        ids = list(range(1, settings.WARDROBE_BATCH_MAX_SIZE + 2))
+
+        response = client.request("DELETE", path, json={"ids": ids})
+
+        assert response.status_code == 422
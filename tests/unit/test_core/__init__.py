@@ -0,0 +1 @@
+# Core tests package
\ No newline at end of file
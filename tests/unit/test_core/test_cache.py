@@ -0,0 +1,57 @@
+"""
+Unit tests for the in-process TTL cache
+"""
+import pytest
+from app.core.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test size bounds, expiry and LRU ordering"""
+
+    def test_get_returns_stored_value(self):
+        """Test a simple set/get round trip"""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry goes first"""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        """Test that entries past their TTL are dropped on read"""
+        cache = TTLCache(max_size=2, ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_pop_and_clear(self):
+        """Test explicit invalidation"""
+        cache = TTLCache(max_size=3, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_zero_size_disables_cache(self):
+        """Test that a zero max_size stores nothing"""
+        cache = TTLCache(max_size=0, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
@@ -0,0 +1,31 @@
+"""
+Unit tests for weak ETags
+"""
+from datetime import datetime
+from app.core.etag import etag_matches, make_weak_etag
+
+
+class TestEtag:
+    """Test building and comparing wardrobe version tags"""
+
+    def test_tag_changes_with_count_and_last_change(self):
+        """Test that a delete (count) or an edit (timestamp) both produce a new tag"""
+        changed = datetime(2026, 10, 18, 12, 0, 0, 123456)
+        tag = make_weak_etag((3, changed))
+
+        assert tag.startswith('W/"')
+        assert make_weak_etag((2, changed)) != tag
+        assert make_weak_etag((3, datetime(2026, 10, 18, 12, 0, 0, 123457))) != tag
+        assert make_weak_etag((0, None)) == 'W/"0.0"'
+
+    def test_weak_comparison(self):
+        """Test If-None-Match matching, including lists, strong forms and *"""
+        tag = make_weak_etag((3, datetime(2026, 10, 18)))
+        opaque = tag.removeprefix("W/")
+
+        assert etag_matches(tag, tag)
+        assert etag_matches(opaque, tag)
+        assert etag_matches(f'W/"other", {tag}', tag)
+        assert etag_matches("*", tag)
+        assert not etag_matches('W/"other"', tag)
+        assert not etag_matches(None, tag)
@@ -0,0 +1,105 @@
+"""
+Unit tests for the worker-local JWT denylist mirror
+"""
+import asyncio
+import fnmatch
+from datetime import datetime, timezone
+import pytest
+from app.core import jwt_denylist
+from app.core.jwt_denylist import LocalDenylist, bootstrap_local_denylist, is_jti_denylisted, local_denylist
+
+LEGACY_JTI = "6f1c2a4e-8d3b-4f7a-9c2e-1b5d7e9f0a3c"
+
+
+def _now() -> float:
+    return datetime.now(timezone.utc).timestamp()
+
+
+class TestLocalDenylist:
+    """Test membership and expiry of mirrored JTIs"""
+
+    def test_contains_added_jti(self):
+        """Test that a live JTI is reported as denylisted"""
+        denylist = LocalDenylist()
+        denylist.add("jti-1", _now() + 60)
+
+        assert denylist.contains("jti-1")
+        assert not denylist.contains("jti-2")
+
+    def test_expired_jti_is_pruned(self):
+        """Test that entries disappear once the token would have expired"""
+        denylist = LocalDenylist()
+        expired = _now() - 1
+        denylist._entries["jti-1"] = expired
+        denylist._expiry_heap = [(expired, "jti-1")]
+
+        assert not denylist.contains("jti-1")
+        assert len(denylist) == 0
+
+    def test_already_expired_jti_is_ignored(self):
+        """Test that adding an expired token stores nothing"""
+        denylist = LocalDenylist()
+        denylist.add("jti-1", _now() - 1)
+
+        assert len(denylist) == 0
+
+    def test_ready_mirror_answers_without_redis(self):
+        """Test that lookups are served locally once the mirror is ready"""
+        local_denylist.clear()
+        local_denylist.add("jti-1", _now() + 60)
+        local_denylist.ready = True
+        try:
+            assert asyncio.run(is_jti_denylisted("jti-1")) is True
+            assert asyncio.run(is_jti_denylisted("jti-2")) is False
+        finally:
+            local_denylist.ready = False
+            local_denylist.clear()
+
+
+class FakeRedis:
+    """Denylist entries in both key formats, with their remaining TTL in ms"""
+
+    def __init__(self, entries: dict[str, tuple[str, int]]):
+        self.entries = entries
+
+    async def scan_iter(self, match, count):
+        for key in list(self.entries):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def mget(self, keys):
+        return [self.entries[key][0] if key in self.entries else None for key in keys]
+
+    async def pttl(self, key):
+        return self.entries[key][1] if key in self.entries else -2
+
+
+class TestLegacyKeys:
+    """Test that tokens denylisted under the bare-jti keys stay denied"""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        redis = FakeRedis({
+            LEGACY_JTI: ("denied", 60_000),
+            "denylist:jti-new": (str(_now() + 60), 60_000),
+            "session:rotated:abc": ("x", 60_000),
+        })
+        monkeypatch.setattr(jwt_denylist, "redis_client", redis)
+        local_denylist.clear()
+        yield redis
+        local_denylist.ready = False
+        local_denylist.clear()
+
+    def test_redis_fallback_checks_legacy_key(self, redis):
+        """Test that lookups without the mirror find entries in either format"""
+        assert asyncio.run(is_jti_denylisted(LEGACY_JTI)) is True
+        assert asyncio.run(is_jti_denylisted("jti-new")) is True
+        assert asyncio.run(is_jti_denylisted("jti-other")) is False
+
+    def test_bootstrap_mirrors_legacy_keys(self, redis):
+        """Test that the mirror is seeded from legacy entries too, expiring with their TTL"""
+        asyncio.run(bootstrap_local_denylist())
+
+        assert local_denylist.contains(LEGACY_JTI)
+        assert local_denylist.contains("jti-new")
+        assert len(local_denylist) == 2
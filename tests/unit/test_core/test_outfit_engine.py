@@ -0,0 +1,99 @@
+"""
+Unit tests for the vectorized outfit engine
+"""
+import itertools
+import random
+from datetime import datetime
+import pytest
+from app.core.outfit_engine import CATEGORY_SLOTS, FORMALITY_RANGE, UNRATED_AFFINITY, OutfitEngine, _harmony_matrix, _item_colors, outfit_engine
+from app.schemas.wardrobe import ClothingItemRead
+
+
+def make_item(item_id: int, category: str, colors: list[str], formality_level: int = 3) -> ClothingItemRead:
+    return ClothingItemRead(
+        id=item_id,
+        description=f"item {item_id}",
+        category=category,
+        colors=colors,
+        fit_type=None,
+        formality_level=formality_level,
+        image_url=None,
+        created_at=datetime(2026, 10, 18),
+        updated_at=None,
+    )
+
+def random_wardrobe(size: int, seed: int) -> tuple[list[ClothingItemRead], dict[int, float]]:
+    rng = random.Random(seed)
+    colors = ["black", "white", "blue", "orange", "red", "green", "pink"]
+    items = [
+        make_item(i, rng.choice(list(CATEGORY_SLOTS) + ["hat"]), rng.sample(colors, rng.randint(0, 2)), rng.randint(1, 5))
+        for i in range(size)
+    ]
+    return items, {item.id: rng.random() for item in items if rng.random() < 0.3}
+
+def reference_score(outfit: tuple[ClothingItemRead, ...], affinities: dict[int, float]) -> float:
+    """The engine's score for one outfit, computed directly from its definition"""
+    colors = {color: index for index, color in enumerate(sorted(set().union(*map(_item_colors, outfit))))}
+    harmony = _harmony_matrix(colors)
+    pairs = list(itertools.combinations(outfit, 2))
+    formality = sum(1 - abs(a.formality_level - b.formality_level) / FORMALITY_RANGE for a, b in pairs) / len(pairs)
+    color = sum(
+        sum(harmony[colors[x], colors[y]] for x in _item_colors(a) for y in _item_colors(b)) / (len(_item_colors(a)) * len(_item_colors(b)))
+        for a, b in pairs
+    ) / len(pairs)
+    rating = sum(affinities.get(item.id, UNRATED_AFFINITY) for item in outfit) / len(outfit)
+    weights = outfit_engine.weights
+    return weights.formality * formality + weights.color * color + weights.rating * rating
+
+
+class TestOutfitEngine:
+    """Test scoring and pruned top-k selection of outfit candidates"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_exhaustive_search(self, seed, monkeypatch):
+        """Test that pruning returns the same top scores as scoring every combination"""
+        # A tiny chunk forces the pruned loop to run over many blocks
+        monkeypatch.setattr("app.core.outfit_engine.SCORE_CELL_BUDGET", 8)
+        items, affinities = random_wardrobe(40, seed)
+        suggestions = outfit_engine.suggest(items, affinities=affinities, k=5)
+
+        slot_items = {}
+        for item in items:
+            slot_items.setdefault(CATEGORY_SLOTS.get(item.category), []).append(item)
+        every = list(itertools.product(slot_items.get("top", []), slot_items.get("bottom", []), slot_items.get("shoes", [])))
+        every += list(itertools.product(slot_items.get("one_piece", []), slot_items.get("shoes", [])))
+        expected = sorted((reference_score(outfit, affinities) for outfit in every), reverse=True)[:5]
+
+        assert [suggestion.score for suggestion in suggestions] == pytest.approx(expected, abs=1e-5)
+        for suggestion in suggestions:
+            weights = outfit_engine.weights
+            assert suggestion.score == pytest.approx(
+                weights.formality * suggestion.formality + weights.color * suggestion.color_harmony + weights.rating * suggestion.rating, abs=1e-5
+            )
+
+    def test_prefers_coherent_outfits(self):
+        """Test that matching formality, harmonious colors and past ratings all win"""
+        items = [
+            make_item(1, "shirt", ["white"], 5),
+            make_item(2, "Hoodie", ["red"], 1),
+            make_item(3, "trousers", ["navy"], 5),
+            make_item(4, "shoes", ["black"], 5),
+            make_item(5, "sneakers", ["green"], 1),
+            make_item(6, "hat", ["white"], 5),
+        ]
+
+        best = outfit_engine.suggest(items, affinities={1: 1.0, 3: 1.0, 4: 1.0}, k=2)
+
+        assert [item.id for item in best[0].items] == [1, 3, 4]
+        assert best[0].formality == pytest.approx(1.0)
+        assert best[0].color_harmony == pytest.approx(1.0)
+        assert best[0].rating == pytest.approx(1.0)
+        assert best[1].score < best[0].score
+
+    def test_dresses_and_missing_slots(self):
+        """Test the dress template, and that no outfit is made without every slot filled"""
+        engine = OutfitEngine()
+
+        assert engine.suggest([make_item(1, "shirt", []), make_item(2, "shoes", [])], affinities={}, k=3) == []
+        suggestions = engine.suggest([make_item(1, "dress", ["blue"]), make_item(2, "boots", ["orange"])], affinities={}, k=3)
+        assert [[item.id for item in suggestion.items] for suggestion in suggestions] == [[1, 2]]
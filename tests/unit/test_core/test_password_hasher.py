@@ -0,0 +1,44 @@
+"""
+Unit tests for the async password hasher
+"""
+import asyncio
+import time
+import pytest
+from app.core.password_hasher import PasswordHasher
+from app.core.exceptions.security import PasswordHasherBusyException
+
+
+class TestPasswordHasher:
+    """Test hashing off the event loop with queue and timeout limits"""
+
+    def test_hash_and_verify_round_trip(self):
+        """Test that a hash produced by the hasher verifies"""
+        hasher = PasswordHasher(max_workers=0, max_pending=4, timeout=10)
+
+        async def run():
+            hashed = await hasher.hash("s3cret")
+            return await hasher.verify("s3cret", hashed), await hasher.verify("wrong", hashed)
+
+        assert asyncio.run(run()) == (True, False)
+
+    def test_rejects_when_queue_is_full(self):
+        """Test that work beyond max_pending is rejected instead of queued"""
+        hasher = PasswordHasher(max_workers=0, max_pending=0, timeout=10)
+
+        with pytest.raises(PasswordHasherBusyException):
+            asyncio.run(hasher.hash("s3cret"))
+
+    def test_times_out_slow_work(self):
+        """Test that slow work surfaces as busy but holds its slot until the pool is done with it"""
+        hasher = PasswordHasher(max_workers=0, max_pending=1, timeout=0.01)
+
+        async def run():
+            with pytest.raises(PasswordHasherBusyException):
+                await hasher._run("hash", time.sleep, 0.2)
+            assert hasher._in_flight == 1
+            with pytest.raises(PasswordHasherBusyException):
+                await hasher.hash("s3cret")
+            await asyncio.sleep(0.3)
+            assert hasher._in_flight == 0
+
+        asyncio.run(run())
@@ -0,0 +1,147 @@
+"""
+Unit tests for per-request SQL instrumentation
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core import query_stats as query_stats_module
+from app.core.context import query_stats_var
+from app.core.middlewares import query_stats as query_stats_middleware
+from app.core.middlewares.query_stats import QueryStatsMiddleware
+from app.core.query_stats import QueryStats, instrument_engine, observe_request
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    instrument_engine(engine)
+    return engine
+
+
+@pytest.fixture
+def stats():
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    yield stats
+    query_stats_var.reset(token)
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    captured = []
+    monkeypatch.setattr(query_stats_module.log, "warn", lambda event, **kw: captured.append((event, kw)))
+    return captured
+
+
+class TestQueryStats:
+    """Test what the engine hooks record"""
+
+    def test_counts_statements_and_time(self, engine, stats):
+        """Test that every statement in the request is counted and timed"""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        assert stats.count == 2
+        assert stats.total_time > 0
+        assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+    def test_nothing_recorded_outside_a_request(self, engine):
+        """Test that statements without request stats are ignored"""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert query_stats_var.get() is None
+
+    def test_repeated_shape_is_grouped_across_parameters(self, engine, stats):
+        """Test that the same SQL with different parameters counts as one shape"""
+        with engine.connect() as conn:
+            for i in range(6):
+                conn.execute(text("SELECT :value"), {"value": i})
+            conn.execute(text("SELECT 1"))
+
+        assert stats.repeated(5) == {"SELECT ?": 6}
+
+    def test_slow_statement_is_logged(self, engine, stats, warnings, monkeypatch):
+        """Test that statements over the threshold are logged"""
+        monkeypatch.setattr(query_stats_module.settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert [event for event, _ in warnings] == ["slow_query"]
+        assert warnings[0][1]["statement"] == "SELECT 1"
+
+
+class TestObserveRequest:
+    """Test end-of-request reporting"""
+
+    def test_flags_n_plus_one(self, warnings, monkeypatch):
+        """Test that a statement repeated past the threshold is reported with its route"""
+        monkeypatch.setattr(query_stats_module.settings, "N_PLUS_ONE_THRESHOLD", 3)
+        stats = QueryStats()
+        for _ in range(3):
+            stats.record("SELECT * FROM outfit WHERE id = ?", 0.001)
+        stats.record("SELECT * FROM user WHERE email = ?", 0.002)
+
+        observe_request(stats, "/api/v1/outfits")
+
+        assert len(warnings) == 1
+        event, fields = warnings[0]
+        assert event == "n_plus_one_detected"
+        assert fields["route"] == "/api/v1/outfits"
+        assert fields["executions"] == 3
+
+
+class TestQueryStatsMiddleware:
+    """Test when the middleware reports a request"""
+
+    @pytest.fixture
+    def observed(self, monkeypatch):
+        observed = []
+        monkeypatch.setattr(query_stats_middleware, "observe_request", lambda stats, route: observed.append((route, stats.count)))
+        return observed
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            query_stats_var.get().record("SELECT * FROM item WHERE id = ?", 0.001)
+            return {"id": item_id}
+
+        @app.get("/export")
+        async def export():
+            async def rows():
+                for i in range(3):
+                    query_stats_var.get().record("SELECT * FROM item WHERE id = ?", 0.001)
+                    yield f"{i}\n"
+
+            return StreamingResponse(rows())
+
+        return TestClient(app)
+
+    def test_reports_by_route_template(self, client, observed):
+        """Test that a request is reported once, under its route template"""
+        client.get("/items/7")
+
+        assert observed == [("/items/{item_id}", 1)]
+
+    def test_streamed_response_is_reported_after_its_body(self, client, observed):
+        """Test that queries run while a body streams are included in the report"""
+        response = client.get("/export")
+
+        assert response.text == "0\n1\n2\n"
+        assert observed == [("/export", 3)]
+
+    def test_unmatched_path(self, client, observed):
+        """Test that requests matching no route share one label"""
+        client.get("/missing")
+
+        assert observed == [("unmatched", 0)]
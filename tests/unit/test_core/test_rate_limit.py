@@ -0,0 +1,77 @@
+"""
+Unit tests for the sliding-window rate limiter
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import InMemorySlidingWindowBackend, RateLimit, client_ip
+from app.core.exceptions.security import RateLimitExceededException
+
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    """Swap the shared limiter for a fresh in-memory one"""
+    backend = InMemorySlidingWindowBackend()
+    monkeypatch.setattr(rate_limit, "rate_limiter", backend)
+    return backend
+
+
+class TestInMemorySlidingWindowBackend:
+    """Test the in-memory window used by tests and development"""
+
+    def test_allows_up_to_limit(self):
+        """Test that hits within the limit pass and the next one is refused"""
+        backend = InMemorySlidingWindowBackend()
+
+        async def run():
+            return [await backend.hit("k", 3, 60) for _ in range(4)]
+
+        results = asyncio.run(run())
+
+        assert results[:3] == [None, None, None]
+        assert 0 < results[3] <= 60
+
+    def test_keys_are_independent(self):
+        """Test that one key hitting its limit does not affect another"""
+        backend = InMemorySlidingWindowBackend()
+
+        async def run():
+            await backend.hit("a", 1, 60)
+            return await backend.hit("a", 1, 60), await backend.hit("b", 1, 60)
+
+        assert asyncio.run(run())[1] is None
+
+    def test_window_slides(self):
+        """Test that hits older than the window no longer count"""
+        backend = InMemorySlidingWindowBackend()
+
+        async def run():
+            await backend.hit("k", 1, 0.01)
+            await asyncio.sleep(0.02)
+            return await backend.hit("k", 1, 0.01)
+
+        assert asyncio.run(run()) is None
+
+
+class TestRateLimitDependency:
+    """Test the FastAPI dependency wrapper"""
+
+    def test_raises_with_retry_after(self, memory_backend):
+        """Test that exceeding the limit raises with a whole-second Retry-After"""
+        limit = RateLimit(scope="test", limit=1, window=30, key=client_ip)
+        request = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"))
+
+        asyncio.run(limit(request))
+        with pytest.raises(RateLimitExceededException) as exc_info:
+            asyncio.run(limit(request))
+
+        assert 1 <= exc_info.value.retry_after <= 30
+
+    def test_missing_identity_is_not_limited(self, memory_backend):
+        """Test that requests without a key are passed through"""
+        limit = RateLimit(scope="test", limit=1, window=30, key=client_ip)
+        request = SimpleNamespace(client=None)
+
+        asyncio.run(limit(request))
+        asyncio.run(limit(request))
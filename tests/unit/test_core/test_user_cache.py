@@ -0,0 +1,180 @@
+"""
+Unit tests for the per-process authenticated user cache
+"""
+import asyncio
+import pytest
+from app.core.pubsub import redis_subscriber
+from app.core.token_version import token_version_store
+from app.core.user_cache import INVALIDATION_CHANNEL, UserCache, user_cache
+from app.db import unit_of_work
+from app.models.user import User
+from app.repositories.session_repo import session_repo
+from app.repositories.user_repo import user_repo
+
+
+class MergingDB:
+    """Stands in for the request session a cache hit is attached to"""
+
+    def __init__(self):
+        self.merged = []
+
+    async def merge(self, instance, load=True):
+        self.merged.append(instance)
+        return instance
+
+
+def make_user(**overrides) -> User:
+    fields = {"id": 1, "email": "test@example.com", "hashed_password": "hashed_password", "style_preferences": {"style": "casual"}}
+    return User(**{**fields, **overrides})
+
+
+class TestUserCache:
+    """Test caching while the invalidation channel is up, and eviction through it"""
+
+    def test_miss_while_disconnected(self):
+        """Test that nothing is cached until pub/sub has connected"""
+        cache = UserCache(max_size=2, ttl=60)
+        db = MergingDB()
+
+        cache.set(make_user(), epoch=cache.epoch)
+
+        assert asyncio.run(cache.get(db=db, email="test@example.com")) is None
+        assert db.merged == []
+
+    def test_hit_after_connect(self):
+        """Test that a hit is a fresh copy attached to the caller's session"""
+        cache = UserCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        user = make_user()
+        cache.set(user, epoch=cache.epoch)
+        user.style_preferences["style"] = "formal"
+        db = MergingDB()
+
+        cached = asyncio.run(cache.get(db=db, email="test@example.com"))
+
+        assert db.merged == [cached]
+        assert cached is not user
+        assert cached.id == 1 and cached.style_preferences == {"style": "casual"}
+
+    def test_invalidate_message_evicts(self, monkeypatch):
+        """Test that an invalidation published by another worker drops the entry here"""
+        monkeypatch.setattr(user_cache, "_cache", UserCache(max_size=2, ttl=60)._cache)
+        monkeypatch.setattr(user_cache, "enabled", True)
+        user_cache.set(make_user(), epoch=user_cache.epoch)
+        user_cache.set(make_user(id=2, email="other@example.com"), epoch=user_cache.epoch)
+
+        asyncio.run(redis_subscriber._dispatch(INVALIDATION_CHANNEL, "test@example.com"))
+
+        assert asyncio.run(user_cache.get(db=MergingDB(), email="test@example.com")) is None
+        assert asyncio.run(user_cache.get(db=MergingDB(), email="other@example.com")) is not None
+
+    def test_invalidation_during_fill_is_not_overwritten(self):
+        """Test that a user read before an invalidation that landed mid-fill is not cached"""
+        cache = UserCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        epoch = cache.epoch
+        user = make_user()
+
+        cache._evict("test@example.com")
+        cache.set(user, epoch=epoch)
+        assert asyncio.run(cache.get(db=MergingDB(), email="test@example.com")) is None
+
+        cache.set(user, epoch=cache.epoch)
+        assert asyncio.run(cache.get(db=MergingDB(), email="test@example.com")) is not None
+
+    def test_disconnect_clears(self):
+        """Test that entries are dropped once invalidations can no longer be heard"""
+        cache = UserCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        cache.set(make_user(), epoch=cache.epoch)
+
+        cache._on_disconnect()
+        cache.set(make_user(), epoch=cache.epoch)
+
+        assert asyncio.run(cache.get(db=MergingDB(), email="test@example.com")) is None
+
+
+class TestUserRepoInvalidation:
+    """Test which cache entries a user update invalidates"""
+
+    def test_email_change_invalidates_old_and_new_email(self, session, async_session, monkeypatch):
+        """Test that the entry cached under the previous email is dropped too"""
+        invalidated = []
+
+        async def invalidate(email: str):
+            invalidated.append(email)
+
+        monkeypatch.setattr(user_cache, "invalidate", invalidate)
+        user = make_user()
+        session.add(user)
+        session.commit()
+
+        asyncio.run(user_repo.update(db=async_session, db_obj=user, obj_in={"email": "new@example.com"}))
+
+        assert invalidated == ["test@example.com", "new@example.com"]
+
+    def test_other_change_invalidates_email_once(self, session, async_session, monkeypatch):
+        """Test that an update keeping the email invalidates it a single time"""
+        invalidated = []
+
+        async def invalidate(email: str):
+            invalidated.append(email)
+
+        monkeypatch.setattr(user_cache, "invalidate", invalidate)
+        user = make_user()
+        session.add(user)
+        session.commit()
+
+        asyncio.run(user_repo.update(db=async_session, db_obj=user, obj_in={"lifestyle": "student"}))
+
+        assert invalidated == ["test@example.com"]
+
+
+class TestUserRepoDeactivation:
+    """Test when a deactivated user's sessions are ended"""
+
+    @pytest.fixture
+    def ended(self, monkeypatch):
+        ended = []
+
+        async def delete_all_for_user(*, db, user_id):
+            ended.append(user_id)
+
+        async def noop(*args):
+            pass
+
+        monkeypatch.setattr(session_repo, "delete_all_for_user", delete_all_for_user)
+        monkeypatch.setattr(user_cache, "invalidate", noop)
+        monkeypatch.setattr(token_version_store, "bump", noop)
+        return ended
+
+    def test_sessions_end_after_commit(self, session, async_session, ended):
+        """Test that sessions are only deleted once the deactivation has committed"""
+        user = make_user()
+        session.add(user)
+        session.commit()
+
+        async def deactivate():
+            async with unit_of_work(async_session):
+                await user_repo.update(db=async_session, db_obj=user, obj_in={"is_active": False})
+                assert ended == []
+
+        asyncio.run(deactivate())
+
+        assert ended == [1]
+
+    def test_rolled_back_deactivation_keeps_sessions(self, session, async_session, ended):
+        """Test that sessions survive a deactivation whose transaction rolls back"""
+        user = make_user()
+        session.add(user)
+        session.commit()
+
+        async def deactivate():
+            async with unit_of_work(async_session):
+                await user_repo.update(db=async_session, db_obj=user, obj_in={"is_active": False})
+                raise RuntimeError("later step failed")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(deactivate())
+
+        assert ended == []
@@ -0,0 +1,140 @@
+"""
+Unit tests for the per-user wardrobe inverted index
+"""
+import asyncio
+from datetime import datetime
+from app.core import wardrobe_index as wardrobe_index_module
+from app.core.wardrobe_index import PROCESS_ID, WardrobeIndex, WardrobeIndexCache
+from app.schemas.wardrobe import ClothingItemRead
+
+
+def make_item(item_id: int, *, category: str, colors: list[str], fit_type: str | None = None, formality_level: int = 3) -> ClothingItemRead:
+    return ClothingItemRead(
+        id=item_id,
+        description=f"item {item_id}",
+        category=category,
+        colors=colors,
+        fit_type=fit_type,
+        formality_level=formality_level,
+        image_url=None,
+        created_at=datetime(2026, 10, 18, 12, item_id),
+        updated_at=None,
+    )
+
+def sample_index() -> WardrobeIndex:
+    return WardrobeIndex.build([
+        make_item(1, category="Shirt", colors=["white"], fit_type="slim", formality_level=4),
+        make_item(2, category="shirt", colors=["blue", "white"], fit_type="regular", formality_level=2),
+        make_item(3, category="pants", colors=["blue"], fit_type="slim", formality_level=3),
+        make_item(4, category="shoes", colors=["black"], formality_level=5),
+    ])
+
+
+class TestWardrobeIndex:
+    """Test facet filters, counts and incremental updates"""
+
+    def test_filters_combine_across_facets(self):
+        """Test OR within a facet, AND across facets, case-insensitively, newest first"""
+        index = sample_index()
+
+        matched, _ = index.search(category=["SHIRT", "pants"], color=["blue"])
+        assert [item.id for item in matched] == [3, 2]
+
+        matched, _ = index.search(color=["blue", "white"], colors_match_all=True)
+        assert [item.id for item in matched] == [2]
+
+        matched, _ = index.search(formality_min=3, formality_max=4)
+        assert [item.id for item in matched] == [3, 1]
+
+        matched, _ = index.search(category=["hat"])
+        assert matched == []
+
+    def test_facet_counts_exclude_own_filter(self):
+        """Test that a facet's counts apply every filter but its own"""
+        index = sample_index()
+
+        matched, facets = index.search(category=["shirt"], fit_type=["slim"])
+
+        assert [item.id for item in matched] == [1]
+        # Other categories are counted among slim items, other fits among shirts
+        assert facets["category"] == {"pants": 1, "shirt": 1}
+        assert facets["fit_type"] == {"regular": 1, "slim": 1}
+        assert facets["color"] == {"white": 1}
+        assert facets["formality_level"] == {"4": 1}
+
+    def test_upsert_and_remove_update_postings(self):
+        """Test that edits move an item between postings and deletes free its slot"""
+        index = sample_index()
+
+        index.upsert(make_item(2, category="jacket", colors=["green"], formality_level=2))
+        index.remove(4)
+        index.remove(99)
+
+        _, facets = index.search()
+        assert facets["category"] == {"jacket": 1, "pants": 1, "shirt": 1}
+        assert facets["color"] == {"blue": 1, "green": 1, "white": 1}
+        assert "5" not in facets["formality_level"]
+        assert len(index) == 3
+
+        index.upsert(make_item(5, category="hat", colors=["black"]))
+        matched, _ = index.search(color=["black"])
+        assert [item.id for item in matched] == [5]
+
+
+class TestWardrobeIndexCache:
+    """Test lazy caching and invalidation of per-user indexes"""
+
+    def make_cache(self, monkeypatch) -> tuple[WardrobeIndexCache, list[str]]:
+        published = []
+
+        async def publish(channel: str, message: str):
+            published.append(message)
+
+        monkeypatch.setattr(wardrobe_index_module.redis_subscriber, "publish", publish)
+        cache = WardrobeIndexCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        return cache, published
+
+    def test_items_changed_updates_cached_index(self, monkeypatch):
+        """Test that local writes patch the cached index and notify other workers"""
+        cache, published = self.make_cache(monkeypatch)
+        cache.set(1, sample_index(), epoch=cache.epoch)
+
+        asyncio.run(cache.items_changed(1, upserted=[make_item(6, category="hat", colors=["red"])], deleted=[1]))
+
+        index = cache.get(1)
+        assert 6 in index.items and 1 not in index.items
+        assert published == [f"{PROCESS_ID}:1"]
+
+    def test_stale_build_is_not_cached(self):
+        """Test that an index built from rows read before a write is discarded"""
+        cache = WardrobeIndexCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        epoch = cache.epoch
+        cache._evict("other-worker:1")
+
+        cache.set(1, sample_index(), epoch=epoch)
+        assert cache.get(1) is None
+
+    def test_evicts_only_for_other_workers(self):
+        """Test that invalidations from this worker are ignored and others drop the index"""
+        cache = WardrobeIndexCache(max_size=2, ttl=60)
+        asyncio.run(cache._on_connect())
+        cache.set(1, sample_index(), epoch=cache.epoch)
+
+        cache._evict(f"{PROCESS_ID}:1")
+        assert cache.get(1) is not None
+
+        cache._evict("other-worker:1")
+        assert cache.get(1) is None
+
+    def test_disabled_while_disconnected(self):
+        """Test that nothing is cached without the invalidation channel"""
+        cache = WardrobeIndexCache(max_size=2, ttl=60)
+        cache.set(1, sample_index(), epoch=cache.epoch)
+        assert cache.get(1) is None
+
+        asyncio.run(cache._on_connect())
+        cache.set(1, sample_index(), epoch=cache.epoch)
+        cache._on_disconnect()
+        assert cache.get(1) is None
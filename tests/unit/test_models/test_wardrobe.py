@@ -2,7 +2,9 @@
 Unit tests for Wardrobe models (ClothingItem, Outfit, ShoppingRecommendation)
 """
 import pytest
-from app.models.wardrobe import ClothingItem, Outfit, ShoppingRecommendation
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from app.models.wardrobe import ClothingItem, Outfit, OutfitItem, ShoppingRecommendation
 
 
 class TestClothingItemModel:
@@ -55,33 +57,34 @@ class TestOutfitModel:
         
         assert outfit.user_id == 1
         assert outfit.name == "Work Outfit"
-        assert outfit.clothing_items == [1, 2, 3]
         assert outfit.description == "Professional look for office meetings"
         assert outfit.user_rating == 5
     
     def test_outfit_optional_fields(self):
         """Test outfit with minimal required fields"""
-        outfit = Outfit(
-            user_id=1,
-            clothing_items=[1, 2]
-        )
+        outfit = Outfit(user_id=1)
         
         assert outfit.name is None
         assert outfit.description is None
         assert outfit.user_rating is None
-        assert outfit.clothing_items == [1, 2]
+        assert outfit.clothing_items == []
     
-    def test_outfit_clothing_items_relationship(self):
-        """Test that outfits can reference multiple clothing items"""
-        outfit = Outfit(
-            user_id=1,
-            clothing_items=[1, 2, 3, 4]
-        )
-        
-        # Should store list of clothing item IDs
-        assert len(outfit.clothing_items) == 4
-        assert 1 in outfit.clothing_items
-        assert 4 in outfit.clothing_items
+    def test_outfit_items_relationship(self, session):
+        """Test that outfit items load in position order and link back to their outfits"""
+        items = [ClothingItem(user_id=1, description=f"item {i}", category="shirt") for i in range(3)]
+        outfit = Outfit(user_id=1)
+        session.add_all([*items, outfit])
+        session.flush()
+        session.add_all([
+            OutfitItem(outfit_id=outfit.id, clothing_item_id=item.id, position=position)
+            for position, item in zip([2, 0, 1], items)
+        ])
+        session.commit()
+        session.expire_all()
+
+        assert [item.description for item in outfit.clothing_items] == ["item 1", "item 2", "item 0"]
+        linked = session.exec(select(ClothingItem).where(ClothingItem.id == items[0].id).options(selectinload(ClothingItem.outfits))).one()
+        assert [o.id for o in linked.outfits] == [outfit.id]
 
 
 class TestShoppingRecommendationModel:
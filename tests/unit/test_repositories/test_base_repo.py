@@ -0,0 +1,251 @@
+"""
+Unit tests for BaseRepo batch inserts, targeted updates and keyset pagination
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import select, update
+
+from app.core.exceptions.pagination import InvalidCursorException
+from app.core.exceptions.repository import ConcurrentUpdateException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.wardrobe import ClothingItem
+from app.repositories.base_repo import BaseRepo
+
+
+@pytest.fixture
+def items(session):
+    start = datetime(2026, 1, 1)
+    # Pairs share a timestamp so the id tie-breaker is exercised
+    rows = [
+        ClothingItem(user_id=1 if i % 3 else 2, description=f"item {i}", category="shirt", created_at=start + timedelta(minutes=i // 2))
+        for i in range(25)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def _pages(db, **kwargs):
+    repo = BaseRepo(ClothingItem)
+    cursor, pages = None, []
+    while True:
+        page, cursor = asyncio.run(repo.get_page(db=db, cursor=cursor, **kwargs))
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+class TestGetByField:
+    """Test lookups through prebuilt statements"""
+
+    def test_reuses_statement_per_field(self, async_session, items):
+        """Test that the statement is built once per field and only the value changes"""
+        repo = BaseRepo(ClothingItem)
+        db = async_session
+
+        first = asyncio.run(repo.get_by_field(db=db, field_name="description", value="item 3"))
+        statement = repo._field_statements["description"]
+        second = asyncio.run(repo.get_by_field(db=db, field_name="description", value="item 4"))
+
+        assert (first.description, second.description) == ("item 3", "item 4")
+        assert repo._field_statements["description"] is statement
+        assert asyncio.run(repo.get_by_field(db=db, field_name="description", value="missing")) is None
+
+
+class TestCreateMany:
+    """Test batch inserts"""
+
+    def test_inserts_batch_without_committing(self, session, async_session):
+        """Test that every row comes back with its generated id and defaults, leaving the commit to the caller"""
+        db = async_session
+        rows = [{"user_id": 1, "description": f"item {i}", "category": "shirt"} for i in range(50)]
+
+        created = asyncio.run(BaseRepo(ClothingItem).create_many(db=db, objs_in=rows))
+
+        assert [item.description for item in created] == [row["description"] for row in rows]
+        assert all(item.id is not None for item in created)
+        assert created[0].colors == [] and created[0].formality_level == 3
+        assert db.commits == 0
+        assert len(session.exec(select(ClothingItem)).all()) == 50
+
+    def test_empty_batch_is_a_no_op(self, async_session):
+        """Test that nothing is sent for an empty batch"""
+        db = async_session
+
+        assert asyncio.run(BaseRepo(ClothingItem).create_many(db=db, objs_in=[])) == []
+
+    def test_invalid_row_rejects_whole_batch(self, session, async_session):
+        """Test that validation runs before anything is inserted"""
+        db = async_session
+        rows = [{"user_id": 1, "description": "ok", "category": "shirt"}, {"user_id": "nope", "description": "bad"}]
+
+        with pytest.raises(ValueError):
+            asyncio.run(BaseRepo(ClothingItem).create_many(db=db, objs_in=rows))
+        assert session.exec(select(ClothingItem)).all() == []
+
+
+class TestUpsertMany:
+    """Test batch upserts"""
+
+    def test_updates_existing_and_inserts_new(self, session, async_session):
+        """Test that conflicting rows are overwritten and the rest inserted"""
+        db = async_session
+        repo = BaseRepo(ClothingItem)
+        existing = asyncio.run(repo.create_many(db=db, objs_in=[{"user_id": 1, "description": "old", "category": "shirt"}]))[0]
+
+        upserted = asyncio.run(repo.upsert_many(db=db, conflict_columns=["id"], objs_in=[
+            {"id": existing.id, "user_id": 1, "description": "new", "category": "shirt"},
+            {"user_id": 1, "description": "fresh", "category": "pants"},
+        ]))
+
+        assert [item.description for item in upserted] == ["new", "fresh"]
+        assert upserted[0].id == existing.id
+        assert upserted[0].updated_at is not None
+        assert upserted[0].created_at == existing.created_at
+        assert len(session.exec(select(ClothingItem)).all()) == 2
+
+
+@pytest.fixture
+def item(session):
+    # Match app.db.async_session, which keeps objects loaded after commit
+    session.expire_on_commit = False
+    item = ClothingItem(user_id=1, description="Blue shirt", category="shirt", colors=["blue"])
+    session.add(item)
+    session.commit()
+    return item
+
+
+@pytest.fixture
+def statements(session):
+    captured = []
+    event.listen(session.bind, "before_cursor_execute", lambda conn, cursor, statement, *args: captured.append(statement))
+    return captured
+
+
+class TestUpdate:
+    """Test targeted UPDATE ... RETURNING"""
+
+    def test_sets_only_changed_columns(self, async_session, item, statements):
+        """Test that unchanged fields are left out of the SET clause and no SELECT follows"""
+        db = async_session
+
+        updated = asyncio.run(BaseRepo(ClothingItem).update(db=db, db_obj=item, obj_in={"description": "Navy shirt", "category": "shirt"}))
+
+        assert updated is item
+        assert item.description == "Navy shirt"
+        assert item.updated_at is not None
+        assert len(statements) == 1
+        set_clause = statements[0].split(" SET ")[1].split(" WHERE ")[0]
+        assert "description" in set_clause and "updated_at" in set_clause
+        assert "category" not in set_clause and "colors" not in set_clause
+
+    def test_no_changes_skips_the_database(self, async_session, item, statements):
+        """Test that an update that changes nothing sends nothing"""
+        db = async_session
+
+        asyncio.run(BaseRepo(ClothingItem).update(db=db, db_obj=item, obj_in={"description": "Blue shirt"}))
+
+        assert statements == []
+        assert db.commits == 0
+
+    def test_optimistic_update_applies_when_unchanged(self, session, async_session, item):
+        """Test that an optimistic update succeeds if nobody else wrote the row"""
+        db = async_session
+
+        asyncio.run(BaseRepo(ClothingItem).update(db=db, db_obj=item, obj_in={"formality_level": 4}, optimistic=True))
+
+        assert session.get(ClothingItem, item.id).formality_level == 4
+
+    def test_optimistic_update_rejects_concurrent_edit(self, session, async_session, item):
+        """Test that a row modified since it was loaded is not overwritten"""
+        db = async_session
+        session.connection().execute(
+            update(ClothingItem).where(ClothingItem.id == item.id).values(description="Edited elsewhere", updated_at=datetime(2026, 2, 1))
+        )
+
+        with pytest.raises(ConcurrentUpdateException):
+            asyncio.run(BaseRepo(ClothingItem).update(db=db, db_obj=item, obj_in={"description": "Mine"}, optimistic=True))
+        assert db.commits == 0
+
+
+class TestGetPage:
+    """Test walking a table page by page"""
+
+    def test_walks_every_row_newest_first(self, session, async_session, items):
+        """Test that pages cover all rows once, ordered by (created_at, id) descending"""
+        pages = _pages(async_session, limit=7)
+
+        ids = [item.id for page in pages for item in page]
+        expected = [item.id for item in session.exec(select(ClothingItem).order_by(ClothingItem.created_at.desc(), ClothingItem.id.desc()))]
+        assert ids == expected
+        assert [len(page) for page in pages] == [7, 7, 7, 4]
+
+    def test_scoped_to_user(self, async_session, items):
+        """Test that user_id limits the pages to that user's rows"""
+        pages = _pages(async_session, limit=4, user_id=2)
+
+        rows = [item for page in pages for item in page]
+        assert {item.user_id for item in rows} == {2}
+        assert len(rows) == 9
+
+    def test_order_by_id(self, async_session, items):
+        """Test seeking on the primary key alone"""
+        pages = _pages(async_session, limit=10, order_by="id")
+
+        assert [item.id for page in pages for item in page] == list(range(25, 0, -1))
+
+    def test_exact_multiple_has_no_trailing_empty_page(self, async_session, items):
+        """Test that the last full page reports no next cursor"""
+        pages = _pages(async_session, limit=25)
+
+        assert len(pages) == 1
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self, items):
+        """Test that a cursor decodes to the values it was built from"""
+        columns = [ClothingItem.created_at, ClothingItem.id]
+        item = ClothingItem(id=7, user_id=1, description="x", category="shirt", created_at=datetime(2026, 1, 1, 12, 30, 0, 123))
+
+        assert decode_cursor(encode_cursor(columns, item), columns) == [item.created_at, 7]
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "eyJrIjpbImlkIl0sInYiOlsxXX0"])
+    def test_rejects_garbage_and_foreign_cursors(self, cursor):
+        """Test that undecodable cursors, or ones built for other columns, are rejected"""
+        with pytest.raises(InvalidCursorException):
+            decode_cursor(cursor, [ClothingItem.created_at, ClothingItem.id])
+
+
+class TestVersionAndDeleteMany:
+    """Test per-user versions and batch deletes"""
+
+    def test_version_moves_on_every_write(self, session, async_session, items):
+        """Test that inserts, updates and deletes each change a user's version"""
+        repo = BaseRepo(ClothingItem)
+        db = async_session
+        session.expire_on_commit = False
+
+        initial = asyncio.run(repo.get_version(db=db, user_id=1))
+        assert initial == (16, datetime(2026, 1, 1, 0, 11))
+
+        asyncio.run(repo.update(db=db, db_obj=items[1], obj_in={"category": "coat"}))
+        updated = asyncio.run(repo.get_version(db=db, user_id=1))
+        assert updated[0] == 16 and updated[1] > initial[1]
+
+        deleted = asyncio.run(repo.delete_many(db=db, ids=[items[1].id, items[3].id, 999], user_id=1))
+        assert deleted == [items[1].id]
+        assert asyncio.run(repo.get_version(db=db, user_id=1))[0] == 15
+        assert asyncio.run(repo.get_version(db=db, user_id=3)) == (0, None)
+
+    def test_get_many_by_ids_scoped_to_user(self, async_session, items):
+        """Test that ids belonging to another user are not returned"""
+        repo = BaseRepo(ClothingItem)
+        db = async_session
+
+        found = asyncio.run(repo.get_many_by_ids(db=db, ids=[items[1].id, items[3].id], user_id=1))
+
+        assert [item.id for item in found] == [items[1].id]
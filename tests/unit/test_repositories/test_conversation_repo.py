@@ -0,0 +1,69 @@
+"""
+Unit tests for conversation history reads
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions.conversation import ConversationNotFoundException
+from app.models.conversation import Conversation, ConversationMessage
+from app.repositories.conversation_repo import conversation_message_repo
+from app.services.conversation_service import conversation_service
+
+
+@pytest.fixture
+def history(session):
+    start = datetime(2026, 1, 1)
+    session.add_all([Conversation(id=1, user_id=1, chat_name="first"), Conversation(id=2, user_id=2, chat_name="other")])
+    # Pairs share a timestamp so the id tie-breaker is exercised; conversation 2 is interleaved.
+    # Ids are explicit because SQLite cannot autoincrement the (id, created_at) primary key
+    session.add_all([
+        ConversationMessage(id=i + 1, conversation_id=1 if i % 4 else 2, role="user", content={"i": i}, created_at=start + timedelta(seconds=i // 2))
+        for i in range(30)
+    ])
+    session.commit()
+
+
+class TestMessagePages:
+    """Test newest-first keyset pages of a conversation's messages"""
+
+    def test_pages_cover_conversation_newest_first(self, async_session, history):
+        """Test that following cursors returns each of the conversation's messages once, newest first"""
+        db = async_session
+        cursor, seen = None, []
+        while True:
+            page, cursor = asyncio.run(conversation_message_repo.get_page_for_conversation(db=db, conversation_id=1, limit=4, cursor=cursor))
+            seen.extend(message.content["i"] for message in page)
+            if cursor is None:
+                break
+
+        assert seen == sorted((i for i in range(30) if i % 4), reverse=True)
+
+    def test_other_users_conversation_is_not_found(self, async_session, history):
+        """Test that a conversation owned by someone else reads as missing"""
+        db = async_session
+
+        with pytest.raises(ConversationNotFoundException):
+            asyncio.run(conversation_service.list_messages(db=db, user_id=1, conversation_id=2, limit=10, cursor=None))
+
+
+class TestAppendText:
+    """Test the server-side append used to checkpoint streamed replies"""
+
+    def test_appends_in_database_within_one_partition(self):
+        """Test that the update concatenates onto the stored text and pins the partition key"""
+        statements = []
+
+        class CapturingDB:
+            async def exec(self, statement):
+                statements.append(statement)
+
+        message = ConversationMessage(id=3, conversation_id=1, role="ai", content={}, created_at=datetime(2026, 1, 1))
+        asyncio.run(conversation_message_repo.append_text(db=CapturingDB(), message=message, text="navy ", status="complete"))
+        compiled = statements[0].compile(dialect=postgresql.dialect())
+
+        assert "conversation_message.content || jsonb_build_object(" in str(compiled)
+        assert "coalesce((conversation_message.content ->> " in str(compiled)
+        assert "conversation_message.created_at = " in str(compiled)
+        assert {"navy ", "status", "complete"} <= set(compiled.params.values())
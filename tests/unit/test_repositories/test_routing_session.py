@@ -0,0 +1,193 @@
+"""
+Unit tests for read/write routing between the primary and replicas
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from sqlalchemy.util import greenlet_spawn
+from sqlmodel import select, update
+
+from app import db as app_db
+from app.db import RecentWrites, RoutingAsyncSession, RoutingSession, engine, unit_of_work, use_primary
+from app.models.user import User
+from app.models.session import Session as SessionModel
+
+
+class FakeRedis:
+    """The SET PX / MGET subset of Redis the recent write markers use, shared like the real server"""
+
+    def __init__(self):
+        self.expiry: dict[str, float] = {}
+        self.lookups: list[list[str]] = []
+        self.down = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def mget(self, keys):
+        self.lookups.append(sorted(keys))
+        if self.down:
+            raise ConnectionError("redis is down")
+        now = time.monotonic()
+        return ["1" if self.expiry.get(key, 0) > now else None for key in keys]
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, px):
+        self.commands.append((key, px))
+
+    async def execute(self):
+        for key, px in self.commands:
+            self.redis.expiry[key] = time.monotonic() + px / 1000
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    fakes = [SimpleNamespace(sync_engine=object()), SimpleNamespace(sync_engine=object())]
+    monkeypatch.setattr(app_db, "replica_engines", fakes)
+    monkeypatch.setattr(app_db, "recent_writes", RecentWrites(window=5, redis=FakeRedis()))
+    return [fake.sync_engine for fake in fakes]
+
+
+def bind(session: RoutingSession, clause):
+    """Routes `clause` the way a statement run through AsyncSession is, inside its greenlet"""
+    return asyncio.run(greenlet_spawn(session.get_bind, clause=clause))
+
+
+def in_worker(markers: RecentWrites, monkeypatch):
+    """Makes `markers` the read-your-writes markers of the worker the next statements run in"""
+    monkeypatch.setattr(app_db, "recent_writes", markers)
+
+
+class TestRoutingSession:
+    """Test which engine each statement is bound to"""
+
+    def test_without_replicas_everything_uses_primary(self, monkeypatch):
+        """Test that an empty replica list keeps reads on the primary"""
+        monkeypatch.setattr(app_db, "replica_engines", [])
+
+        assert RoutingSession().get_bind(clause=select(User)) is engine.sync_engine
+
+    def test_reads_round_robin_across_replicas(self, replicas):
+        """Test that plain SELECTs alternate between replicas"""
+        session = RoutingSession()
+
+        binds = [bind(session, select(User)) for _ in range(4)]
+
+        assert set(binds) == set(replicas)
+        assert binds[0] is not binds[1]
+
+    def test_writes_and_locking_reads_use_primary(self, replicas):
+        """Test that DML and SELECT ... FOR UPDATE go to the primary"""
+        assert bind(RoutingSession(), update(User).values(is_active=False)) is engine.sync_engine
+        assert bind(RoutingSession(), select(User).with_for_update()) is engine.sync_engine
+
+    def test_reads_after_write_stay_on_primary(self, replicas):
+        """Test that a session that has written keeps reading from the primary"""
+        session = RoutingSession()
+        bind(session, update(SessionModel).values(user_agent="x"))
+
+        assert bind(session, select(User)) is engine.sync_engine
+
+    def test_committed_tables_read_from_primary_in_every_worker(self, replicas, monkeypatch):
+        """Test that a commit in one worker sends reads of only the written tables to the primary in another"""
+        redis = FakeRedis()
+        writer_markers, reader_markers = RecentWrites(window=5, redis=redis), RecentWrites(window=5, redis=redis)
+
+        in_worker(writer_markers, monkeypatch)
+        writer = RoutingAsyncSession()
+        bind(writer.sync_session, update(User).values(is_active=False))
+        asyncio.run(writer.commit())
+        in_worker(reader_markers, monkeypatch)
+        reader = RoutingSession()
+
+        assert bind(reader, select(User)) is engine.sync_engine
+        assert bind(reader, select(SessionModel)) in replicas
+        assert bind(writer.sync_session, select(User)) is engine.sync_engine
+        assert "written_tables" not in writer.info
+
+    def test_markers_looked_up_lazily_per_table(self, replicas, monkeypatch):
+        """Test that Redis is only asked about tables a replica-bound read touches, once per session"""
+        redis = FakeRedis()
+        in_worker(RecentWrites(window=5, redis=redis), monkeypatch)
+        session = RoutingSession()
+        assert redis.lookups == []
+
+        bind(session, select(User))
+        bind(session, select(User))
+        bind(session, select(User, SessionModel).join(SessionModel))
+        bind(session, update(User).values(is_active=False))
+
+        assert redis.lookups == [["recent_write:user"], ["recent_write:session"]]
+
+    def test_primary_reads_skip_the_lookup(self, replicas, monkeypatch):
+        """Test that reads already bound for the primary never ask Redis"""
+        redis = FakeRedis()
+        in_worker(RecentWrites(window=5, redis=redis), monkeypatch)
+        session = RoutingSession()
+
+        with use_primary(session):
+            bind(session, select(User))
+
+        assert redis.lookups == []
+
+    def test_markers_expire_after_window(self, replicas, monkeypatch):
+        """Test that reads return to the replicas once the window has passed"""
+        markers = RecentWrites(window=0.05, redis=FakeRedis())
+        in_worker(markers, monkeypatch)
+        asyncio.run(markers.mark({User.__table__.name}))
+
+        assert bind(RoutingSession(), select(User)) is engine.sync_engine
+        time.sleep(0.06)
+        assert bind(RoutingSession(), select(User)) in replicas
+
+    def test_unreachable_markers_read_from_primary(self, replicas, monkeypatch):
+        """Test that without Redis every table is treated as just written"""
+        redis = FakeRedis()
+        redis.down = True
+        in_worker(RecentWrites(window=5, redis=redis), monkeypatch)
+
+        assert bind(RoutingSession(), select(SessionModel)) is engine.sync_engine
+
+    def test_rollback_forgets_writes(self, replicas):
+        """Test that rolled back writes do not pin later reads to the primary"""
+        session = RoutingSession()
+        bind(session, update(User).values(is_active=False))
+        app_db._forget_rolled_back_writes(session)
+        app_db._remember_committed_writes(session)
+
+        assert bind(session, select(User)) in replicas
+
+    def test_use_primary_block_reads_from_primary(self, replicas):
+        """Test that reads inside use_primary go to the primary and later ones to the replicas again"""
+        session = RoutingSession()
+
+        with use_primary(session):
+            assert bind(session, select(User)) is engine.sync_engine
+
+        assert bind(session, select(User)) in replicas
+        assert "use_primary" not in session.info
+
+    def test_unit_of_work_reads_before_write_from_primary(self, replicas):
+        """Test that a read at the start of a write transaction is not served by a replica"""
+        db = RoutingAsyncSession()
+
+        async def run():
+            async with unit_of_work(db):
+                read_bind = await greenlet_spawn(db.sync_session.get_bind, clause=select(User))
+                await greenlet_spawn(db.sync_session.get_bind, clause=update(User).values(is_active=False))
+            return read_bind
+
+        assert asyncio.run(run()) is engine.sync_engine
+        assert "use_primary" not in db.info
@@ -0,0 +1,130 @@
+"""
+Unit tests for the unit of work transaction helper
+"""
+import asyncio
+import pytest
+from sqlmodel import select
+
+from app.db import on_commit, unit_of_work
+from app.models.wardrobe import ClothingItem
+
+
+def _item(description):
+    return ClothingItem(user_id=1, description=description, category="shirt")
+
+
+def _descriptions(session):
+    return sorted(item.description for item in session.exec(select(ClothingItem)))
+
+
+class TestUnitOfWork:
+    """Test commit, rollback and savepoint behaviour"""
+
+    def test_commits_once_on_success(self, session, async_session):
+        """Test that all work in the block is committed together"""
+        db = async_session
+
+        async def run():
+            async with unit_of_work(db):
+                session.add(_item("a"))
+                session.add(_item("b"))
+
+        asyncio.run(run())
+
+        assert db.commits == 1
+        assert _descriptions(session) == ["a", "b"]
+
+    def test_rolls_back_on_error(self, session, async_session):
+        """Test that an exception discards everything written in the block"""
+        db = async_session
+
+        async def run():
+            async with unit_of_work(db):
+                session.add(_item("a"))
+                session.flush()
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+        assert db.commits == 0
+        assert _descriptions(session) == []
+
+    def test_nested_failure_only_rolls_back_savepoint(self, session, async_session):
+        """Test that a failed inner block can be caught without losing the outer work"""
+        db = async_session
+
+        async def run():
+            async with unit_of_work(db):
+                session.add(_item("outer"))
+                try:
+                    async with unit_of_work(db):
+                        session.add(_item("inner"))
+                        session.flush()
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+
+        asyncio.run(run())
+
+        assert db.commits == 1
+        assert _descriptions(session) == ["outer"]
+
+
+class TestOnCommit:
+    """Test callbacks deferred until commit"""
+
+    def test_runs_after_commit(self, async_session):
+        """Test that callbacks wait for the outermost commit"""
+        db = async_session
+        calls = []
+
+        async def callback():
+            calls.append(db.commits)
+
+        async def run():
+            async with unit_of_work(db):
+                async with unit_of_work(db):
+                    await on_commit(db, callback)
+                assert calls == []
+
+        asyncio.run(run())
+
+        assert calls == [1]
+
+    def test_dropped_on_rollback(self, async_session):
+        """Test that callbacks registered in a rolled back block never run"""
+        db = async_session
+        calls = []
+
+        async def callback():
+            calls.append("called")
+
+        async def run():
+            async with unit_of_work(db):
+                try:
+                    async with unit_of_work(db):
+                        await on_commit(db, callback)
+                        raise RuntimeError("boom")
+                except RuntimeError:
+                    pass
+            async with unit_of_work(db):
+                await on_commit(db, callback)
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+        assert calls == []
+
+    def test_runs_immediately_outside_unit_of_work(self, async_session):
+        """Test that there is nothing to wait for without an enclosing transaction"""
+        db = async_session
+        calls = []
+
+        async def callback():
+            calls.append("called")
+
+        asyncio.run(on_commit(db, callback))
+
+        assert calls == ["called"]
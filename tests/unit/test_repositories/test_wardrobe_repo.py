@@ -0,0 +1,167 @@
+"""
+Unit tests for JSONB filters and outfit items in the wardrobe repositories
+"""
+import asyncio
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions.wardrobe import ClothingItemNotFoundException
+from app.models.wardrobe import ClothingItem
+from app.repositories.user_repo import user_repo
+from app.repositories.wardrobe_repo import clothing_item_repo, outfit_repo, shopping_recommendation_repo
+
+
+class CapturingDB:
+    """Records the statement a repository would send and returns no rows"""
+
+    def __init__(self):
+        self.statement = None
+
+    async def exec(self, statement, params=None):
+        self.statement = statement
+        return self
+
+    def all(self):
+        return []
+
+    def sql(self) -> str:
+        return str(self.statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def db():
+    return CapturingDB()
+
+
+class TestJsonFilters:
+    """Test that JSON filtering compiles to indexable JSONB operators"""
+
+    def test_all_colors_uses_containment(self, db):
+        """Test that matching every color uses @> scoped to the user"""
+        asyncio.run(clothing_item_repo.get_by_colors(db=db, user_id=1, colors=["blue", "white"]))
+
+        sql = db.sql()
+        assert "clothingitem.colors @> " in sql
+        assert "clothingitem.user_id = " in sql
+
+    def test_any_color_uses_key_existence(self, db):
+        """Test that matching any color uses ?|"""
+        asyncio.run(clothing_item_repo.get_by_colors(db=db, user_id=1, colors=["blue", "navy"], match_all=False))
+
+        assert "clothingitem.colors ?| ARRAY[" in db.sql()
+
+    def test_recommendations_by_item(self, db):
+        """Test reverse lookups by item id through containment"""
+        asyncio.run(shopping_recommendation_repo.get_complementing_item(db=db, user_id=1, item_id=7))
+        assert "shopping_recommendation.complementary_items @> " in db.sql()
+
+    def test_style_preferences(self, db):
+        """Test user filtering on preference values"""
+        asyncio.run(user_repo.find_by_style_preferences(db=db, preferences={"style": "casual"}))
+
+        assert '"user".style_preferences @> ' in db.sql()
+
+    def test_has_key(self, db):
+        """Test top-level key existence"""
+        asyncio.run(user_repo.find_by_json(db=db, field_name="sizing_info", has_key="shoe"))
+
+        assert '"user".sizing_info ? ' in db.sql()
+
+
+@pytest.fixture
+def wardrobe(session):
+    session.expire_on_commit = False
+    items = [ClothingItem(user_id=1 if i < 6 else 2, description=f"item {i}", category="shirt") for i in range(8)]
+    session.add_all(items)
+    session.commit()
+    return items
+
+
+class TestOutfitItems:
+    """Test outfits stored through the outfit_item association table"""
+
+    def test_create_keeps_item_order(self, async_session, wardrobe):
+        """Test that items come back in the order they were given, without duplicates"""
+        db = async_session
+        ids = [wardrobe[3].id, wardrobe[0].id, wardrobe[3].id, wardrobe[1].id]
+
+        outfit = asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "name": "Work", "clothing_items": ids}))
+
+        assert outfit.name == "Work"
+        assert [item.id for item in outfit.clothing_items] == [wardrobe[3].id, wardrobe[0].id, wardrobe[1].id]
+
+    def test_rejects_other_users_items(self, async_session, wardrobe):
+        """Test that an outfit cannot reference another user's item"""
+        db = async_session
+
+        with pytest.raises(ClothingItemNotFoundException):
+            asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [wardrobe[0].id, wardrobe[7].id]}))
+
+    def test_create_many_links_all_items(self, async_session, wardrobe):
+        """Test that a batch of outfits comes back with each outfit's own items in order"""
+        db = async_session
+
+        outfits = asyncio.run(outfit_repo.create_many(db=db, objs_in=[
+            {"user_id": 1, "name": "a", "clothing_items": [wardrobe[2].id, wardrobe[0].id]},
+            {"user_id": 1, "name": "b", "clothing_items": []},
+            {"user_id": 1, "name": "c", "clothing_items": [wardrobe[5].id]},
+        ]))
+
+        assert [outfit.name for outfit in outfits] == ["a", "b", "c"]
+        assert [[item.id for item in outfit.clothing_items] for outfit in outfits] == [[wardrobe[2].id, wardrobe[0].id], [], [wardrobe[5].id]]
+
+    def test_update_replaces_items(self, async_session, wardrobe):
+        """Test that updating the item list rewrites the links and leaves other fields alone"""
+        db = async_session
+        outfit = asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "name": "Work", "clothing_items": [wardrobe[0].id, wardrobe[1].id]}))
+
+        outfit = asyncio.run(outfit_repo.update(db=db, db_obj=outfit, obj_in={"clothing_items": [wardrobe[2].id]}))
+
+        assert outfit.name == "Work"
+        assert [item.id for item in outfit.clothing_items] == [wardrobe[2].id]
+
+    def test_loads_many_outfits_in_constant_queries(self, session, async_session, wardrobe):
+        """Test that loading outfits with their items does not issue a query per outfit"""
+        db = async_session
+        outfits = [
+            asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [item.id for item in wardrobe[i:i + 3]]}))
+            for i in range(4)
+        ]
+        session.commit()
+        session.expunge_all()
+
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(session.bind, "before_cursor_execute", record)
+        loaded = asyncio.run(outfit_repo.get_many_with_items(db=db, ids=[outfit.id for outfit in outfits]))
+        counts = [len(outfit.clothing_items) for outfit in loaded]
+        event.remove(session.bind, "before_cursor_execute", record)
+
+        assert counts == [3, 3, 3, 3]
+        assert len(statements) == 2
+
+    def test_outfits_containing_item(self, async_session, wardrobe):
+        """Test the reverse lookup from an item to the user's outfits that use it"""
+        db = async_session
+        first = asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [wardrobe[0].id, wardrobe[1].id]}))
+        asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [wardrobe[2].id]}))
+        third = asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [wardrobe[1].id]}))
+
+        outfits = asyncio.run(outfit_repo.get_containing_item(db=db, user_id=1, item_id=wardrobe[1].id))
+
+        assert [outfit.id for outfit in outfits] == [first.id, third.id]
+        assert asyncio.run(outfit_repo.get_containing_item(db=db, user_id=2, item_id=wardrobe[1].id)) == []
+
+    def test_item_ratings_average_rated_outfits(self, async_session, wardrobe):
+        """Test the per-item mean rating that feeds outfit suggestions, skipping unrated outfits"""
+        db = async_session
+        asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "user_rating": 5, "clothing_items": [wardrobe[0].id, wardrobe[1].id]}))
+        asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "user_rating": 2, "clothing_items": [wardrobe[1].id]}))
+        asyncio.run(outfit_repo.create(db=db, obj_in={"user_id": 1, "clothing_items": [wardrobe[2].id]}))
+
+        ratings = asyncio.run(outfit_repo.get_item_ratings(db=db, user_id=1))
+
+        assert ratings == {wardrobe[0].id: 5.0, wardrobe[1].id: 3.5}
+        assert asyncio.run(outfit_repo.get_item_ratings(db=db, user_id=2)) == {}
@@ -0,0 +1,352 @@
+"""
+Unit tests for refresh token rotation and replay detection
+"""
+import asyncio
+import contextlib
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from app.core.config import settings
+from app.core.exceptions.session import InvalidSessionException
+from app.repositories import session_store
+from app.repositories.session_repo import session_repo
+from app.repositories.session_store import RedisSessionStore, SessionAuditWriter, SessionStore, SqlSessionStore
+from app.schemas.session import SessionInfo
+from app.services.auth_service import AuthService
+
+
+class FakeSession:
+    """Just enough of AsyncSession for unit_of_work"""
+
+    def __init__(self):
+        self.info = {}
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Keeps sessions in a dict and, like both real stores, swaps a session to its new id
+    in one step that re-checks the old id, so only one of two racing rotations finds it
+    """
+
+    def __init__(self):
+        self.sessions: dict[uuid.UUID, SessionInfo] = {}
+        self.successors: dict[uuid.UUID, tuple[uuid.UUID, datetime]] = {}
+
+    async def create(self, *, db, user_id, email, is_active, expires_at, user_agent, ip_address):
+        session = SessionInfo(id=uuid.uuid4(), user_id=user_id, email=email, is_active=is_active, expires_at=expires_at)
+        self.sessions[session.id] = session
+        return session
+
+    async def get(self, *, db, id):
+        return self.sessions.get(id)
+
+    async def rotate(self, *, db, id, new_id, expires_at, user_agent, ip_address):
+        # Let a concurrent rotation of the same session reach this point before either swaps
+        await asyncio.sleep(0)
+        session = self.sessions.pop(id, None)
+        if session is None:
+            return None
+        rotated = session.model_copy(update={"id": new_id, "expires_at": expires_at})
+        self.sessions[new_id] = rotated
+        self.successors[id] = (new_id, datetime.utcnow())
+        return rotated
+
+    async def revoke_successor_of(self, *, db, previous_id, rotated_before):
+        successor, rotated_at = self.successors.get(previous_id, (None, None))
+        if successor is None or rotated_at >= rotated_before:
+            return None
+        del self.successors[previous_id]
+        return self.sessions.pop(successor, None)
+
+    async def delete(self, *, db, id):
+        self.sessions.pop(id, None)
+
+    async def delete_all_for_user(self, *, db, user_id):
+        self.sessions = {id: session for id, session in self.sessions.items() if session.user_id != user_id}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = MemorySessionStore()
+    monkeypatch.setattr(session_repo, "store", store)
+    return store
+
+
+@pytest.fixture
+def http_request():
+    return SimpleNamespace(headers={"user-agent": "pytest"}, client=SimpleNamespace(host="127.0.0.1"))
+
+
+def login(store: MemorySessionStore) -> SessionInfo:
+    return asyncio.run(store.create(
+        db=None, user_id=1, email="test@example.com", is_active=True,
+        expires_at=datetime.utcnow() + timedelta(days=1), user_agent=None, ip_address=None,
+    ))
+
+
+class TestRefreshRotation:
+    """Test that a refresh token can be exchanged exactly once"""
+
+    def test_rotation_replaces_session(self, store, http_request):
+        """Test that a refresh moves the session to a new id and issues tokens for it"""
+        session = login(store)
+
+        access_token, refresh_token = asyncio.run(AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id))
+
+        assert access_token and refresh_token
+        assert list(store.sessions) == [store.successors[session.id][0]]
+
+    def test_reused_token_revokes_successor_and_is_rejected(self, store, http_request, monkeypatch):
+        """Test that replaying a rotated token after the grace window ends the session it was rotated into"""
+        monkeypatch.setattr(settings, "SESSION_REUSE_GRACE_SECONDS", 0.0)
+        session = login(store)
+        asyncio.run(AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id))
+
+        with pytest.raises(InvalidSessionException):
+            asyncio.run(AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id))
+
+        assert store.sessions == {}
+
+    def test_reuse_within_grace_window_is_rejected_without_revoking(self, store, http_request):
+        """Test that a token presented again right after its rotation is a double submit, not a replay"""
+        session = login(store)
+        asyncio.run(AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id))
+        successor = store.successors[session.id][0]
+
+        with pytest.raises(InvalidSessionException):
+            asyncio.run(AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id))
+
+        assert list(store.sessions) == [successor]
+
+    def test_concurrent_rotations_have_one_winner(self, store, http_request):
+        """Test that of two refreshes racing on the same token one gets tokens for a session that stays valid"""
+        session = login(store)
+
+        async def race():
+            return await asyncio.gather(
+                AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id),
+                AuthService().refresh(db=FakeSession(), request=http_request, session_id=session.id),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(race())
+
+        assert sum(isinstance(result, tuple) for result in results) == 1
+        assert sum(isinstance(result, InvalidSessionException) for result in results) == 1
+        assert list(store.sessions) == [store.successors[session.id][0]]
+
+
+class TestSqlSessionStore:
+    """Test the statements that make rotation and replay detection atomic in Postgres"""
+
+    def capture(self, call) -> str:
+        captured = []
+
+        class CapturingDB:
+            async def exec(self, statement):
+                captured.append(statement)
+                return self
+
+            def first(self):
+                return None
+
+        asyncio.run(call(CapturingDB()))
+        return str(captured[0].compile(dialect=postgresql.dialect()))
+
+    def test_rotate_swaps_only_the_presented_id(self):
+        """Test that rotation is one UPDATE keyed on the old id, so a second racer matches no row"""
+        old_id = uuid.uuid4()
+        sql = self.capture(lambda db: SqlSessionStore().rotate(
+            db=db, id=old_id, new_id=uuid.uuid4(), expires_at=datetime.utcnow(), user_agent=None, ip_address=None,
+        ))
+
+        assert sql.startswith("UPDATE session SET")
+        assert "previous_id=session.id" in sql
+        assert "WHERE session.id = %(id_1)s::UUID AND session.expires_at > %(expires_at_1)s" in sql
+        assert "RETURNING session.id" in sql
+
+    def test_revoke_successor_deletes_by_previous_id(self):
+        """Test that a replayed id deletes whichever session it was rotated into"""
+        sql = self.capture(lambda db: SqlSessionStore().revoke_successor_of(db=db, previous_id=uuid.uuid4(), rotated_before=datetime.utcnow()))
+
+        assert sql.startswith("DELETE FROM session")
+        assert "WHERE session.previous_id = %(previous_id_1)s::UUID AND session.updated_at < %(updated_at_1)s" in sql
+
+
+class RecordingStore:
+    """Stands in for the SqlSessionStore behind the audit writer, failing on request"""
+
+    def __init__(self, fail_on: str | None = None):
+        self.calls: list[tuple[str, dict]] = []
+        self.fail_on = fail_on
+
+    async def _record(self, operation: str, kwargs: dict):
+        if operation == self.fail_on:
+            raise RuntimeError("database unavailable")
+        self.calls.append((operation, kwargs))
+
+    async def create(self, *, db, **kwargs):
+        await self._record("create", kwargs)
+
+    async def rotate(self, *, db, **kwargs):
+        await self._record("rotate", kwargs)
+
+    async def delete(self, *, db, **kwargs):
+        await self._record("delete", kwargs)
+
+    async def delete_all_for_user(self, *, db, **kwargs):
+        await self._record("delete_all_for_user", kwargs)
+
+
+@pytest.fixture
+def redis_store(monkeypatch):
+    """A RedisSessionStore on an in-memory Redis that runs the Lua scripts"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    monkeypatch.setattr(session_store, "redis_client", fakeredis.aioredis.FakeRedis(decode_responses=True))
+    return RedisSessionStore(audit=SessionAuditWriter(RecordingStore(), max_size=10))
+
+
+def create_in(store: SessionStore, *, expires_at: datetime | None = None):
+    return store.create(
+        db=None, user_id=1, email="test@example.com", is_active=True,
+        expires_at=expires_at or datetime.utcnow() + timedelta(days=1), user_agent=None, ip_address=None,
+    )
+
+
+def rotate_in(store: SessionStore, id: uuid.UUID, new_id: uuid.UUID):
+    return store.rotate(db=None, id=id, new_id=new_id, expires_at=datetime.utcnow() + timedelta(days=1), user_agent="pytest", ip_address=None)
+
+
+class TestRedisSessionStore:
+    """Test that the Redis scripts give rotation and replay detection the semantics of the SQL statements"""
+
+    def test_rotate_swaps_only_the_presented_id(self, redis_store):
+        """Test that rotation moves the session to the new id, so a second racer finds nothing"""
+        async def scenario():
+            session = await create_in(redis_store)
+            new_id, other_id = uuid.uuid4(), uuid.uuid4()
+            rotated = await rotate_in(redis_store, session.id, new_id)
+            raced = await rotate_in(redis_store, session.id, other_id)
+            return session, rotated, raced, new_id, other_id
+
+        session, rotated, raced, new_id, other_id = asyncio.run(scenario())
+
+        assert rotated.id == new_id and rotated.user_id == 1 and rotated.user_agent == "pytest"
+        assert raced is None
+        assert asyncio.run(redis_store.get(db=None, id=session.id)) is None
+        assert asyncio.run(redis_store.get(db=None, id=other_id)) is None
+        assert asyncio.run(session_store.redis_client.smembers("user:1:sessions")) == {str(new_id)}
+
+    def test_expired_session_is_not_rotated(self, redis_store):
+        """Test that a session past its expires_at cannot be rotated"""
+        async def scenario():
+            session = await create_in(redis_store, expires_at=datetime.utcnow() - timedelta(seconds=1))
+            return await rotate_in(redis_store, session.id, uuid.uuid4())
+
+        assert asyncio.run(scenario()) is None
+
+    def test_revoke_successor_deletes_by_previous_id(self, redis_store):
+        """Test that a replayed id deletes whichever session it was rotated into"""
+        async def scenario():
+            session = await create_in(redis_store)
+            new_id = uuid.uuid4()
+            await rotate_in(redis_store, session.id, new_id)
+            revoked = await redis_store.revoke_successor_of(db=None, previous_id=session.id, rotated_before=datetime.utcnow() + timedelta(seconds=1))
+            return revoked, new_id, await redis_store.get(db=None, id=new_id)
+
+        revoked, new_id, remaining = asyncio.run(scenario())
+
+        assert revoked.id == new_id
+        assert remaining is None
+        assert asyncio.run(session_store.redis_client.smembers("user:1:sessions")) == set()
+
+    def test_revoke_successor_spares_recent_rotation(self, redis_store):
+        """Test that a successor rotated within the grace window is left alone"""
+        async def scenario():
+            session = await create_in(redis_store)
+            new_id = uuid.uuid4()
+            await rotate_in(redis_store, session.id, new_id)
+            revoked = await redis_store.revoke_successor_of(db=None, previous_id=session.id, rotated_before=datetime.utcnow() - timedelta(seconds=10))
+            return revoked, await redis_store.get(db=None, id=new_id)
+
+        revoked, remaining = asyncio.run(scenario())
+
+        assert revoked is None
+        assert remaining is not None
+
+    def test_changes_are_submitted_for_audit(self, redis_store):
+        """Test that every change is queued for the audit trail in the order it happened"""
+        async def scenario():
+            session = await create_in(redis_store)
+            await rotate_in(redis_store, session.id, uuid.uuid4())
+            await redis_store.delete_all_for_user(db=None, user_id=1)
+
+        asyncio.run(scenario())
+
+        queued = [redis_store.audit._queue.get_nowait()[0] for _ in range(redis_store.audit._queue.qsize())]
+        assert queued == ["create", "rotate", "delete_all_for_user"]
+
+
+class TestSessionAuditWriter:
+    """Test replaying queued session changes into the SQL store"""
+
+    @pytest.fixture(autouse=True)
+    def db(self, monkeypatch):
+        @contextlib.asynccontextmanager
+        async def fake_async_session():
+            yield FakeSession()
+
+        monkeypatch.setattr(session_store, "async_session", fake_async_session)
+
+    def drain(self, writer: SessionAuditWriter):
+        async def run():
+            writer.start()
+            await writer._queue.join()
+            await writer.stop()
+
+        asyncio.run(run())
+
+    def test_entries_are_applied_in_order(self):
+        """Test that each queued change reaches the store once, in submission order"""
+        store = RecordingStore()
+        writer = SessionAuditWriter(store, max_size=10)
+        old_id, new_id = uuid.uuid4(), uuid.uuid4()
+
+        writer.submit("create", id=old_id, user_id=1)
+        writer.submit("rotate", id=old_id, new_id=new_id)
+        writer.submit("delete", id=new_id)
+        self.drain(writer)
+
+        assert store.calls == [("create", {"id": old_id, "user_id": 1}), ("rotate", {"id": old_id, "new_id": new_id}), ("delete", {"id": new_id})]
+
+    def test_failed_entry_does_not_stop_the_writer(self):
+        """Test that an entry the store rejects is logged and the next one still applied"""
+        store = RecordingStore(fail_on="rotate")
+        writer = SessionAuditWriter(store, max_size=10)
+
+        writer.submit("rotate", id=uuid.uuid4(), new_id=uuid.uuid4())
+        writer.submit("delete_all_for_user", user_id=1)
+        self.drain(writer)
+
+        assert store.calls == [("delete_all_for_user", {"user_id": 1})]
+
+    def test_full_queue_drops_entries(self):
+        """Test that submitting to a full queue drops the entry instead of blocking"""
+        store = RecordingStore()
+        writer = SessionAuditWriter(store, max_size=1)
+        session_id = uuid.uuid4()
+
+        writer.submit("delete", id=session_id)
+        writer.submit("delete_all_for_user", user_id=1)
+        self.drain(writer)
+
+        assert store.calls == [("delete", {"id": session_id})]
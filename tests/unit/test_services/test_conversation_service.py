@@ -0,0 +1,140 @@
+"""
+Unit tests for streaming AI stylist replies over Server-Sent Events
+"""
+import asyncio
+import json
+import pytest
+from contextlib import asynccontextmanager
+from app.core.config import settings
+from app.core.enums import MessageRole
+from app.models.conversation import ConversationMessage
+from app.services import conversation_service as conversation_service_module
+from app.services.conversation_service import ConversationService
+from app.services.stylist_service import Stylist, StubStylist
+
+
+class FakeSession:
+    """Just enough of AsyncSession for unit_of_work"""
+
+    def __init__(self):
+        self.info = {}
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeMessageRepo:
+    """Keeps messages in memory and records every append to a reply"""
+
+    def __init__(self):
+        self.messages: dict[int, ConversationMessage] = {}
+        self.appends: list[tuple[str, str | None]] = []
+
+    async def create(self, *, db, obj_in):
+        message = ConversationMessage(id=len(self.messages) + 1, **obj_in)
+        self.messages[message.id] = message
+        return message
+
+    async def append_text(self, *, db, message, text, status=None):
+        self.appends.append((text, status))
+        content = dict(message.content)
+        content["text"] += text
+        if status is not None:
+            content["status"] = status
+        message.content = content
+
+
+class FailingStylist(Stylist):
+    """Produces two chunks, then fails"""
+
+    async def stream(self, *, conversation_id, content):
+        yield "Try "
+        yield "navy "
+        raise RuntimeError("model unavailable")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    @asynccontextmanager
+    async def fake_async_session():
+        yield FakeSession()
+
+    monkeypatch.setattr(conversation_service_module, "async_session", fake_async_session)
+    monkeypatch.setattr(settings, "CONVERSATION_STREAM_CHECKPOINT_CHUNKS", 3)
+    service = ConversationService()
+    service.message_repo = FakeMessageRepo()
+    service.stylist = StubStylist()
+    return service
+
+
+def parse(event: bytes) -> tuple[str, dict]:
+    name, data = event.decode().rstrip("\n").split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+def collect(stream) -> list[tuple[str, dict]]:
+    async def run():
+        return [parse(event) async for event in stream]
+    return asyncio.run(run())
+
+
+class TestStubStylist:
+    """Test the deterministic local stylist"""
+
+    def test_same_message_same_chunks(self):
+        """Test that replies are reproducible and chunks join back into the reply"""
+        async def chunks():
+            return [chunk async for chunk in StubStylist().stream(conversation_id=1, content={"text": "a wedding"})]
+
+        first, second = asyncio.run(chunks()), asyncio.run(chunks())
+
+        assert first == second
+        assert "".join(first) == StubStylist.reply({"text": "a wedding"})
+        assert len(first) > 3
+
+
+class TestStreamReply:
+    """Test event framing and incremental persistence of streamed replies"""
+
+    def test_streams_chunks_and_checkpoints(self, service):
+        """Test that every chunk is sent as it comes and the reply is stored a few chunks at a time"""
+        content = {"text": "a job interview"}
+        expected = StubStylist.reply(content)
+
+        events = collect(service.stream_reply(conversation_id=7, content=content))
+
+        assert events[0] == ("start", {"message_id": 1})
+        chunks = [data["text"] for name, data in events if name == "chunk"]
+        assert "".join(chunks) == expected
+        assert events[-1] == ("done", {"message_id": 1, "chunks": len(chunks)})
+
+        reply = service.message_repo.messages[1]
+        assert reply.role == MessageRole.AI and reply.conversation_id == 7
+        assert reply.content == {"text": expected, "status": "complete"}
+        # One append per 3 chunks plus the final one, which also sets the status
+        assert len(service.message_repo.appends) == len(chunks) // 3 + 1
+        assert all(status is None for _, status in service.message_repo.appends[:-1])
+
+    def test_failed_generation_keeps_partial_reply(self, service):
+        """Test that a stylist error ends the stream with an error event and a failed reply"""
+        service.stylist = FailingStylist()
+
+        events = collect(service.stream_reply(conversation_id=7, content={"text": "x"}))
+
+        assert [name for name, _ in events] == ["start", "chunk", "chunk", "error"]
+        assert service.message_repo.messages[1].content == {"text": "Try navy ", "status": "failed"}
+
+    def test_disconnect_stores_reply_so_far(self, service):
+        """Test that closing the stream mid-reply stores what was sent, marked interrupted"""
+        async def read_two_chunks():
+            stream = service.stream_reply(conversation_id=7, content={"text": "brunch"})
+            received = [await anext(stream) for _ in range(3)]
+            await stream.aclose()
+            return received
+
+        received = asyncio.run(read_two_chunks())
+
+        sent = "".join(parse(event)[1]["text"] for event in received[1:])
+        assert service.message_repo.messages[1].content == {"text": sent, "status": "interrupted"}
@@ -0,0 +1,118 @@
+"""
+Unit tests for conversation_message partition maintenance
+"""
+import asyncio
+import os
+import pytest
+import stat
+from datetime import date, datetime
+from app.core.enums import PartitionState
+from app.services import partition_service
+from app.services.partition_service import PartitionMaintainer, _fsync_and_replace, add_months
+
+ATTACHED, DETACH_PENDING, DETACHED = PartitionState.ATTACHED, PartitionState.DETACH_PENDING, PartitionState.DETACHED
+
+
+class FakePartitionMaintainer(PartitionMaintainer):
+    """Maintainer with the catalog and DDL replaced by an in-memory table list"""
+
+    def __init__(self, partitions):
+        super().__init__(table="conversation_message", premake_months=2, retention_months=3, archive_dir="/tmp", interval=0)
+        self.partitions = dict(partitions)
+        self.calls = []
+
+    async def _partitions(self):
+        return dict(self.partitions)
+
+    async def _create(self, name, month):
+        self.calls.append(("create", name))
+        self.partitions[name] = ATTACHED
+
+    async def _detach(self, name, *, finalize=False):
+        self.calls.append(("finalize" if finalize else "detach", name))
+        self.partitions[name] = DETACHED
+
+    async def _archive(self, name):
+        self.calls.append(("archive", name))
+        del self.partitions[name]
+
+
+class TestPartitionMaintainer:
+    """Test which partitions are created ahead and which are archived"""
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic across year boundaries"""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_names_round_trip(self):
+        """Test that only monthly partition names parse back to their month"""
+        maintainer = FakePartitionMaintainer({})
+
+        assert maintainer.partition_name(date(2026, 3, 1)) == "conversation_message_p2026_03"
+        assert maintainer.partition_month("conversation_message_p2026_03") == date(2026, 3, 1)
+        assert maintainer.partition_month("conversation_message_partitioned") is None
+
+    def test_creates_missing_future_partitions(self):
+        """Test that the current month and premake_months ahead exist afterwards"""
+        maintainer = FakePartitionMaintainer({"conversation_message_p2026_12": ATTACHED})
+
+        created = asyncio.run(maintainer.create_partitions(now=datetime(2026, 12, 15)))
+
+        assert created == ["conversation_message_p2027_01", "conversation_message_p2027_02"]
+
+    def test_archives_partitions_past_retention(self):
+        """Test that partitions which ended before the cutoff are detached then archived, in order"""
+        maintainer = FakePartitionMaintainer({
+            "conversation_message_p2026_05": ATTACHED,
+            "conversation_message_p2026_06": ATTACHED,
+            "conversation_message_p2026_07": ATTACHED,
+            "conversation_message_p2026_08": ATTACHED,
+        })
+
+        archived = asyncio.run(maintainer.archive_partitions(now=datetime(2026, 10, 18)))
+
+        assert archived == ["conversation_message_p2026_05", "conversation_message_p2026_06"]
+        assert maintainer.calls == [
+            ("detach", "conversation_message_p2026_05"), ("archive", "conversation_message_p2026_05"),
+            ("detach", "conversation_message_p2026_06"), ("archive", "conversation_message_p2026_06"),
+        ]
+
+    def test_resumes_detached_partition(self):
+        """Test that a partition detached by an interrupted run is archived without detaching again"""
+        maintainer = FakePartitionMaintainer({"conversation_message_p2026_01": DETACHED})
+
+        asyncio.run(maintainer.archive_partitions(now=datetime(2026, 10, 18)))
+
+        assert maintainer.calls == [("archive", "conversation_message_p2026_01")]
+
+    def test_finalizes_interrupted_concurrent_detach(self):
+        """Test that a partition left pending detach is finalized before it is archived"""
+        maintainer = FakePartitionMaintainer({"conversation_message_p2026_02": DETACH_PENDING})
+
+        archived = asyncio.run(maintainer.archive_partitions(now=datetime(2026, 10, 18)))
+
+        assert archived == ["conversation_message_p2026_02"]
+        assert maintainer.calls == [("finalize", "conversation_message_p2026_02"), ("archive", "conversation_message_p2026_02")]
+
+
+class TestFsyncAndReplace:
+    """Test that an archive is durable before its partition is dropped"""
+
+    def test_syncs_file_then_directory(self, tmp_path, monkeypatch):
+        """Test that the directory entry is synced after the rename"""
+        synced = []
+        fsync = os.fsync
+
+        def recording_fsync(fd):
+            synced.append(stat.S_ISDIR(os.fstat(fd).st_mode))
+            fsync(fd)
+
+        monkeypatch.setattr(partition_service.os, "fsync", recording_fsync)
+        partial_path, path = tmp_path / "p.csv.gz.partial", tmp_path / "p.csv.gz"
+        partial_path.write_bytes(b"rows")
+
+        _fsync_and_replace(str(partial_path), str(path))
+
+        assert path.read_bytes() == b"rows" and not partial_path.exists()
+        assert synced == [False, True]
@@ -0,0 +1,168 @@
+"""
+Unit tests for serving top shopping recommendations through the Redis ranking
+"""
+import asyncio
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.models.wardrobe import ShoppingRecommendation
+from app.repositories.recommendation_ranking import RecommendationRanking
+from app.repositories.wardrobe_repo import shopping_recommendation_repo
+from app.schemas.wardrobe import ShoppingRecommendationRead
+from app.services.recommendation_service import RecommendationService
+
+
+class FakeRanking(RecommendationRanking):
+    """Ranking with the Redis scripts replaced by a per-user list and a generation counter"""
+
+    def __init__(self, *, fail: bool = False):
+        super().__init__(ttl=60)
+        self.fail = fail
+        self.rankings: dict[int, list[ShoppingRecommendationRead]] = {}
+        self.generations: dict[int, int] = {}
+
+    async def top(self, user_id, limit):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        ranking = self.rankings.get(user_id)
+        return None if ranking is None else ranking[:limit]
+
+    async def generation(self, user_id):
+        return str(self.generations.get(user_id, 0))
+
+    async def build(self, user_id, recommendations, *, generation):
+        if generation != await self.generation(user_id):
+            return False
+        self.rankings[user_id] = list(recommendations)
+        return True
+
+
+@pytest.fixture
+def recommendations(session):
+    session.expire_on_commit = False
+    rows = [
+        ShoppingRecommendation(user_id=1, item_type="coat", description="a", reasoning="r", priority_score=0.4),
+        ShoppingRecommendation(user_id=1, item_type="boots", description="b", reasoning="r", priority_score=0.9),
+        ShoppingRecommendation(user_id=1, item_type="scarf", description="c", reasoning="r", priority_score=0.7, purchased=True),
+        ShoppingRecommendation(user_id=1, item_type="belt", description="d", reasoning="r", priority_score=0.7),
+        ShoppingRecommendation(user_id=2, item_type="hat", description="e", reasoning="r", priority_score=1.0),
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def make_service(ranking: RecommendationRanking) -> RecommendationService:
+    service = RecommendationService()
+    service.ranking = ranking
+    return service
+
+
+class TestRecommendationService:
+    """Test the hit, miss and Redis-down paths of the top recommendations read"""
+
+    def test_miss_builds_ranking_from_open_recommendations(self, async_session, recommendations):
+        """Test that a miss ranks the user's open recommendations and materializes all of them"""
+        ranking = FakeRanking()
+        service = make_service(ranking)
+
+        top = asyncio.run(service.top_recommendations(db=async_session, user_id=1, limit=2))
+
+        assert [recommendation.item_type for recommendation in top] == ["boots", "belt"]
+        assert [recommendation.item_type for recommendation in ranking.rankings[1]] == ["boots", "belt", "coat"]
+
+    def test_miss_reads_rows_from_primary(self, async_session, recommendations, monkeypatch):
+        """Test that the rows a ranking is built from are read with the session pinned to the primary"""
+        pinned = []
+        exec_ = async_session.exec
+
+        async def recording_exec(statement, params=None):
+            pinned.append(async_session.info.get("use_primary"))
+            return await exec_(statement, params=params)
+
+        monkeypatch.setattr(async_session, "exec", recording_exec)
+
+        asyncio.run(make_service(FakeRanking()).top_recommendations(db=async_session, user_id=1, limit=2))
+
+        assert pinned == [True]
+        assert "use_primary" not in async_session.info
+
+    def test_hit_skips_database(self, recommendations):
+        """Test that a built ranking answers on its own"""
+        ranking = FakeRanking()
+        ranking.rankings[1] = [ShoppingRecommendationRead.model_validate(recommendations[1])]
+
+        top = asyncio.run(make_service(ranking).top_recommendations(db=None, user_id=1, limit=5))
+
+        assert [recommendation.id for recommendation in top] == [recommendations[1].id]
+
+    def test_stale_build_is_discarded(self, async_session, recommendations):
+        """Test that a build racing a write does not land"""
+        ranking = FakeRanking()
+        original_generation = ranking.generation
+
+        async def racing_generation(user_id):
+            generation = await original_generation(user_id)
+            ranking.generations[user_id] = ranking.generations.get(user_id, 0) + 1
+            return generation
+        ranking.generation = racing_generation
+
+        top = asyncio.run(make_service(ranking).top_recommendations(db=async_session, user_id=1, limit=1))
+
+        assert [recommendation.item_type for recommendation in top] == ["boots"]
+        assert 1 not in ranking.rankings
+
+    def test_falls_back_to_database_when_redis_is_down(self, async_session, recommendations):
+        """Test that a Redis failure is answered from the partial index"""
+        top = asyncio.run(make_service(FakeRanking(fail=True)).top_recommendations(db=async_session, user_id=2, limit=3))
+
+        assert [recommendation.item_type for recommendation in top] == ["hat"]
+
+
+class TestRecommendationRanking:
+    """Test what is sent to the Redis scripts"""
+
+    def test_apply_drops_purchased_recommendations(self, recommendations):
+        """Test that purchased rows and deleted ids become removals, open rows upserts"""
+        calls = []
+
+        async def apply_script(keys, args):
+            calls.append((keys, args))
+
+        ranking = RecommendationRanking(ttl=60)
+        ranking._apply = apply_script
+        open_row, purchased_row = (ShoppingRecommendationRead.model_validate(recommendations[i]) for i in (1, 2))
+
+        asyncio.run(ranking.apply(1, upserted=[open_row, purchased_row], removed=[42]))
+
+        keys, args = calls[0]
+        assert keys == ["recommendations:1:ranked", "recommendations:1:data", "recommendations:1:gen"]
+        assert args[:5] == [60, 1, f"{open_row.id:012d}", 0.9, open_row.model_dump_json()]
+        assert args[5:] == [f"{purchased_row.id:012d}", "000000000042"]
+
+    def test_apply_swallows_redis_errors(self):
+        """Test that a failed update after commit is logged, not raised"""
+        async def apply_script(keys, args):
+            raise ConnectionError("redis is down")
+
+        ranking = RecommendationRanking(ttl=60)
+        ranking._apply = apply_script
+
+        asyncio.run(ranking.apply(1, removed=[1]))
+
+    def test_open_query_matches_partial_index(self):
+        """Test that the fallback query filters exactly like the index predicate"""
+        captured = []
+
+        class CapturingDB:
+            async def exec(self, statement):
+                captured.append(statement)
+                return self
+
+            def all(self):
+                return []
+
+        asyncio.run(shopping_recommendation_repo.get_open_by_priority(db=CapturingDB(), user_id=1, limit=5))
+        sql = str(captured[0].compile(dialect=postgresql.dialect()))
+
+        assert "NOT shopping_recommendation.purchased" in sql
+        assert "ORDER BY shopping_recommendation.priority_score DESC, shopping_recommendation.id DESC" in sql
@@ -0,0 +1,50 @@
+"""
+Unit tests for the expired row sweeper
+"""
+import asyncio
+import pytest
+from app.services.sweeper_service import ExpiredRowSweeper
+
+
+class FakeModel:
+    __tablename__ = "fake"
+
+
+class FakeRepo:
+    """Repo stub that reports a fixed sequence of deleted row counts"""
+    model = FakeModel
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = 0
+
+    async def delete_expired_batch(self, *, db, now, batch_size):
+        self.calls += 1
+        return self.batches.pop(0) if self.batches else 0
+
+
+def _sweeper(repos, max_batches=10):
+    return ExpiredRowSweeper(repos=repos, batch_size=100, batch_pause=0, max_batches_per_run=max_batches, interval=0)
+
+
+class TestExpiredRowSweeper:
+    """Test batching and the per-run budget"""
+
+    def test_stops_after_partial_batch(self):
+        """Test that sweeping ends once a batch comes back short"""
+        repo = FakeRepo([100, 100, 40, 100])
+
+        purged = asyncio.run(_sweeper([repo]).sweep_once())
+
+        assert purged == {"fake": 240}
+        assert repo.calls == 3
+
+    def test_respects_batch_budget(self):
+        """Test that a run never exceeds max_batches_per_run across repos"""
+        first = FakeRepo([100] * 10)
+        second = FakeRepo([100] * 10)
+
+        asyncio.run(_sweeper([first, second], max_batches=4).sweep_once())
+
+        assert first.calls == 4
+        assert second.calls == 0
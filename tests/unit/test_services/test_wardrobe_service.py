@@ -0,0 +1,75 @@
+"""
+Unit tests for serving wardrobe search and outfit suggestions from the per-user index
+"""
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from app.core.exceptions.repository import ConcurrentUpdateException
+from app.models.wardrobe import ClothingItem, Outfit
+from app.schemas.wardrobe import OutfitBatchUpdate
+from app.services.wardrobe_service import WardrobeService
+
+
+class TestWardrobeIndexRebuild:
+    """Test where the rows a wardrobe index is built from are read"""
+
+    def test_rebuild_reads_from_primary(self, session, async_session, monkeypatch):
+        """Test that the index is built from rows read with the session pinned to the primary"""
+        session.add_all([
+            ClothingItem(user_id=1, description="white shirt", category="shirt", colors=["white"]),
+            ClothingItem(user_id=1, description="jeans", category="jeans", colors=["blue"]),
+        ])
+        session.commit()
+        pinned = []
+        exec_ = async_session.exec
+
+        async def recording_exec(statement, params=None):
+            pinned.append(async_session.info.get("use_primary"))
+            return await exec_(statement, params=params)
+
+        monkeypatch.setattr(async_session, "exec", recording_exec)
+
+        index = asyncio.run(WardrobeService()._get_index(db=async_session, user_id=1))
+
+        assert len(index) == 2
+        assert pinned == [True]
+        assert "use_primary" not in async_session.info
+
+
+class TestBatchUpdateVersions:
+    """Test that a batch update is checked against the updated_at the client read"""
+
+    @pytest.fixture
+    def outfit(self, session):
+        outfit = Outfit(user_id=1, name="Work", updated_at=datetime(2026, 3, 1, 9, 30))
+        session.add(outfit)
+        session.commit()
+        return outfit
+
+    def test_matching_version_applies(self, session, async_session, outfit):
+        """Test that an update sent with the current updated_at, with or without an offset, is applied"""
+        updates = [OutfitBatchUpdate(id=outfit.id, name="Office", updated_at=datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc))]
+
+        asyncio.run(WardrobeService().update_outfits(db=async_session, user_id=1, updates=updates))
+
+        assert session.get(Outfit, outfit.id).name == "Office"
+
+    def test_stale_version_is_rejected(self, session, async_session, outfit):
+        """Test that an update based on an older read of the row fails without writing"""
+        updates = [OutfitBatchUpdate(id=outfit.id, name="Office", updated_at=datetime(2026, 2, 1))]
+
+        with pytest.raises(ConcurrentUpdateException):
+            asyncio.run(WardrobeService().update_outfits(db=async_session, user_id=1, updates=updates))
+        session.expire_all()
+        assert session.get(Outfit, outfit.id).name == "Work"
+
+    def test_never_updated_row_matches_null_version(self, session, async_session):
+        """Test that a row that was never updated is matched by an explicit null updated_at"""
+        outfit = Outfit(user_id=1, name="Work")
+        session.add(outfit)
+        session.commit()
+        updates = [OutfitBatchUpdate(id=outfit.id, name="Office", updated_at=None)]
+
+        asyncio.run(WardrobeService().update_outfits(db=async_session, user_id=1, updates=updates))
+
+        assert session.get(Outfit, outfit.id).name == "Office"
@@ -2,6 +2,7 @@ import asyncio
 import json
 import structlog
 from aio_pika.abc import AbstractIncomingMessage
+from prometheus_client import start_http_server
 
 from app.models.user import User
 from app.models.session import Session
@@ -9,9 +10,12 @@ from app.models.password_reset_token import PasswordResetToken
 
 from app.core.rabbitmq import rabbitmq_manager
 from app.core.context import request_id_var
+from app.core.config import settings
 from app.db import get_db
 from app.services.user_service import user_service
 from app.services.email_service import email_service
+from app.services.sweeper_service import expired_row_sweeper
+from app.services.partition_service import conversation_message_partitions
 
 log = structlog.get_logger()
 
@@ -43,6 +47,10 @@ async def on_message(message: AbstractIncomingMessage):
 
 
 async def main():
+    start_http_server(settings.WORKER_METRICS_PORT)
+    sweeper_task = asyncio.create_task(expired_row_sweeper.run_forever())
+    partition_task = asyncio.create_task(conversation_message_partitions.run_forever())
+
     channel = await rabbitmq_manager.get_channel()
     await channel.set_qos(prefetch_count=1)
     queue = await channel.declare_queue("password_reset_queue", durable=True)
@@ -52,6 +60,8 @@ async def main():
     try:
         await asyncio.Future()
     finally:
+        sweeper_task.cancel()
+        partition_task.cancel()
         await rabbitmq_manager.close()
 
 if __name__ == '__main__':